@@ -0,0 +1,184 @@
+"""Pool of Apple Music accounts for spreading catalog and license calls.
+
+Each account is one cookies file or media-user-token with its own
+AppleMusicApi client. Every _run_async call leases the least-loaded healthy
+account (fewest calls in flight, then fewest calls in the last minute) for
+its whole duration, so a download's webplayback and license requests use the
+same session. The leased account is carried in a context variable, which
+ModuleInterface.apple_music_api and the gamdl base interface consult.
+Clients belong to an event loop, so an account keeps one per lane (see
+lanes.py).
+
+An account that gets rate limited (429) is quarantined with exponential
+backoff; one whose session ended is quarantined for longer, until its
+cookies are fixed or the quarantine runs out. Accounts come back
+automatically after the quarantine.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Optional
+
+from .lanes import current_lane
+
+_current_account = contextvars.ContextVar('applemusic_account', default=None)
+
+_RATE_WINDOW = 60.0
+_RATE_LIMIT_QUARANTINE = 30.0
+_MAX_RATE_LIMIT_QUARANTINE = 900.0
+_SESSION_QUARANTINE = 1800.0
+_SESSION_ENDED_MARKERS = ('session has ended', 'session ended', 'session expired', 'invalid session')
+
+
+def current_account() -> Optional['Account']:
+    """Account leased by the running _run_async call, if any."""
+    return _current_account.get()
+
+
+def parse_pool_setting(value) -> List[str]:
+    """account_pool setting (list, or comma/newline separated string) as a list of entries."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace('\n', ',').split(',')
+    return [str(entry).strip() for entry in value if str(entry).strip()]
+
+
+def is_rate_limit_error(error) -> bool:
+    return ((getattr(error, 'status_code', None) == 429 and 'ApiError' in type(error).__name__)
+            or 'TooManyRequests' in type(error).__name__)
+
+
+def is_session_ended_error(error) -> bool:
+    message = str(error).lower()
+    return getattr(error, 'status_code', None) == 401 or any(m in message for m in _SESSION_ENDED_MARKERS)
+
+
+class Account:
+    """One pooled credential and its rate/health bookkeeping."""
+
+    __slots__ = ('name', 'source', 'apis', 'in_flight', 'calls', 'recent', 'rate_limited', 'errors',
+                 'strikes', 'quarantined_until', 'last_error')
+
+    def __init__(self, name: str, source: str, api=None):
+        self.name = name
+        # A cookies file path, or a media-user-token; '' for the module's primary client
+        self.source = source
+        # Lane name -> client
+        self.apis = {}
+        if api is not None:
+            self.api = api
+        self.in_flight = 0
+        self.calls = 0
+        self.recent = deque()
+        self.rate_limited = 0
+        self.errors = 0
+        self.strikes = 0
+        self.quarantined_until = 0.0
+        self.last_error = None
+
+    @property
+    def api(self):
+        """This account's client for the current lane's event loop."""
+        return self.apis.get(current_lane())
+
+    @api.setter
+    def api(self, api) -> None:
+        if api is None:
+            self.apis.pop(current_lane(), None)
+        else:
+            self.apis[current_lane()] = api
+
+    @property
+    def is_cookies(self) -> bool:
+        return bool(self.source) and (self.source.endswith('.txt') or Path(self.source).exists())
+
+    def quarantined(self, now: float = None) -> bool:
+        return self.quarantined_until > (now if now is not None else time.monotonic())
+
+    def recent_calls(self, now: float) -> int:
+        while self.recent and self.recent[0] < now - _RATE_WINDOW:
+            self.recent.popleft()
+        return len(self.recent)
+
+    def as_dict(self, now: float) -> dict:
+        return {
+            'in_flight': self.in_flight, 'calls': self.calls, 'calls_last_minute': self.recent_calls(now),
+            'rate_limited': self.rate_limited, 'errors': self.errors, 'ready': self.api is not None,
+            'quarantined_for': round(max(0.0, self.quarantined_until - now), 1), 'last_error': self.last_error,
+        }
+
+
+class AccountPool:
+    """Least-loaded selection over accounts, with automatic quarantine (thread-safe)."""
+
+    def __init__(self, accounts: List[Account]):
+        self.accounts = accounts
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Optional[Account]:
+        """Lease the healthy, ready account with the least load (None if none is ready)."""
+        now = time.monotonic()
+        with self._lock:
+            ready = [a for a in self.accounts if a.api is not None]
+            if not ready:
+                return None
+            healthy = [a for a in ready if not a.quarantined(now)]
+            if healthy:
+                account = min(healthy, key=lambda a: (a.in_flight, a.recent_calls(now)))
+            else:
+                # Everything is quarantined: use the one that comes back first
+                account = min(ready, key=lambda a: a.quarantined_until)
+            account.in_flight += 1
+            account.calls += 1
+            account.recent.append(now)
+            return account
+
+    def available(self) -> int:
+        """Number of ready accounts that aren't quarantined."""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for a in self.accounts if a.api is not None and not a.quarantined(now))
+
+    def release(self, account: Optional[Account], error: BaseException = None) -> None:
+        if account is None:
+            return
+        with self._lock:
+            account.in_flight = max(0, account.in_flight - 1)
+            if error is None:
+                account.strikes = 0
+                return
+            if is_rate_limit_error(error):
+                account.rate_limited += 1
+                account.strikes += 1
+                quarantine = min(_MAX_RATE_LIMIT_QUARANTINE, _RATE_LIMIT_QUARANTINE * 2 ** (account.strikes - 1))
+            elif is_session_ended_error(error):
+                account.errors += 1
+                quarantine = _SESSION_QUARANTINE
+            else:
+                return
+            account.quarantined_until = time.monotonic() + quarantine
+            account.last_error = f"{type(error).__name__}: {error}"[:200]
+        print(f"[Apple Music Warning] Account '{account.name}' quarantined for {quarantine:.0f}s: {account.last_error}")
+
+    def lease(self, account: Optional[Account]):
+        """Make account the current one for this context; returns the token for reset()."""
+        return _current_account.set(account)
+
+    @staticmethod
+    def reset(token) -> None:
+        _current_account.reset(token)
+
+    def drop_clients(self) -> None:
+        """Forget the current lane's pooled clients (they belong to an event loop that is going away)."""
+        with self._lock:
+            for account in self.accounts:
+                if account.source:
+                    account.api = None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {account.name: account.as_dict(now) for account in self.accounts}
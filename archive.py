@@ -0,0 +1,227 @@
+"""Persistent download archive: which tracks were already downloaded, and how.
+
+Entries are matched by catalog ID, codec and quality tier, or by ISRC, so a
+track that resolves to a different catalog ID (storefront equivalents,
+re-releases) is still recognised. Each entry records the delivered file path,
+its size and SHA-256 checksum, and the codec that was actually delivered.
+Files imported without a catalog ID (e.g. from other modules) get an entry
+each, matched by ISRC.
+
+Existing libraries can be imported in bulk from their tags: gamdl writes the
+catalog ID to the MP4 ``cnID`` atom and OrpheusDL writes the ISRC.
+
+    python archive.py import <archive.sqlite3> <library folder>
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+# Archived quality tier for entries that match any tier of their codec
+# (imported AAC files, whose tier can't be told apart from the file)
+ANY_QUALITY = ''
+
+_AUDIO_SUFFIXES = frozenset({'.m4a', '.mp4', '.flac', '.mp3', '.ogg', '.opus', '.wav', '.aiff'})
+_HASH_CHUNK = 1024 * 1024
+_COLUMNS = 'catalog_id, isrc, codec, quality, path, size, checksum, source, downloaded_at'
+
+
+class ArchiveEntry(NamedTuple):
+    catalog_id: str
+    isrc: Optional[str]
+    codec: str
+    quality: str
+    path: Optional[str]
+    size: Optional[int]
+    checksum: Optional[str]
+    source: str
+    downloaded_at: float
+
+
+def file_checksum(path) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _first_tag(tags, *keys) -> Optional[str]:
+    for key in keys:
+        try:
+            value = tags.get(key)
+        except (KeyError, ValueError):
+            continue
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', 'replace')
+        elif value is not None and hasattr(value, 'text'):
+            value = value.text[0] if value.text else None
+        if value not in (None, ''):
+            return str(value)
+    return None
+
+
+def _open(path):
+    import mutagen
+
+    try:
+        return mutagen.File(path)
+    except Exception:
+        return None
+
+
+def _codec_of(audio) -> Tuple[str, str]:
+    info = audio.info
+    codec_name = str(getattr(info, 'codec', '') or type(audio).__name__).lower()
+    if codec_name == 'alac':
+        codec = 'alac'
+        quality = 'HIFI' if (getattr(info, 'sample_rate', 0) or 0) > 48000 else 'LOSSLESS'
+    elif codec_name in ('ec-3', 'ac-3'):
+        codec, quality = 'atmos', 'ATMOS'
+    elif codec_name.startswith('mp4a'):
+        codec, quality = 'aac-web', ANY_QUALITY
+    else:
+        # Not something this module downloads; still archive it under its own codec name
+        codec, quality = codec_name, ANY_QUALITY
+    return codec, quality
+
+
+def probe_codec(path) -> Optional[Tuple[str, str]]:
+    """(codec, quality tier) of an audio file, from its stream info (None if unreadable)."""
+    audio = _open(path)
+    if audio is None or getattr(audio, 'info', None) is None:
+        return None
+    return _codec_of(audio)
+
+
+def probe_file(path) -> Optional[dict]:
+    """Catalog ID, ISRC, codec and quality tier read from an audio file's tags (None if unreadable)."""
+    audio = _open(path)
+    if audio is None or audio.tags is None:
+        return None
+    tags = audio.tags
+    catalog_id = _first_tag(tags, 'cnID')
+    isrc = _first_tag(tags, '----:com.apple.iTunes:ISRC', 'ISRC', 'isrc', 'TSRC')
+    if not catalog_id and not isrc:
+        return None
+    codec, quality = _codec_of(audio)
+    return {'catalog_id': catalog_id or '', 'isrc': isrc, 'codec': codec, 'quality': quality}
+
+
+class DownloadArchive:
+    """SQLite-backed download archive (thread-safe, shareable between processes)."""
+
+    def __init__(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            # Surrogate key: files without a catalog ID are told apart by path and matched by ISRC
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, catalog_id TEXT NOT NULL, isrc TEXT, '
+                'codec TEXT NOT NULL, quality TEXT NOT NULL, path TEXT, size INTEGER, checksum TEXT, '
+                'source TEXT NOT NULL, downloaded_at REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_catalog ON entries (catalog_id, codec, quality)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_isrc ON entries (isrc, codec)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_path ON entries (path)')
+            # Archives from before the surrogate key
+            if self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'downloads'").fetchone():
+                self._db.execute(f'INSERT INTO entries ({_COLUMNS}) SELECT {_COLUMNS} FROM downloads')
+                self._db.execute('DROP TABLE downloads')
+
+    def lookup(self, catalog_id: str, codec: str, quality: str, isrc: str = None) -> Optional[ArchiveEntry]:
+        """Archived entry for this track at this codec/quality (matched by catalog ID or ISRC).
+
+        Imported entries whose file has since been removed from the library are
+        dropped, so deleting a file makes the track downloadable again.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id, {_COLUMNS} FROM entries WHERE ((? != '' AND catalog_id = ?) OR (? IS NOT NULL AND isrc = ?)) "
+                'AND codec = ? AND quality IN (?, ?) ORDER BY downloaded_at DESC',
+                (str(catalog_id or ''), str(catalog_id or ''), isrc or None, isrc or None, codec,
+                 quality or ANY_QUALITY, ANY_QUALITY),
+            ).fetchall()
+            for row_id, *row in rows:
+                entry = ArchiveEntry(*row)
+                if entry.source == 'import' and entry.path and not os.path.exists(entry.path):
+                    with self._db:
+                        self._db.execute('DELETE FROM entries WHERE id = ?', (row_id,))
+                    continue
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def record(self, catalog_id: str, codec: str, quality: str, isrc: str = None, path=None,
+               checksum: str = None, size: int = None, source: str = 'download') -> None:
+        if path is not None and size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                pass
+        catalog_id, quality = str(catalog_id or ''), quality or ANY_QUALITY
+        path = str(path) if path is not None else None
+        with self._lock, self._db:
+            # Replaces the earlier entry for the same track and tier, or for the same file
+            self._db.execute(
+                "DELETE FROM entries WHERE (? != '' AND catalog_id = ? AND codec = ? AND quality = ?) "
+                'OR (? IS NOT NULL AND path = ?)',
+                (catalog_id, catalog_id, codec, quality, path, path),
+            )
+            self._db.execute(
+                f'INSERT INTO entries ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (catalog_id, isrc or None, codec, quality, path, size, checksum, source, time.time()),
+            )
+
+    def import_tree(self, root, checksums: bool = False) -> int:
+        """Archive every tagged audio file under root; returns the number of files imported.
+
+        Checksums are optional here since hashing a whole library is slow.
+        """
+        imported = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if os.path.splitext(filename)[1].lower() not in _AUDIO_SUFFIXES:
+                    continue
+                probed = probe_file(path)
+                if probed is None:
+                    continue
+                self.record(
+                    probed['catalog_id'], probed['codec'], probed['quality'], isrc=probed['isrc'], path=path,
+                    checksum=file_checksum(path) if checksums else None, source='import',
+                )
+                imported += 1
+        return imported
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4 or sys.argv[1] != 'import':
+        print("usage: archive.py import <archive.sqlite3> <library folder> [--checksums]")
+        sys.exit(2)
+    archive = DownloadArchive(sys.argv[2])
+    count = archive.import_tree(sys.argv[3], checksums='--checksums' in sys.argv[4:])
+    print(f"Imported {count} files into {sys.argv[2]}")
+    archive.close()
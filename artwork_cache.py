@@ -0,0 +1,274 @@
+"""Content-addressed cover art cache.
+
+Artwork is keyed by its Apple Music template URL (the ``{w}x{h}`` form) and the
+requested resolution. Image bytes are stored once per SHA-256 content hash, so
+the same cover requested at different sizes — or shared by every track of an
+album — only occupies disk once. Smaller sizes are derived locally from one
+max-resolution fetch when Pillow is available, and a byte budget is enforced
+with least-recently-used eviction.
+
+OrpheusDL downloads a track's cover_url itself through its shared requests
+session; artwork_adapter() gives that session a transport adapter which
+answers Apple artwork URLs from this cache instead.
+"""
+import asyncio
+import hashlib
+import io
+import mimetypes
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Tuple
+
+# Matches the sized tail of a resolved artwork URL, e.g. ".../1400x1400bb.jpg"
+_SIZED_ARTWORK_RE = re.compile(r'/(\d+)x(\d+)([a-z]{2})\.(jpg|jpeg|png|webp)$', re.IGNORECASE)
+# Hosts Apple serves artwork from (requests adapters are mounted per URL prefix)
+ARTWORK_URL_PREFIXES = tuple(f"https://is{n}-ssl.mzstatic.com/" for n in range(1, 6))
+
+
+def split_artwork_url(url: str) -> Optional[Tuple[str, int]]:
+    """Split a resolved artwork URL into (template URL, resolution), or None."""
+    match = _SIZED_ARTWORK_RE.search(url or '')
+    if not match:
+        return None
+    template = url[:match.start()] + f"/{{w}}x{{h}}{match.group(3)}.{match.group(4)}"
+    return template, int(match.group(1))
+
+
+def format_artwork_url(template: str, resolution: int) -> str:
+    """Resolve an artwork template URL at a square resolution."""
+    return template.replace('{w}', str(resolution)).replace('{h}', str(resolution))
+
+
+class ArtworkCache:
+    """Disk-backed artwork cache shared by all tracks (thread-safe)."""
+
+    def __init__(self, root, max_bytes: int = 512 * 1024 * 1024, source_resolution: int = 3000, debug: bool = False):
+        self.root = Path(root)
+        self.blob_dir = self.root / 'blobs'
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.source_resolution = int(source_resolution)
+        self._debug = debug
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = self.misses = self.derived = self.evictions = 0
+        self._db = sqlite3.connect(str(self.root / 'index.sqlite3'), check_same_thread=False, timeout=30)
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER NOT NULL, '
+                'last_access REAL NOT NULL)'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entries (template TEXT NOT NULL, resolution INTEGER NOT NULL, '
+                'hash TEXT NOT NULL, PRIMARY KEY (template, resolution))'
+            )
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def lookup(self, template: str, resolution: int) -> Optional[bytes]:
+        """Cached bytes for (template, resolution), refreshing its LRU position."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT hash FROM entries WHERE template = ? AND resolution = ?', (template, int(resolution))
+            ).fetchone()
+            if not row:
+                return None
+            path = self._blob_path(row[0])
+            try:
+                data = path.read_bytes()
+            except OSError:
+                # Blob vanished underneath us (manual cleanup): drop the dangling entries
+                with self._db:
+                    self._db.execute('DELETE FROM entries WHERE hash = ?', (row[0],))
+                    self._db.execute('DELETE FROM blobs WHERE hash = ?', (row[0],))
+                return None
+            with self._db:
+                self._db.execute('UPDATE blobs SET last_access = ? WHERE hash = ?', (time.time(), row[0]))
+            return data
+
+    def store(self, template: str, resolution: int, data: bytes) -> str:
+        """Store bytes for (template, resolution); identical content is kept once."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            path = self._blob_path(digest)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix('.part')
+                tmp.write_bytes(data)
+                tmp.replace(path)
+            with self._db:
+                self._db.execute(
+                    'INSERT INTO blobs (hash, size, last_access) VALUES (?, ?, ?) '
+                    'ON CONFLICT(hash) DO UPDATE SET last_access = excluded.last_access',
+                    (digest, len(data), time.time()),
+                )
+                self._db.execute(
+                    'INSERT OR REPLACE INTO entries (template, resolution, hash) VALUES (?, ?, ?)',
+                    (template, int(resolution), digest),
+                )
+            self._evict_locked()
+        return digest
+
+    def _largest_cached(self, template: str, resolution: int) -> Optional[Tuple[int, bytes]]:
+        """Largest cached rendition of template at or above resolution (for local resizing)."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT resolution FROM entries WHERE template = ? AND resolution >= ? '
+                'ORDER BY resolution DESC LIMIT 1', (template, int(resolution))
+            ).fetchone()
+        if not row:
+            return None
+        data = self.lookup(template, row[0])
+        return (row[0], data) if data is not None else None
+
+    def _evict_locked(self) -> None:
+        if not self.max_bytes:
+            return
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, size in self._db.execute('SELECT hash, size FROM blobs ORDER BY last_access ASC').fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                self._blob_path(digest).unlink()
+            except OSError:
+                pass
+            with self._db:
+                self._db.execute('DELETE FROM entries WHERE hash = ?', (digest,))
+                self._db.execute('DELETE FROM blobs WHERE hash = ?', (digest,))
+            total -= size
+            self.evictions += 1
+
+    @staticmethod
+    def _resize(data: bytes, resolution: int) -> Optional[bytes]:
+        """Downscale image bytes to fit resolution x resolution (None without Pillow)."""
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+        with Image.open(io.BytesIO(data)) as image:
+            if max(image.size) <= resolution:
+                return data
+            image_format = image.format or 'JPEG'
+            resized = image.convert('RGB') if image_format == 'JPEG' and image.mode != 'RGB' else image.copy()
+            resized.thumbnail((resolution, resolution), Image.LANCZOS)
+            out = io.BytesIO()
+            resized.save(out, format=image_format, **({'quality': 92} if image_format == 'JPEG' else {}))
+            return out.getvalue()
+
+    async def get(self, template: str, resolution: int,
+                  fetch: Callable[[str], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        """Artwork bytes for template at resolution, fetching at most one source rendition.
+
+        fetch(url) performs the actual HTTP download and returns bytes (or None on 404).
+        Concurrent requests for the same artwork on one event loop share one fetch.
+        Index and blob I/O runs in a worker thread, off the event loop.
+        """
+        resolution = int(resolution)
+        data = await asyncio.to_thread(self.lookup, template, resolution)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        key = (id(asyncio.get_running_loop()), template, resolution)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._get_uncached(template, resolution, fetch)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _get_uncached(self, template: str, resolution: int, fetch) -> Optional[bytes]:
+        # A larger rendition is already on disk: derive this size locally
+        source = await asyncio.to_thread(self._largest_cached, template, resolution)
+        if source is None:
+            self.misses += 1
+            source_resolution = max(resolution, self.source_resolution)
+            if self._debug: print(f"[Apple Music Debug] Artwork cache miss, fetching {source_resolution}px source for {template}")
+            source_data = await fetch(format_artwork_url(template, source_resolution))
+            if source_data is None:
+                return None
+            await asyncio.to_thread(self.store, template, source_resolution, source_data)
+            source = (source_resolution, source_data)
+
+        if source[0] == resolution:
+            return source[1]
+
+        resized = await asyncio.to_thread(self._resize, source[1], resolution)
+        if resized is None:
+            # No Pillow: fall back to fetching the exact size from Apple
+            resized = await fetch(format_artwork_url(template, resolution))
+            if resized is None:
+                return None
+        else:
+            self.derived += 1
+        await asyncio.to_thread(self.store, template, resolution, resized)
+        return resized
+
+    def stats(self) -> dict:
+        with self._lock:
+            blob_count, total = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+        return {
+            'hits': self.hits, 'misses': self.misses, 'derived': self.derived, 'evictions': self.evictions,
+            'blobs': blob_count, 'bytes': total, 'max_bytes': self.max_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def artwork_adapter(load: Callable[[str], Optional[bytes]]):
+    """A requests transport adapter answering artwork GETs with load(url).
+
+    load returns the cached (or freshly cached) bytes, or None to let the
+    request go to Apple as usual; so does any error it raises.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.structures import CaseInsensitiveDict
+
+    class CachedArtworkAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            data = None
+            if request.method == 'GET' and split_artwork_url(request.url):
+                try:
+                    data = load(request.url)
+                except Exception:
+                    data = None
+            if data is None:
+                return super().send(request, **kwargs)
+            response = requests.Response()
+            response.status_code = 200
+            response.reason = 'OK'
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            response.headers = CaseInsensitiveDict({
+                'Content-Type': mimetypes.guess_type(request.url)[0] or 'image/jpeg',
+                'Content-Length': str(len(data)),
+            })
+            # Already fully read: iter_content() and .content both serve these bytes
+            response.raw = io.BytesIO(data)
+            response._content = data
+            response._content_consumed = True
+            return response
+
+    return CachedArtworkAdapter()
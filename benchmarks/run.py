@@ -0,0 +1,187 @@
+"""Offline benchmark harness for the Apple Music module.
+
+Runs the module's public entry points against the local stand-in
+(benchmarks/standin.py) and reports per-scenario latency (p50/p95/mean),
+throughput and requests per operation. Results are written as JSON with the
+module's git commit, and can be compared against a previous results file to
+catch regressions:
+
+    python -m modules.applemusic.benchmarks.run --out bench.json
+    python -m modules.applemusic.benchmarks.run --baseline bench.json --threshold 0.15
+
+Run it from the OrpheusDL root (the module needs OrpheusDL's `utils`). The
+stand-in can't issue FairPlay/Widevine licenses, so the download scenario covers
+the part of get_track_download that is offline-reproducible: fetching a
+track's HLS stream through the module's downloader. License exchange and
+decryption are left out.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from .standin import StandInServer, SyntheticCatalog, route_httpx
+
+_MODULE_DIR = Path(__file__).resolve().parent.parent
+
+
+class BenchmarkModuleError(Exception):
+    pass
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_MODULE_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def create_module(work_dir: Path, extra_settings: dict = None):
+    """ModuleInterface wired to a throwaway temp/cache folder and no credentials."""
+    from ..interface import ModuleInterface
+
+    settings = {
+        'cookies_path': str(work_dir / 'no-cookies.txt'),
+        'language': 'en-US',
+        'codec': 'aac',
+        'temp_path': str(work_dir / 'temp'),
+        'cache_path': str(work_dir / 'cache'),
+        'download_mode': 'native',
+        'segment_cache': False,
+        'lyrics_prefetch': False,
+        **(extra_settings or {}),
+    }
+    controller = SimpleNamespace(
+        module_settings=settings,
+        module_error=BenchmarkModuleError,
+        printer_controller=None,
+        orpheus_options=SimpleNamespace(
+            debug_mode=False, play_sound_on_finish=False,
+            default_cover_options=SimpleNamespace(resolution=1400),
+        ),
+    )
+    return ModuleInterface(controller)
+
+
+def build_scenarios(module, catalog: SyntheticCatalog, work_dir: Path) -> dict:
+    from utils.models import DownloadTypeEnum, QualityEnum
+
+    album_ids = catalog.album_ids()
+    artist_ids = catalog.artist_ids()
+    song_ids = catalog.song_ids()
+
+    def track_stream(i):
+        song_id = song_ids[i % len(song_ids)]
+        path = work_dir / 'streams' / f'{song_id}-{i}.mp4'
+        url = f'https://aod.itunes.apple.com/bench/{song_id}/master.m3u8'
+        module._run_async(lambda s: s.gamdl_base_downloader.download_stream(url, str(path)))
+        path.unlink()
+
+    module._run_async(lambda s: s._initialize_gamdl_components())
+    return {
+        'search_tracks': lambda i: module.search(DownloadTypeEnum.track, f'bench {i}', limit=25),
+        'search_albums': lambda i: module.search(DownloadTypeEnum.album, f'bench {i}', limit=25),
+        'get_track_info': lambda i: module.get_track_info(song_ids[i % len(song_ids)], QualityEnum.HIGH, None),
+        'get_album_info': lambda i: module.get_album_info(album_ids[i % len(album_ids)]),
+        'get_playlist_info': lambda i: module.get_playlist_info(catalog.playlist_id),
+        'get_artist_info': lambda i: module.get_artist_info(artist_ids[i % len(artist_ids)]),
+        'track_stream': track_stream,
+    }
+
+
+def run_scenario(fn, iterations: int, server: StandInServer, warmup: int = 1) -> dict:
+    for i in range(warmup):
+        fn(-1 - i)
+    latencies = []
+    errors = 0
+    requests_before = server.requests
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        try:
+            fn(i)
+        except Exception as e:
+            errors += 1
+            if errors == 1:
+                print(f"    first error: {type(e).__name__}: {e}")
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'errors': errors,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'ops_per_s': iterations / elapsed if elapsed else None,
+        'requests_per_op': (server.requests - requests_before) / iterations,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Scenarios whose p50 got slower than baseline by more than threshold (a fraction)."""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous or not previous.get('p50_ms'):
+            continue
+        change = current['p50_ms'] / previous['p50_ms'] - 1
+        marker = 'REGRESSION' if change > threshold else ''
+        print(f"  {name:<20} {previous['p50_ms']:9.2f} -> {current['p50_ms']:9.2f} ms  ({change:+.1%}) {marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--scenario', action='append', help='run only these scenarios (repeatable)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='latency added to every stand-in response')
+    parser.add_argument('--albums', type=int, default=20)
+    parser.add_argument('--playlist-size', type=int, default=500)
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--baseline', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed p50 slowdown vs baseline (fraction)')
+    args = parser.parse_args(argv)
+
+    catalog = SyntheticCatalog(albums=args.albums, playlist_size=args.playlist_size)
+    with tempfile.TemporaryDirectory(prefix='applemusic-bench-') as tmp, \
+            StandInServer(catalog, latency=args.latency_ms / 1000) as server, route_httpx(server.url):
+        work_dir = Path(tmp)
+        module = create_module(work_dir)
+        scenarios = build_scenarios(module, catalog, work_dir)
+        selected = args.scenario or list(scenarios)
+        results = {
+            'commit': _git_commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+            'iterations': args.iterations, 'latency_ms': args.latency_ms,
+            'catalog': {'albums': catalog.albums, 'tracks_per_album': catalog.tracks_per_album,
+                        'playlist_size': catalog.playlist_size, 'page_size': catalog.page_size},
+            'scenarios': {},
+        }
+        for name in selected:
+            print(f"[bench] {name} ...")
+            results['scenarios'][name] = result = run_scenario(scenarios[name], args.iterations, server)
+            print(f"  p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  "
+                  f"{result['ops_per_s']:.1f} ops/s  {result['requests_per_op']:.1f} req/op  errors {result['errors']}")
+        results['module_stats'] = module.get_stats()
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2, default=str))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print(f"[bench] vs baseline {baseline.get('commit')} (threshold {args.threshold:.0%}):")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""Local stand-in for the Apple Music web endpoints, for offline benchmarks.
+
+A threaded HTTP server answers every request the module makes (homepage/token,
+amp-api catalog and search, iTunes lookup, artwork, HLS media playlists and
+byte-range segments) from a response source. `SyntheticCatalog` generates a
+deterministic catalog of any size, so results are comparable across commits.
+
+`route_httpx()` sends all httpx traffic in the process to the stand-in, which
+covers the clients gamdl creates internally (AppleMusicApi, ItunesApi,
+get_response) as well as the module's own. The original host is still sent in
+the Host header and is used for routing.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+# Fake developer token: only has to match gamdl's JWT-shaped regex
+_BENCH_TOKEN = "eyJhbGciOiJFUzI1NiJ9.eyJpc3MiOiJiZW5jaCJ9.YmVuY2g"
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def _json(payload, status: int = 200) -> Response:
+    return status, {'Content-Type': 'application/json'}, json.dumps(payload).encode()
+
+
+def _not_found(detail: str) -> Response:
+    return _json({'errors': [{'status': '404', 'title': 'Not Found', 'detail': detail}]}, status=404)
+
+
+class SyntheticCatalog:
+    """Deterministic catalog: albums of `tracks_per_album` songs, one paged playlist, artists.
+
+    IDs are numeric like Apple's; every song has an enhanced HLS media playlist of
+    `segments` byte-range segments over a synthetic audio file.
+    """
+
+    SONG_BASE = 1900000000
+    ALBUM_BASE = 1800000000
+    ARTIST_BASE = 1700000000
+
+    def __init__(self, albums: int = 20, tracks_per_album: int = 12, playlist_size: int = 500,
+                 page_size: int = 100, artists: int = 4, segments: int = 24, segment_bytes: int = 64 * 1024,
+                 storefront: str = 'us'):
+        self.albums = albums
+        self.tracks_per_album = tracks_per_album
+        self.playlist_size = playlist_size
+        self.page_size = page_size
+        self.artists = artists
+        self.segments = segments
+        self.segment_bytes = segment_bytes
+        self.storefront = storefront
+
+    # --- IDs ---------------------------------------------------------------
+    def album_ids(self):
+        return [str(self.ALBUM_BASE + i) for i in range(self.albums)]
+
+    def song_ids(self):
+        return [str(self.SONG_BASE + i) for i in range(self.albums * self.tracks_per_album)]
+
+    def artist_ids(self):
+        return [str(self.ARTIST_BASE + i) for i in range(self.artists)]
+
+    playlist_id = 'pl.bench000000000000000000000000'
+
+    # --- Resources ---------------------------------------------------------
+    def _artwork(self, kind: str, rid: str) -> dict:
+        return {'url': f'https://is1-ssl.mzstatic.com/image/thumb/{kind}/{rid}/{{w}}x{{h}}bb.jpg', 'width': 3000, 'height': 3000}
+
+    def _artist_of(self, album_index: int) -> str:
+        return str(self.ARTIST_BASE + album_index % max(1, self.artists))
+
+    def song(self, song_id: str, with_rels: bool = True) -> Optional[dict]:
+        index = int(song_id) - self.SONG_BASE
+        if not 0 <= index < self.albums * self.tracks_per_album:
+            return None
+        album_index, track_index = divmod(index, self.tracks_per_album)
+        album_id = str(self.ALBUM_BASE + album_index)
+        artist_id = self._artist_of(album_index)
+        resource = {
+            'id': song_id, 'type': 'songs', 'href': f'/v1/catalog/{self.storefront}/songs/{song_id}',
+            'attributes': {
+                'name': f'Bench Song {index}', 'albumName': f'Bench Album {album_index}',
+                'artistName': f'Bench Artist {int(artist_id) - self.ARTIST_BASE}', 'composerName': 'Bench Composer',
+                'artwork': self._artwork('Music', album_id), 'durationInMillis': self.segments * 10 * 1000,
+                'isrc': f'QZBEN{index:07d}', 'trackNumber': track_index + 1, 'discNumber': 1,
+                'releaseDate': '2020-01-01', 'genreNames': ['Electronic', 'Music'], 'hasLyrics': False,
+                'audioTraits': ['lossless', 'lossy'], 'contentRating': None, 'recordLabel': 'Bench Records',
+                'copyright': '℗ 2020 Bench Records', 'upc': f'{album_index:012d}',
+                'url': f'https://music.apple.com/{self.storefront}/song/{song_id}',
+                'playParams': {'id': song_id, 'kind': 'song'},
+                'previews': [{'url': f'https://audio-ssl.itunes.apple.com/bench/{song_id}.m4a'}],
+                'extendedAssetUrls': {'enhancedHls': f'https://aod.itunes.apple.com/bench/{song_id}/master.m3u8'},
+            },
+        }
+        if with_rels:
+            resource['relationships'] = {
+                'albums': {'data': [{'id': album_id, 'type': 'albums'}]},
+                'artists': {'data': [{'id': artist_id, 'type': 'artists'}]},
+            }
+        return resource
+
+    def album(self, album_id: str) -> Optional[dict]:
+        album_index = int(album_id) - self.ALBUM_BASE if album_id.isdigit() else -1
+        if not 0 <= album_index < self.albums:
+            return None
+        first = self.SONG_BASE + album_index * self.tracks_per_album
+        tracks = [self.song(str(first + i), with_rels=False) for i in range(self.tracks_per_album)]
+        artist_id = self._artist_of(album_index)
+        return {
+            'id': album_id, 'type': 'albums', 'href': f'/v1/catalog/{self.storefront}/albums/{album_id}',
+            'attributes': {
+                'name': f'Bench Album {album_index}', 'artistName': f'Bench Artist {int(artist_id) - self.ARTIST_BASE}',
+                'artwork': self._artwork('Music', album_id), 'releaseDate': '2020-01-01',
+                'trackCount': self.tracks_per_album, 'recordLabel': 'Bench Records',
+                'copyright': '℗ 2020 Bench Records', 'upc': f'{album_index:012d}',
+                'audioTraits': ['lossless', 'lossy'], 'url': f'https://music.apple.com/{self.storefront}/album/{album_id}',
+            },
+            'relationships': {
+                'tracks': {'href': f'/v1/catalog/{self.storefront}/albums/{album_id}/tracks', 'data': tracks},
+                'artists': {'data': [{'id': artist_id, 'type': 'artists'}]},
+            },
+        }
+
+    def _playlist_page(self, offset: int) -> dict:
+        songs = self.song_ids()
+        data = [self.song(songs[i % len(songs)], with_rels=False)
+                for i in range(offset, min(offset + self.page_size, self.playlist_size))]
+        page = {'href': f'/v1/catalog/{self.storefront}/playlists/{self.playlist_id}/tracks', 'data': data}
+        if offset + self.page_size < self.playlist_size:
+            page['next'] = f'/v1/catalog/{self.storefront}/playlists/{self.playlist_id}/tracks?offset={offset + self.page_size}'
+        return page
+
+    def playlist(self, playlist_id: str) -> Optional[dict]:
+        if playlist_id != self.playlist_id:
+            return None
+        return {
+            'id': playlist_id, 'type': 'playlists', 'href': f'/v1/catalog/{self.storefront}/playlists/{playlist_id}',
+            'attributes': {
+                'name': 'Bench Playlist', 'curatorName': 'Bench Curator', 'trackCount': self.playlist_size,
+                'lastModifiedDate': '2024-01-01T00:00:00Z', 'artwork': self._artwork('Features', 'playlist'),
+                'url': f'https://music.apple.com/{self.storefront}/playlist/{playlist_id}',
+            },
+            'relationships': {'tracks': self._playlist_page(0)},
+        }
+
+    def artist(self, artist_id: str) -> Optional[dict]:
+        if artist_id not in self.artist_ids():
+            return None
+        albums = [self.album(a) for a in self.album_ids() if self._artist_of(int(a) - self.ALBUM_BASE) == artist_id]
+        album_refs = [{k: v for k, v in a.items() if k != 'relationships'} for a in albums]
+        top_songs = [self.song(str(self.SONG_BASE + (int(a['id']) - self.ALBUM_BASE) * self.tracks_per_album), with_rels=False)
+                     for a in albums[:10]]
+        return {
+            'id': artist_id, 'type': 'artists', 'href': f'/v1/catalog/{self.storefront}/artists/{artist_id}',
+            'attributes': {'name': f'Bench Artist {int(artist_id) - self.ARTIST_BASE}',
+                           'artwork': self._artwork('Features', artist_id),
+                           'url': f'https://music.apple.com/{self.storefront}/artist/{artist_id}'},
+            'relationships': {'albums': {'data': album_refs}},
+            'views': {'top-songs': {'data': top_songs}, 'singles': {'data': []}},
+        }
+
+    def search(self, term: str, types: str, limit: int) -> dict:
+        results = {}
+        for kind in (types or 'songs').split(','):
+            if kind == 'songs':
+                items = [self.song(s) for s in self.song_ids()[:limit]]
+            elif kind == 'albums':
+                items = [{k: v for k, v in self.album(a).items() if k != 'relationships'} for a in self.album_ids()[:limit]]
+            elif kind == 'artists':
+                items = [{k: v for k, v in self.artist(a).items() if k not in ('relationships', 'views')} for a in self.artist_ids()[:limit]]
+            elif kind == 'playlists':
+                playlist = self.playlist(self.playlist_id)
+                items = [{k: v for k, v in playlist.items() if k != 'relationships'}]
+            else:
+                continue
+            results[kind] = {'href': f'/v1/catalog/{self.storefront}/search?term={term}', 'data': items}
+        return {'results': results}
+
+    # --- HLS ---------------------------------------------------------------
+    def media_playlist(self, song_id: str) -> str:
+        seg = self.segment_bytes
+        lines = ['#EXTM3U', '#EXT-X-VERSION:7', '#EXT-X-TARGETDURATION:10', '#EXT-X-PLAYLIST-TYPE:VOD',
+                 f'#EXT-X-MAP:URI="audio.mp4",BYTERANGE="1024@0"']
+        for i in range(self.segments):
+            lines += ['#EXTINF:10.0,', f'#EXT-X-BYTERANGE:{seg}@{1024 + i * seg}', 'audio.mp4']
+        lines.append('#EXT-X-ENDLIST')
+        return '\n'.join(lines) + '\n'
+
+    def audio_bytes(self, song_id: str, start: int, end: int) -> bytes:
+        # Cheap deterministic filler, repeated: only lengths matter to the downloader
+        block = hashlib.sha256(song_id.encode()).digest() * 128
+        length = end - start + 1
+        data = block * (length // len(block) + 2)
+        offset = start % len(block)
+        return data[offset:offset + length]
+
+    # --- Routing -----------------------------------------------------------
+    def respond(self, method: str, host: str, path: str, query: dict, headers: dict) -> Response:
+        host = host.split(':')[0]
+        if host == 'music.apple.com':
+            if path in ('', '/'):
+                return 200, {'Content-Type': 'text/html'}, b'<script src="/assets/index-bench.js"></script>'
+            if path.startswith('/assets/index'):
+                return 200, {'Content-Type': 'text/javascript'}, f'const t="{_BENCH_TOKEN}";'.encode()
+            if 'musickit' in path:
+                return 200, {'Content-Type': 'text/javascript'}, b'US:"USA",USA:"143441"'
+        if host == 'itunes.apple.com' and path == '/lookup':
+            return _json({'resultCount': 0, 'results': []})
+        if host.endswith('mzstatic.com'):
+            return 200, {'Content-Type': 'image/jpeg'}, b'\xff\xd8\xff\xe0' + hashlib.sha256(path.encode()).digest() * 64
+        if host == 'aod.itunes.apple.com':
+            match = re.match(r'^/bench/(\d+)/(master\.m3u8|audio\.mp4)$', path)
+            if not match:
+                return _not_found(path)
+            if match.group(2) == 'master.m3u8':
+                return 200, {'Content-Type': 'application/vnd.apple.mpegurl'}, self.media_playlist(match.group(1)).encode()
+            byte_range = re.match(r'bytes=(\d+)-(\d+)', headers.get('range', ''))
+            if not byte_range:
+                return 416, {}, b''
+            start, end = int(byte_range.group(1)), int(byte_range.group(2))
+            return 206, {'Content-Type': 'video/mp4'}, self.audio_bytes(match.group(1), start, end)
+        if host == 'amp-api.music.apple.com':
+            return self._amp(path, query)
+        return _not_found(f'{host}{path}')
+
+    def _amp(self, path: str, query: dict) -> Response:
+        parts = path.strip('/').split('/')
+        if parts[:2] == ['v1', 'catalog'] and len(parts) >= 4:
+            kind, rid = parts[3], parts[4] if len(parts) > 4 else None
+            if kind == 'search':
+                return _json(self.search(query.get('term', ''), query.get('types', 'songs'), int(query.get('limit', 25))))
+            if kind == 'playlists' and len(parts) == 6 and parts[5] == 'tracks':
+                if rid != self.playlist_id:
+                    return _not_found(path)
+                return _json(self._playlist_page(int(query.get('offset', 0))))
+            resource = {'songs': self.song, 'albums': self.album, 'playlists': self.playlist,
+                        'artists': self.artist}.get(kind, lambda _: None)(rid or '')
+            return _json({'data': [resource]}) if resource else _not_found(path)
+        return _not_found(path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        split = urllib.parse.urlsplit(self.path)
+        query = {k: v[-1] for k, v in urllib.parse.parse_qs(split.query).items()}
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        if server.latency:
+            time.sleep(server.latency)
+        status, response_headers, body = server.source.respond(
+            'GET', headers.get('host', ''), split.path, query, headers)
+        with server.lock:
+            server.requests += 1
+            server.bytes_sent += len(body)
+        self.send_response(status)
+        for key, value in response_headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Threaded local HTTP server answering from `source.respond(...)`.
+
+    latency (seconds) is added to every response to mimic a real network.
+    """
+
+    def __init__(self, source, latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.source = source
+        self._server.latency = latency
+        self._server.lock = threading.Lock()
+        self._server.requests = 0
+        self._server.bytes_sent = 0
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def bytes_sent(self) -> int:
+        return self._server.bytes_sent
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name='AppleMusicStandIn')
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextmanager
+def route_httpx(base_url: str):
+    """Send every httpx request made in this process to base_url (Host header kept)."""
+    import httpx
+
+    target = httpx.URL(base_url)
+    original_async = httpx.AsyncHTTPTransport.handle_async_request
+    original_sync = httpx.HTTPTransport.handle_request
+
+    def reroute(request):
+        request.url = request.url.copy_with(scheme=target.scheme, host=target.host, port=target.port)
+
+    async def handle_async_request(self, request):
+        reroute(request)
+        return await original_async(self, request)
+
+    def handle_request(self, request):
+        reroute(request)
+        return original_sync(self, request)
+
+    httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+    httpx.HTTPTransport.handle_request = handle_request
+    try:
+        yield
+    finally:
+        httpx.AsyncHTTPTransport.handle_async_request = original_async
+        httpx.HTTPTransport.handle_request = original_sync
@@ -0,0 +1,137 @@
+"""Cooperative cancellation of in-flight downloads.
+
+A get_track_download call couldn't be stopped: the caller could only stop
+waiting, while the download kept running on the loop, using bandwidth and
+leaving gamdl_temp files behind. Every download now runs under a
+CancelHandle, registered by track ID and, when the track came from an album,
+playlist or artist, by job ID ('album:<id>', 'playlist:<id>',
+'artist:<id>', or the job_id the caller passed in). cancel_download() /
+cancel_job() cancel the download's task on its loop. Segment transfers and
+wrapper requests are aborted at their next await, the download's gamdl_temp
+folder is removed, and get_track_download raises DownloadCancelled straight
+away.
+
+A cancelled job stays cancelled, so its tracks that are still queued fail at
+once, until resume_job() or until the album, playlist or artist is listed
+again on its own (a new run of the job; listings inside an artist job keep
+the artist's state). Cached HLS segments are kept, so a re-queued track
+resumes where it stopped. A decrypt that is already running in the native
+engine can't be interrupted. It finishes in its worker thread and its output
+is thrown away.
+"""
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+
+class DownloadCancelled(Exception):
+    """The download was cancelled through cancel_download() / cancel_job()."""
+
+
+class CancelHandle:
+    """Cancellation state of one running download (thread-safe)."""
+
+    def __init__(self, track_ids, job: Optional[str] = None):
+        # The requested ID first, then e.g. the storefront equivalent actually downloaded
+        self.track_ids = [str(i) for i in dict.fromkeys(track_ids) if i is not None]
+        self.track_id = self.track_ids[0] if self.track_ids else None
+        self.job = job
+        self.reason = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._cleanups: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = 'cancelled') -> bool:
+        """Cancel the download; False if it was cancelled already."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            task = self._task
+        if task is not None and not task.done():
+            try:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # Loop already closed: nothing left to cancel
+                pass
+        return True
+
+    def bind(self, task: Optional[asyncio.Task] = None) -> None:
+        """Attach the task running the download (the current one by default)."""
+        task = task or asyncio.current_task()
+        with self._lock:
+            self._task = task
+        self.raise_if_cancelled()
+
+    def on_cancel(self, cleanup: Callable[[], None]) -> None:
+        """Run cleanup (e.g. remove partial files) if the download ends cancelled."""
+        self._cleanups.append(cleanup)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise DownloadCancelled(f"Apple Music: download of {self.track_id} {self.reason}")
+
+    def cleanup(self) -> None:
+        for cleanup in self._cleanups:
+            try:
+                cleanup()
+            except Exception:
+                pass
+        self._cleanups.clear()
+
+
+class CancelRegistry:
+    """The running downloads by track and job, and the cancelled jobs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handles = set()
+        self._cancelled_jobs = set()
+        self.cancelled = 0
+
+    @contextmanager
+    def track(self, *track_ids: str, job: Optional[str] = None):
+        """Register a download (under all of its IDs) for the duration of the block; yields its CancelHandle."""
+        handle = CancelHandle(track_ids, job)
+        with self._lock:
+            self._handles.add(handle)
+            job_cancelled = job is not None and job in self._cancelled_jobs
+        if job_cancelled:
+            handle.cancel(f'cancelled with job {job}')
+        try:
+            yield handle
+        finally:
+            with self._lock:
+                self._handles.discard(handle)
+                if handle.cancelled:
+                    self.cancelled += 1
+
+    def cancel_track(self, track_id: str) -> int:
+        """Cancel the running downloads of a track; returns how many were cancelled."""
+        with self._lock:
+            handles = [h for h in self._handles if str(track_id) in h.track_ids]
+        return sum(h.cancel() for h in handles)
+
+    def cancel_job(self, job: str) -> int:
+        """Cancel a job's running downloads and fail its queued ones; returns how many were running."""
+        with self._lock:
+            self._cancelled_jobs.add(job)
+            handles = [h for h in self._handles if h.job == job]
+        return sum(h.cancel(f'cancelled with job {job}') for h in handles)
+
+    def resume_job(self, job: str) -> None:
+        """Let a cancelled job's tracks download again."""
+        with self._lock:
+            self._cancelled_jobs.discard(job)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'running': len(self._handles), 'cancelled': self.cancelled,
+                    'cancelled_jobs': sorted(self._cancelled_jobs)}
@@ -0,0 +1,97 @@
+"""Adaptive (AIMD) concurrency limit for Apple Music API calls.
+
+Fan-outs used to run at a fixed width (five threads for search and artist
+duration backfills) whatever Apple allowed at the time. AdaptiveLimit finds
+the width instead, the way TCP finds a congestion window: every healthy
+response adds 1/limit (so about +1 per round of calls), and a 429 or a
+latency spike (a response slower than latency_factor times the recent
+average) cuts the limit by decrease. Cuts are at most one per cooldown, so a
+burst of 429s from one overload counts once.
+
+The limit drives the scheduler's shared total, and so the bulk and
+background limits (interactive calls keep a fixed share), and the width of
+the module's fan-outs, so parallelism hovers just under the point where
+Apple starts pushing back.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+_BASELINE_ALPHA = 0.1
+# Responses faster than this are never treated as a latency spike
+_MIN_SPIKE_SECONDS = 1.0
+
+
+class AdaptiveLimit:
+    """Additive-increase / multiplicative-decrease concurrency limit (thread-safe)."""
+
+    def __init__(self, initial: int = 10, minimum: int = 2, maximum: int = 32, decrease: float = 0.5,
+                 latency_factor: float = 3.0, cooldown: float = 2.0, enabled: bool = True):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self._limit = float(min(self.maximum, max(self.minimum, int(initial))))
+        self.decrease = min(0.95, max(0.1, float(decrease)))
+        self.latency_factor = float(latency_factor)
+        self.cooldown = float(cooldown)
+        self.enabled = enabled
+        # Called with the new integer limit whenever it changes
+        self.on_change: Optional[Callable[[int], None]] = None
+        self._lock = threading.Lock()
+        self._baseline = None
+        self._last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.rate_limited = 0
+        self.latency_spikes = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _set(self, value: float) -> None:
+        # Caller holds the lock
+        before = int(self._limit)
+        self._limit = min(float(self.maximum), max(float(self.minimum), value))
+        after = int(self._limit)
+        if after != before and self.on_change is not None:
+            self.on_change(after)
+
+    def _cut(self, now: float) -> None:
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self._set(self._limit * self.decrease)
+
+    def on_success(self, latency: float) -> None:
+        """A call finished without being throttled, in latency seconds."""
+        if not self.enabled:
+            return
+        with self._lock:
+            baseline = self._baseline
+            self._baseline = latency if baseline is None else baseline + _BASELINE_ALPHA * (latency - baseline)
+            if baseline is not None and latency > max(_MIN_SPIKE_SECONDS, baseline * self.latency_factor):
+                self.latency_spikes += 1
+                self._cut(time.monotonic())
+                return
+            before = int(self._limit)
+            self._set(self._limit + 1.0 / max(1.0, self._limit))
+            if int(self._limit) > before:
+                self.increases += 1
+
+    def on_rate_limited(self) -> None:
+        """A call got a 429."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.rate_limited += 1
+            self._cut(time.monotonic())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'limit': int(self._limit), 'adaptive': self.enabled, 'increases': self.increases,
+                'decreases': self.decreases, 'rate_limited': self.rate_limited,
+                'latency_spikes': self.latency_spikes,
+                'latency_baseline': round(self._baseline, 3) if self._baseline is not None else None,
+            }
@@ -0,0 +1,54 @@
+"""Per-call deadlines for _run_async.
+
+_run_async used to wait up to 1200s for anything, from a 50 ms search to a
+long Atmos download, and then retry, so a hung metadata call could tie up
+its caller for over an hour. Every call now has a deadline: the caller's
+timeout=, or the default for its kind (the *_timeout settings), measured from
+when the call was made. The deadline covers admission by the scheduler,
+retries and backoff: a retry starts only if time is left, and a backoff
+longer than what's left ends the call with the error at once.
+
+On the loop the deadline is carried in a context variable, so HTTP timeouts
+of the module's own requests shrink to what's left (http_timeout()), and the
+coroutine is cancelled when the deadline passes, so a stuck call frees its
+connections and its scheduler slot right away.
+"""
+import contextvars
+import time
+from typing import Optional
+
+# Seconds per kind of call: scheduler classes, plus whole downloads and full playlist listings
+DEFAULT_TIMEOUTS = {
+    'interactive': 60.0,
+    'bulk': 180.0,
+    'background': 30.0,
+    'listing': 600.0,
+    'download': 1200.0,
+}
+# The loop cancels at the deadline; the caller gives it this much longer before giving up itself
+GRACE_SECONDS = 5.0
+
+_deadline = contextvars.ContextVar('applemusic_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A call ran out of its time budget."""
+
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left until the running call's deadline (default outside a call)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return max(0.0, deadline - time.monotonic())
+
+
+def http_timeout(default: float) -> float:
+    """An HTTP timeout no longer than what is left of the running call's budget."""
+    left = remaining()
+    return default if left is None else max(0.1, min(default, left))
+
+
+def set_deadline(deadline: Optional[float]) -> None:
+    """Make deadline (time.monotonic()) the current one, for the running task's context."""
+    _deadline.set(deadline)
@@ -0,0 +1,80 @@
+"""Move-into-place delivery of finished files.
+
+get_track_download used to hand OrpheusDL a path in gamdl_out, which was then
+copied to the library. For ALAC and Atmos files of hundreds of MB, that
+doubled the disk I/O of every track. Instead the module can now put the file
+where it belongs:
+
+  * given destination_path (the final file) or destination_root (a library
+    folder; the file keeps its artist/album path under it), the finished file
+    is renamed into place, or hard-linked with delivery_mode 'link' (gamdl_out
+    keeps its own name for it). Only across filesystems is it copied, into a
+    .part file next to the destination that is then renamed over it, so the
+    destination never holds a partial file;
+  * given delivery_hint_path (any folder on the library's filesystem),
+    gamdl_out is placed there, so that OrpheusDL's own move is a rename too.
+"""
+import errno
+import os
+import shutil
+from pathlib import Path
+
+RENAME = 'rename'
+LINK = 'link'
+COPY = 'copy'
+
+
+def deliver(source, destination, link: bool = False) -> str:
+    """Put source at destination atomically; returns how ('rename', 'link' or 'copy').
+
+    With link the source stays where it is (as a second name of the same file,
+    or as the original of the copy).
+    """
+    source, destination = Path(source), Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if source.resolve() == destination.resolve():
+        return RENAME
+    try:
+        if not link:
+            os.replace(source, destination)
+            return RENAME
+        # os.link won't overwrite: link to a temporary name, then rename that over the destination
+        tmp = destination.with_name(destination.name + '.link')
+        try:
+            tmp.unlink()
+        except FileNotFoundError:
+            pass
+        os.link(source, tmp)
+        os.replace(tmp, destination)
+        return LINK
+    except OSError as e:
+        # Another filesystem (or, for a link, one without hard links): copy instead
+        if not link and e.errno != errno.EXDEV:
+            raise
+    tmp = destination.with_name(destination.name + '.part')
+    try:
+        shutil.copy2(source, tmp)
+        os.replace(tmp, destination)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    if not link:
+        source.unlink()
+    return COPY
+
+
+def destination_for(final_path, output_root, destination_path=None, destination_root=None):
+    """Where a file gamdl finished at final_path (under output_root) should be delivered, or None."""
+    if destination_path:
+        return Path(destination_path)
+    if not destination_root:
+        return None
+    final_path = Path(final_path)
+    try:
+        relative = final_path.relative_to(output_root)
+    except ValueError:
+        relative = Path(final_path.name)
+    return Path(destination_root) / relative
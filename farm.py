@@ -0,0 +1,380 @@
+"""Download farm: one supervisor process handing tracks to N worker processes.
+
+A single ModuleInterface has one event loop thread and does its Python-side
+work (metadata parsing, tagging, bookkeeping) under one GIL. The farm runs N
+workers, each with its own ModuleInterface and loop, so a download host can
+use all of its cores:
+
+    python -m modules.applemusic.farm --workers 4 --output ./Downloads \\
+        https://music.apple.com/us/album/.../1440857781 playlist:pl.u-abc 1440857795
+
+Run it from the OrpheusDL root; the module settings are read from
+config/settings.json. Albums and playlists are expanded by a worker and their
+tracks go back into the shared queue, so one large playlist is still spread
+over every worker. Workers deliver finished files straight into --output
+(destination_root, see delivery.py), keeping gamdl's folder layout.
+
+What the workers share:
+  * the persistent caches under cache_path (artwork, lyrics) and the download
+    archive: all SQLite in WAL mode plus atomically replaced files, so
+    several processes can use them at once;
+  * one rate budget: every API call (_run_async) takes a slot from a
+    RateBudget served by the supervisor over a multiprocessing manager, and
+    a 429 in any worker pauses the whole farm briefly.
+
+Each worker gets its own temp_path (<temp_path>/farm-<n>) so in-flight files
+never collide, and its own stats files (stats_jsonl_path, stats_prometheus_path
+and slow_call_log_path with a -farm-<n> suffix); the Prometheus samples carry a
+worker="farm-<n>" label so node_exporter can collect every worker's file. A
+worker that dies is replaced; its current track is reported as failed.
+
+Workers are not daemonic, since a worker may start its own post-processing
+processes (postprocess_mode 'process'); the supervisor stops them on exit.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+from types import SimpleNamespace
+
+# How long a 429 anywhere pauses every worker
+_PENALTY_SECONDS = 10.0
+_POLL_SECONDS = 1.0
+# Replacement workers started for crashed ones, per worker slot
+_MAX_RESTARTS = 3
+
+
+class FarmModuleError(Exception):
+    pass
+
+
+class RateBudget:
+    """Token bucket (GCRA) shared by all workers: rate calls/s with bursts of up to burst calls."""
+
+    def __init__(self, rate: float, burst: int = None, penalty_seconds: float = _PENALTY_SECONDS):
+        self.rate = max(0.01, float(rate))
+        self.burst = max(1, int(burst or self.rate * 2))
+        self.penalty_seconds = float(penalty_seconds)
+        self._interval = 1.0 / self.rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._tat = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.waited = 0.0
+        self.rate_limited = 0
+
+    def reserve(self) -> float:
+        """Reserve one call; returns how long the caller must wait before making it."""
+        with self._lock:
+            now = time.monotonic()
+            base = max(self._tat, now)
+            if self._paused_until > now:
+                base = max(base, self._paused_until + self._tolerance)
+            wait = max(0.0, base - self._tolerance - now)
+            self._tat = base + self._interval
+            self.granted += 1
+            self.waited += wait
+            return wait
+
+    def penalize(self) -> None:
+        """A worker got a 429: hold every worker's next call for penalty_seconds."""
+        with self._lock:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + self.penalty_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'rate': self.rate, 'burst': self.burst, 'granted': self.granted,
+                'waited_seconds': round(self.waited, 1), 'rate_limited': self.rate_limited,
+                'paused_for': round(max(0.0, self._paused_until - time.monotonic()), 1),
+            }
+
+
+class _FarmManager(BaseManager):
+    pass
+
+
+_FarmManager.register('RateBudget', RateBudget)
+
+_URL_PATTERN = re.compile(r'music\.apple\.com/[^/]+/(album|playlist|song)/(?:[^/?]+/)?([^/?#]+)(?:\?(.*))?')
+
+
+def parse_target(target: str):
+    """(kind, id) for an Apple Music URL, 'album:<id>' / 'playlist:<id>' / 'track:<id>' or a bare track ID."""
+    target = target.strip()
+    match = _URL_PATTERN.search(target)
+    if match:
+        kind, item_id, query = match.groups()
+        track = re.search(r'(?:^|&)i=([^&]+)', query or '')
+        if kind == 'album' and track:
+            return 'track', track.group(1)
+        return ('track' if kind == 'song' else kind), item_id
+    kind, sep, item_id = target.partition(':')
+    if sep and kind in ('album', 'playlist', 'track'):
+        return kind, item_id
+    return 'track', target
+
+
+def load_module_settings(path) -> dict:
+    """The applemusic section of OrpheusDL's settings.json ({} if missing)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('modules', {}).get('applemusic', {}) or {}
+    except (OSError, ValueError):
+        return {}
+
+
+def create_module(settings: dict):
+    """ModuleInterface for a worker, with a minimal stand-in for OrpheusDL's module controller."""
+    from .interface import ModuleInterface
+
+    controller = SimpleNamespace(
+        module_settings=settings,
+        module_error=FarmModuleError,
+        printer_controller=None,
+        orpheus_options=SimpleNamespace(
+            debug_mode=bool(settings.get('debug', False)), play_sound_on_finish=False,
+            default_cover_options=SimpleNamespace(resolution=1400),
+        ),
+    )
+    return ModuleInterface(controller)
+
+
+def _expand(module, kind: str, item_id: str) -> list:
+    """Track tasks of an album or playlist; rows are expanded so other processes can use them."""
+    info = module.get_album_info(item_id) if kind == 'album' else module.get_playlist_info(item_id)
+    if info is None:
+        raise FarmModuleError(f"{kind} {item_id} not found")
+    extra = dict(getattr(info, 'track_extra_kwargs', None) or {})
+    tasks = []
+    for row in info.tracks:
+        if isinstance(row, dict) and 'shared' in row:
+            row = module._track_rows.api_data(row)
+        track_id = str(row.get('id')) if isinstance(row, dict) else str(row)
+        tasks.append(('track', track_id, row, extra))
+    return tasks
+
+
+def _download(module, track_id: str, track, extra: dict, quality_tier, codec_options, output: Path):
+    """Download one track into output; returns its path, or None if the archive already has it."""
+    if module.check_archive(track_id, quality_tier):
+        return None
+    info = module.get_track_info(track, quality_tier, codec_options, **extra)
+    if info is None:
+        raise FarmModuleError("no track info")
+    if info.error:
+        raise FarmModuleError(info.error)
+    # Delivered straight into output (a rename when it shares the worker's filesystem)
+    download = module.get_track_download(**{**(info.download_extra_kwargs or {}), 'destination_root': str(output)})
+    return download.temp_file_path
+
+
+def _worker_path(path: str, index: int) -> str:
+    """A worker's own copy of a stats file path: name-farm-<n>.ext next to it."""
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}-farm-{index}{path.suffix}"))
+
+
+def _worker_settings(settings: dict, index: int) -> dict:
+    """Settings of worker index: its own temp_path and stats files."""
+    worker = {**settings, 'temp_path': str(Path(settings.get('temp_path') or 'temp') / f'farm-{index}'),
+              'stats_worker': f'farm-{index}'}
+    for key in ('stats_jsonl_path', 'stats_prometheus_path', 'slow_call_log_path'):
+        if settings.get(key):
+            worker[key] = _worker_path(settings[key], index)
+    return worker
+
+
+def _worker_main(index: int, settings: dict, tasks, results, budget, options: dict) -> None:
+    from utils.models import CodecOptions, QualityEnum
+
+    settings = _worker_settings(settings, index)
+    try:
+        module = create_module(settings)
+    except Exception as e:
+        results.put(('dead', index, None, f"{type(e).__name__}: {e}"))
+        return
+    module.rate_budget = budget
+    quality_tier = QualityEnum[options['quality']]
+    codec_options = CodecOptions(proprietary_codecs=options['proprietary_codecs'],
+                                 spatial_codecs=options['spatial_codecs'])
+    output = Path(options['output'])
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        kind, item_id, data, extra = task
+        key = f"{kind}:{item_id}"
+        results.put(('started', index, key, os.getpid()))
+        start = time.perf_counter()
+        try:
+            if kind == 'track':
+                path = _download(module, item_id, data or item_id, extra, quality_tier, codec_options, output)
+                if path is None:
+                    results.put(('skipped', index, key, None))
+                else:
+                    results.put(('done', index, key, {'path': path, 'seconds': round(time.perf_counter() - start, 2)}))
+            else:
+                results.put(('expanded', index, key, _expand(module, kind, item_id)))
+        except Exception as e:
+            results.put(('failed', index, key, f"{type(e).__name__}: {e}"))
+    results.put(('stats', index, None, module.get_stats()))
+
+
+class Supervisor:
+    """Starts the workers, feeds the task queue and collects results."""
+
+    def __init__(self, settings: dict, workers: int, options: dict, rate: float, burst: int = None):
+        self.settings = settings
+        self.workers = max(1, int(workers))
+        self.options = options
+        self._context = multiprocessing.get_context('spawn')
+        self._manager = _FarmManager(ctx=self._context)
+        self._manager.start()
+        self.budget = self._manager.RateBudget(rate, burst)
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        self._processes = {}
+        self._current = {}
+        self._restarts = {}
+        self._seen = set()
+        self.outstanding = 0
+        self.done, self.skipped, self.failed = [], [], []
+        # Albums and playlists whose tracks were queued
+        self.expanded = []
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=_worker_main, name=f'AppleMusicFarm-{index}', daemon=False,
+            args=(index, self.settings, self._tasks, self._results, self.budget, self.options),
+        )
+        process.start()
+        self._processes[index] = process
+
+    def submit(self, kind: str, item_id: str, data=None, extra: dict = None) -> None:
+        key = f"{kind}:{item_id}"
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.outstanding += 1
+        self._tasks.put((kind, item_id, data, extra or {}))
+
+    def _handle(self, message) -> None:
+        event, index, key, payload = message
+        if event == 'started':
+            self._current[index] = key
+            return
+        if event == 'dead':
+            print(f"[Apple Music Error] Farm worker {index} could not start: {payload}")
+            self._processes.pop(index, None)
+            return
+        if event == 'stats':
+            return
+        self._current.pop(index, None)
+        self.outstanding -= 1
+        if event == 'expanded':
+            self.expanded.append(key)
+            print(f"[Apple Music] {key}: {len(payload)} tracks")
+            for kind, item_id, data, extra in payload:
+                self.submit(kind, item_id, data, extra)
+        elif event == 'skipped':
+            self.skipped.append(key)
+        elif event == 'done':
+            self.done.append((key, payload['path']))
+            print(f"[Apple Music] {key} -> {payload['path']} ({payload['seconds']}s, worker {index})")
+        else:
+            self.failed.append((key, payload))
+            print(f"[Apple Music Error] {key}: {payload}")
+
+    def _check_workers(self) -> None:
+        for index, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            self._processes.pop(index)
+            key = self._current.pop(index, None)
+            if key is not None:
+                self.outstanding -= 1
+                self.failed.append((key, f"worker exited with code {process.exitcode}"))
+                print(f"[Apple Music Error] {key}: farm worker {index} exited (code {process.exitcode})")
+            if self._restarts.get(index, 0) < _MAX_RESTARTS:
+                self._restarts[index] = self._restarts.get(index, 0) + 1
+                self._spawn(index)
+
+    def run(self, targets) -> int:
+        for target in targets:
+            self.submit(*parse_target(target))
+        for index in range(1, self.workers + 1):
+            self._spawn(index)
+        try:
+            while self.outstanding > 0:
+                if not self._processes:
+                    print("[Apple Music Error] No farm worker is running")
+                    break
+                try:
+                    self._handle(self._results.get(timeout=_POLL_SECONDS))
+                except queue.Empty:
+                    pass
+                self._check_workers()
+        finally:
+            self.shutdown()
+        budget = self.budget.stats()
+        print(f"[Apple Music] Farm finished: {len(self.done)} downloaded, {len(self.skipped)} already archived, "
+              f"{len(self.failed)} failed, {budget['waited_seconds']}s waited on the shared rate budget")
+        return 1 if self.failed or self.outstanding else 0
+
+    def shutdown(self) -> None:
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes.values():
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=5)
+
+    def close(self) -> None:
+        self._manager.shutdown()
+
+
+def add_options(parser: argparse.ArgumentParser) -> None:
+    """Worker, output and rate options shared by the farm and library mirror command lines."""
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument('--settings', default='config/settings.json', help="OrpheusDL settings file")
+    parser.add_argument('--output', default='downloads', help="Folder finished files are moved into")
+    parser.add_argument('--quality', default='LOSSLESS', help="OrpheusDL quality tier (e.g. HIGH, LOSSLESS, HIFI)")
+    parser.add_argument('--no-spatial', action='store_true', help="Don't pick Atmos/spatial codecs")
+    parser.add_argument('--rate', type=float, default=10.0, help="API calls per second for the whole farm")
+    parser.add_argument('--burst', type=int, default=None, help="Calls allowed in a burst (default: 2x rate)")
+
+
+def worker_options(args) -> dict:
+    return {
+        'output': str(Path(args.output).resolve()), 'quality': args.quality.upper(),
+        'proprietary_codecs': True, 'spatial_codecs': not args.no_spatial,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('targets', nargs='+', help="Apple Music URLs, album:<id>, playlist:<id> or track IDs")
+    add_options(parser)
+    args = parser.parse_args(argv)
+
+    supervisor = Supervisor(load_module_settings(args.settings), args.workers, worker_options(args),
+                            args.rate, args.burst)
+    try:
+        return supervisor.run(args.targets)
+    finally:
+        supervisor.close()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,298 @@
+"""Native HLS media-playlist download with a resumable segment cache.
+
+Apple Music audio streams are fragmented MP4 media playlists: an EXT-X-MAP
+init section followed by byte-range (or whole-file) segments. Fetching them
+natively — instead of handing the playlist to yt-dlp / N_m3u8DL-RE — lets every
+finished segment be kept on disk, so a retry or re-run only fetches the
+segments that are still missing.
+"""
+import asyncio
+import hashlib
+import shutil
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .deadlines import http_timeout
+
+# Segment-level encryption we would have to undo ourselves; SAMPLE-AES/CENC
+# streams are stored raw and decrypted later by gamdl's engine.
+_UNSUPPORTED_KEY_METHODS = frozenset({'AES-128'})
+
+
+class UnsupportedPlaylistError(Exception):
+    """The playlist can't be fetched natively (caller should fall back to gamdl's downloader)."""
+
+
+class SegmentIntegrityError(Exception):
+    """A fetched segment didn't match its expected length."""
+
+
+class Segment(NamedTuple):
+    url: str
+    offset: Optional[int]
+    length: Optional[int]
+    duration: float
+
+    @property
+    def range_header(self) -> Optional[str]:
+        if self.offset is None or self.length is None:
+            return None
+        return f"bytes={self.offset}-{self.offset + self.length - 1}"
+
+
+class MediaPlaylist(NamedTuple):
+    url: str
+    init: Optional[Segment]
+    segments: List[Segment]
+
+    @property
+    def duration(self) -> float:
+        """Summed EXTINF duration in seconds."""
+        return sum(segment.duration for segment in self.segments)
+
+    @property
+    def parts(self) -> List[Segment]:
+        """Init section (if any) followed by the media segments, in file order."""
+        return ([self.init] if self.init else []) + self.segments
+
+
+def is_hls_url(url: str) -> bool:
+    return (url or '').split('?')[0].endswith('.m3u8')
+
+
+def _parse_byterange(byterange: Optional[str], next_offset: dict, url: str):
+    """(offset, length) from an 'n[@o]' byterange; implicit offsets continue the previous range."""
+    if not byterange:
+        return None, None
+    length, _, offset = str(byterange).partition('@')
+    length = int(length)
+    offset = int(offset) if offset else next_offset.get(url, 0)
+    next_offset[url] = offset + length
+    return offset, length
+
+
+def parse_media_playlist(text: str, url: str) -> MediaPlaylist:
+    """Parse an HLS media playlist into its init section and ordered segments."""
+    import m3u8
+
+    playlist = m3u8.loads(text, uri=url)
+    if playlist.is_variant:
+        raise UnsupportedPlaylistError("expected a media playlist, got a master playlist")
+    for key in playlist.keys:
+        if key and key.method and key.method.upper() in _UNSUPPORTED_KEY_METHODS:
+            raise UnsupportedPlaylistError(f"segment encryption {key.method} is not supported")
+
+    next_offset = {}
+    init = None
+    segments = []
+    for seg in playlist.segments:
+        if init is None and seg.init_section is not None:
+            init_url = seg.init_section.absolute_uri
+            offset, length = _parse_byterange(seg.init_section.byterange, next_offset, init_url)
+            init = Segment(init_url, offset, length, 0.0)
+        offset, length = _parse_byterange(seg.byterange, next_offset, seg.absolute_uri)
+        segments.append(Segment(seg.absolute_uri, offset, length, float(seg.duration or 0.0)))
+    if not segments:
+        raise UnsupportedPlaylistError("media playlist has no segments")
+    return MediaPlaylist(url, init, segments)
+
+
+def _strip_query(url: str) -> str:
+    # Segment URLs are content-addressed paths; query strings only carry
+    # per-session tokens, which would defeat resuming across runs.
+    parts = urllib.parse.urlsplit(url)
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+class SegmentCache:
+    """On-disk segment store: one folder per media playlist, one file per segment.
+
+    Each segment is written atomically next to a SHA-256 sidecar; a segment only
+    counts as cached when its bytes, expected length and digest all agree.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.hits = self.misses = self.corrupt = 0
+        self.bytes_reused = 0
+
+    def playlist_dir(self, playlist_url: str) -> Path:
+        """The folder holding one media playlist's segments."""
+        return self.root / hashlib.sha256(_strip_query(playlist_url).encode()).hexdigest()[:32]
+
+    def _segment_path(self, playlist_url: str, segment: Segment) -> Path:
+        key = f"{_strip_query(segment.url)}|{segment.offset}|{segment.length}"
+        return self.playlist_dir(playlist_url) / (hashlib.sha256(key.encode()).hexdigest()[:40] + '.seg')
+
+    def get(self, playlist_url: str, segment: Segment) -> Optional[bytes]:
+        path = self._segment_path(playlist_url, segment)
+        digest_path = path.with_suffix('.sha256')
+        try:
+            data = path.read_bytes()
+            expected = digest_path.read_text().strip()
+        except OSError:
+            self.misses += 1
+            return None
+        if (segment.length is not None and len(data) != segment.length) or hashlib.sha256(data).hexdigest() != expected:
+            self.corrupt += 1
+            self.misses += 1
+            for stale in (path, digest_path):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+            return None
+        self.hits += 1
+        self.bytes_reused += len(data)
+        return data
+
+    def put(self, playlist_url: str, segment: Segment, data: bytes) -> None:
+        path = self._segment_path(playlist_url, segment)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.part')
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        # Digest is written last: a crash in between leaves a segment without a
+        # sidecar, which get() treats as missing
+        path.with_suffix('.sha256').write_text(hashlib.sha256(data).hexdigest())
+
+    def discard(self, playlist_url: str) -> None:
+        """Drop every cached segment of a playlist (after the track finished)."""
+        shutil.rmtree(self.playlist_dir(playlist_url), ignore_errors=True)
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'corrupt': self.corrupt, 'bytes_reused': self.bytes_reused}
+
+
+async def fetch_media_playlist(stream_url: str, client=None, timeout: float = 30.0) -> MediaPlaylist:
+    """Fetch and parse a media playlist (without downloading any segment)."""
+    import httpx
+
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(timeout=http_timeout(timeout))
+    try:
+        response = await client.get(stream_url, follow_redirects=True)
+        response.raise_for_status()
+        return parse_media_playlist(response.text, stream_url)
+    finally:
+        if own_client:
+            await client.aclose()
+
+
+async def fetch_segment(client, segment: Segment, retries: int = 3, on_retry=None) -> bytes:
+    """Fetch one segment (honouring its byte range), retrying transient failures.
+
+    on_retry(), if given, is called before each retry (for retry accounting).
+    """
+    import httpx
+
+    headers = {'Range': segment.range_header} if segment.range_header else None
+    last_error = None
+    for attempt in range(retries):
+        try:
+            response = await client.get(segment.url, headers=headers, follow_redirects=True)
+            response.raise_for_status()
+            data = response.content
+            if segment.length is not None and len(data) != segment.length:
+                raise SegmentIntegrityError(
+                    f"segment {segment.url} range {segment.range_header}: expected {segment.length} bytes, got {len(data)}"
+                )
+            return data
+        except (httpx.HTTPError, SegmentIntegrityError) as e:
+            last_error = e
+            if attempt < retries - 1:
+                if on_retry:
+                    on_retry()
+                await asyncio.sleep(0.5 * (attempt + 1))
+    raise last_error
+
+
+async def _gather_or_cancel(coros) -> list:
+    """asyncio.gather that cancels the remaining tasks as soon as one fails."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def download_hls(stream_url: str, download_path: str, cache: Optional[SegmentCache] = None,
+                       client=None, connections: int = 1, timeout: float = 60.0, on_retry=None,
+                       playlist: Optional[MediaPlaylist] = None) -> MediaPlaylist:
+    """Download a media playlist into a single file, reusing cached segments.
+
+    Missing segments are fetched over up to `connections` pooled connections and
+    cached as they arrive, so an interrupted download resumes with only the
+    segments that aren't cached yet. When every part has a known byte length
+    (Apple's single-file byte-range playlists) the output is preallocated and
+    each segment is written at its own offset as soon as it lands; otherwise
+    segments are fetched in windows of `connections` and appended in order.
+    Disk writes run in worker threads, so fetching overlaps with writing.
+    playlist is stream_url's media playlist, if the caller already fetched it.
+    """
+    import httpx
+
+    connections = max(1, int(connections))
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(
+            timeout=http_timeout(timeout),
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        )
+    try:
+        if playlist is None:
+            playlist = await fetch_media_playlist(stream_url, client)
+        parts = playlist.parts
+
+        async def get_part(segment: Segment) -> bytes:
+            # Cache reads/writes (file I/O and hashing) run off the loop
+            data = await asyncio.to_thread(cache.get, stream_url, segment) if cache else None
+            if data is None:
+                data = await fetch_segment(client, segment, on_retry=on_retry)
+                if cache:
+                    await asyncio.to_thread(cache.put, stream_url, segment, data)
+            return data
+
+        output = Path(download_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(output.name + '.part')
+        with open(tmp, 'wb') as f:
+            if all(part.length is not None for part in parts):
+                offsets = []
+                total = 0
+                for part in parts:
+                    offsets.append(total)
+                    total += part.length
+                await asyncio.to_thread(f.truncate, total)
+                pending = iter(enumerate(parts))
+                # seek + write must not interleave between threads (os.pwrite isn't on Windows)
+                write_lock = threading.Lock()
+
+                def write_at(offset: int, data: bytes) -> None:
+                    with write_lock:
+                        f.seek(offset)
+                        f.write(data)
+
+                async def worker():
+                    # Workers share one iterator, so each part is claimed exactly once
+                    for index, segment in pending:
+                        data = await get_part(segment)
+                        await asyncio.to_thread(write_at, offsets[index], data)
+
+                await _gather_or_cancel(worker() for _ in range(min(connections, len(parts))))
+            else:
+                for start in range(0, len(parts), connections):
+                    window = await _gather_or_cancel(get_part(p) for p in parts[start:start + connections])
+                    await asyncio.to_thread(f.writelines, window)
+        tmp.replace(output)
+        return playlist
+    finally:
+        if own_client:
+            await client.aclose()
@@ -13,7 +13,7 @@ import threading
 import concurrent.futures
 import urllib.parse
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from contextlib import contextmanager, nullcontext
 import asyncio
 
@@ -68,6 +68,17 @@ def _filter_standard_lossless(playlists: list) -> list:
     return filtered
 
 
+async def _fetch_artwork_bytes(url: str) -> Optional[bytes]:
+    """Download artwork bytes (None on 404), mirroring gamdl's get_cover_bytes."""
+    import httpx
+    async with httpx.AsyncClient(timeout=http_timeout(30.0)) as client:
+        response = await client.get(url, follow_redirects=True)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+
 # Substrings that indicate the local decryption wrapper (WV2D/amdecrypt) is not reachable.
 _WRAPPER_CONN_ERROR_MARKERS = (
     "10061", "127.0.0.1", "connectionrefused", "refused", "geweigerd", "dial tcp", "connect error",
@@ -157,6 +168,7 @@ def _lazy_import_gamdl():
             SongCodec as GamdlSongCodec,
             SyncedLyricsFormat
         )
+        from gamdl.interface.types import Lyrics, MediaTags
         from gamdl.downloader.enums import (
             DownloadMode as GamdlDownloadMode,
         )
@@ -165,10 +177,19 @@ def _lazy_import_gamdl():
             globals()[name] = locals()[name]
 
         class OrpheusAppleMusicSongInterface(AppleMusicSongInterface):
-            def __init__(self, base: AppleMusicBaseInterface, quality_tier: QualityEnum = None, debug: bool = False, **kwargs):
+            def __init__(self, base: AppleMusicBaseInterface, quality_tier: QualityEnum = None, debug: bool = False,
+                         lyrics_provider=None, **kwargs):
                 super().__init__(base, **kwargs)
                 self.quality_tier = quality_tier
                 self._debug = debug
+                # async (song_metadata) -> CachedLyrics; routes gamdl's tag lyrics through the module cache
+                self.lyrics_provider = lyrics_provider
+
+            async def get_lyrics(self, song_metadata: dict) -> Lyrics | None:
+                if self.lyrics_provider is None:
+                    return await super().get_lyrics(song_metadata)
+                cached = await self.lyrics_provider(song_metadata)
+                return Lyrics(synced=cached.synced, unsynced=cached.unsynced) if cached else None
 
             def _get_playlist_from_codec_enhanced(self, m3u8_data: dict, codec: 'GamdlSongCodec') -> dict | None:
                 from gamdl.interface.constants import SONG_CODEC_REGEX_MAP
@@ -202,7 +223,156 @@ def _lazy_import_gamdl():
                     key=lambda x: x["stream_info"]["average_bandwidth"],
                 )
 
+        class OrpheusAppleMusicBaseInterface(AppleMusicBaseInterface):
+            # Set by ModuleInterface after create(); None keeps gamdl's own per-instance fetch
+            artwork_cache = None
+
+            # With an account pool, use the account leased by the running _run_async call
+            @property
+            def apple_music_api(self):
+                account = current_account()
+                if account is not None and account.api is not None:
+                    return account.api
+                return self._apple_music_api
+
+            @apple_music_api.setter
+            def apple_music_api(self, api):
+                self._apple_music_api = api
+
+            # With several wrappers, use the endpoint leased by the running download
+            @property
+            def wrapper_api(self):
+                endpoint = current_endpoint()
+                if endpoint is not None and endpoint.api is not None:
+                    return endpoint.api
+                return self._wrapper_api
+
+            @wrapper_api.setter
+            def wrapper_api(self, api):
+                self._wrapper_api = api
+
+            async def get_cover_bytes(self, cover_url: str) -> bytes | None:
+                split = split_artwork_url(cover_url) if self.artwork_cache else None
+                if not split:
+                    return await super().get_cover_bytes(cover_url)
+                return await self.artwork_cache.get(*split, fetch=_fetch_artwork_bytes)
+
+        class OrpheusAppleMusicBaseDownloader(AppleMusicBaseDownloader):
+            # Set by ModuleInterface. HLS streams are fetched natively (through the segment
+            # cache, if enabled) only in the 'native' download mode; otherwise gamdl's
+            # yt-dlp / N_m3u8DL-RE path handles every stream.
+            segment_cache = None
+            native = False
+            # Parallel segment fetches per track, in the native mode only
+            connections = 1
+            telemetry = None
+            # PostProcessPool for decrypt/remux and tagging; None keeps gamdl's asyncio.to_thread
+            postprocess = None
+            # TempSpace placing (and later removing) each download's temp folder
+            temp_space = None
+            # streaming_decrypt: streams whose temp folder is in RAM bypass the on-disk segment cache
+            streaming = False
+            # stream URL -> MediaPlaylist the preview check already fetched (native mode)
+            playlists = None
+
+            def span(self, stage: str):
+                return self.telemetry.span(stage) if self.telemetry else nullcontext()
+
+            def count(self, name: str, value: int = 1) -> None:
+                if self.telemetry:
+                    self.telemetry.count(name, value)
+
+            async def download_stream(self, stream_url: str, download_path: str):
+                with self.span('segment_download'):
+                    await self._download_stream(stream_url, download_path)
+                try:
+                    self.count('bytes_downloaded', os.path.getsize(download_path))
+                except OSError:
+                    pass
+
+            async def _download_stream(self, stream_url: str, download_path: str):
+                streamed = self.streaming and self.temp_space is not None and self.temp_space.in_ram(download_path)
+                if not self.native or not is_hls_url(stream_url):
+                    return await super().download_stream(stream_url, download_path)
+                if streamed:
+                    self.count('streamed_downloads')
+                playlist = self.playlists.pop(stream_url, None) if self.playlists else None
+                cache = None if streamed else self.segment_cache
+                # Keep temp-space eviction away from the segments this download is still using
+                segments = cache.playlist_dir(stream_url) if cache is not None and self.temp_space is not None else None
+                if segments is not None:
+                    self.temp_space.hold_segments(segments)
+                try:
+                    await download_hls(stream_url, download_path, cache=cache,
+                                       connections=self.connections, on_retry=lambda: self.count('segment_retries'),
+                                       playlist=playlist)
+                except UnsupportedPlaylistError as e:
+                    if not self.silent: print(f"[Apple Music Debug] Native HLS download unavailable ({e}); using {self.download_mode}")
+                    await super().download_stream(stream_url, download_path)
+                finally:
+                    if segments is not None:
+                        self.temp_space.release_segments(segments)
+
+            async def apply_tags(self, media_path: str, tags, cover_bytes: bytes | None):
+                with self.span('tagging'):
+                    if self.postprocess is None:
+                        return await super().apply_tags(media_path, tags, cover_bytes)
+                    # Same as gamdl's apply_tags, but mutagen runs on the post-processing pool
+                    exclude_tags = self.exclude_tags or []
+                    filtered_tags = MediaTags(**{k: v for k, v in tags.__dict__.items()
+                                                 if v is not None and k not in exclude_tags})
+                    await self.postprocess.run(
+                        'tagging', self._apply_mp4_tags, media_path,
+                        filtered_tags.as_mp4_tags(self.date_tag_template), cover_bytes, 'all' in exclude_tags,
+                    )
+
+            def get_temp_path(self, media_id: str, folder_tag: str, file_tag: str, file_extension: str) -> str:
+                if self.temp_space is None:
+                    return super().get_temp_path(media_id, folder_tag, file_tag, file_extension)
+                return str(self.temp_space.folder(folder_tag) / f"{media_id}_{file_tag}{file_extension}")
+
+            def discard_segments(self, stream_url: str) -> None:
+                if self.segment_cache is not None and stream_url:
+                    self.segment_cache.discard(stream_url)
+
+        class OrpheusAppleMusicSongDownloader(AppleMusicSongDownloader):
+            async def stage(self, *args, **kwargs):
+                # Decrypt + remux in gamdl's Rust engine (wrapper or hex key)
+                with self.base.span('decrypt_remux'):
+                    await super().stage(*args, **kwargs)
+
+            async def _decrypt_ammuxer(self, input_path: str, output_path: str, media_id: str, fairplay_key: str,
+                                       use_single_content_key: bool = False) -> None:
+                if self.base.postprocess is None:
+                    return await super()._decrypt_ammuxer(input_path, output_path, media_id, fairplay_key,
+                                                          use_single_content_key=use_single_content_key)
+                from gamdl import _ammuxer
+                # Resolved here, on the loop, where the leased wrapper endpoint is visible
+                wrapper_api = self.base.interface.base.wrapper_api
+                if wrapper_api is None:
+                    raise ValueError("wrapper_api is required for FairPlay decrypt")
+                await self.base.postprocess.run(
+                    'remux', _ammuxer.decrypt_and_mux_wrapper_native, wrapper_api.decrypt_host,
+                    wrapper_api.decrypt_port, media_id, input_path, output_path, fairplay_key, None, None,
+                    use_single_content_key, False, picklable=True,
+                )
+
+            async def _decrypt_ammuxer_hex(self, input_path: str, output_path: str, decryption_key: str, *,
+                                           use_cenc: bool = False, use_single_content_key: bool = False) -> None:
+                if self.base.postprocess is None:
+                    return await super()._decrypt_ammuxer_hex(input_path, output_path, decryption_key,
+                                                              use_cenc=use_cenc,
+                                                              use_single_content_key=use_single_content_key)
+                from gamdl import _ammuxer
+                await self.base.postprocess.run(
+                    'remux', _ammuxer.decrypt_and_mux_hex_native, decryption_key, input_path, output_path,
+                    None, None, use_cenc, use_single_content_key, False, picklable=True,
+                )
+
         globals()['OrpheusAppleMusicSongInterface'] = OrpheusAppleMusicSongInterface
+        globals()['OrpheusAppleMusicBaseInterface'] = OrpheusAppleMusicBaseInterface
+        globals()['OrpheusAppleMusicBaseDownloader'] = OrpheusAppleMusicBaseDownloader
+        globals()['OrpheusAppleMusicSongDownloader'] = OrpheusAppleMusicSongDownloader
         globals()['GAMDL_AVAILABLE'] = True
         LAST_GAMDL_ERROR = None
 
@@ -253,7 +423,37 @@ from utils.models import (
 )
 from utils.exceptions import AuthenticationError, DownloadError, TrackUnavailableError
 
+from .artwork_cache import ARTWORK_URL_PREFIXES, ArtworkCache, artwork_adapter, format_artwork_url, split_artwork_url
+from .lyrics_cache import CachedLyrics, LyricsCache, NO_LYRICS
+from .hls import MediaPlaylist, SegmentCache, UnsupportedPlaylistError, download_hls, fetch_media_playlist, is_hls_url
+from .archive import ArchiveEntry, DownloadArchive, file_checksum, probe_codec
+from .library import KINDS as LIBRARY_KINDS, PAGE_SIZE as LIBRARY_PAGE_SIZE, LibraryDelta, LibrarySnapshot, catalog_id_of
+from .stats import Telemetry, call_arguments, call_name
+from .fixtures import FixtureStore, TrafficHook
+from .trackrows import LazyTrackRows, TrackRowStore
+from .accounts import Account, AccountPool, current_account, is_rate_limit_error, parse_pool_setting
+from .wrappers import WrapperEndpoint, WrapperPool, current_endpoint, parse_wrapper_urls
+from .postprocess import PostProcessPool
+from .lanes import BULK, INTERACTIVE, Lane, LaneLocal, in_lane
+from .scheduler import BACKGROUND, DOWNLOAD, CallScheduler
+from .concurrency import AdaptiveLimit
+from .tempspace import TempSpace
+from .delivery import deliver, destination_for
+from .cancellation import CancelRegistry, DownloadCancelled
+from .deadlines import DEFAULT_TIMEOUTS, GRACE_SECONDS, DeadlineExceeded, http_timeout, set_deadline
+
 DEFAULT_WRAPPER_URL = "127.0.0.1"
+
+
+class _EquivalentRetry(Exception):
+    """A preview-only stream has an equivalent track in the account storefront: download that one instead."""
+
+    def __init__(self, track_id: str):
+        super().__init__(track_id)
+        self.track_id = track_id
+
+# download_mode value for the module's own parallel HLS segment downloader (alongside gamdl's ytdlp/nm3u8dlre)
+NATIVE_DOWNLOAD_MODE = "native"
 _LEGACY_WRAPPER_HOSTS = frozenset({
     "127.0.0.1:10020",
     "localhost:10020",
@@ -384,6 +584,14 @@ def _configure_gamdl_structlog(debug: bool) -> None:
 _configure_gamdl_structlog(False)
 
 class ModuleInterface:
+    # Loop-bound clients: one per lane (interactive / bulk event loop, see lanes.py)
+    _apple_music_api = LaneLocal()
+    itunes_api = LaneLocal()
+    wrapper_api = LaneLocal()
+    # In-flight lyrics fetches (futures of the lane's loop), so prefetch and
+    # get_track_lyrics never request the same song twice
+    _lyrics_inflight = LaneLocal(dict)
+
     def __init__(self, module_controller: ModuleController):
         self.exception = module_controller.module_error
         settings = module_controller.module_settings
@@ -400,16 +608,81 @@ class ModuleInterface:
         # Lock for synchronizing async operations across threads
         self._lock = threading.Lock()
 
-        # Persistent event loop and thread for async operations to avoid asyncio.run() overhead
-        self._loop_ready = threading.Event()
-        self.loop = None
-        self.loop_thread = None
+        # Optional extra accounts; the module's own client is always the first one
+        pool_entries = parse_pool_setting(settings.get('account_pool'))
+        self._accounts = AccountPool([Account('primary', '')] + [
+            Account(Path(entry).stem if entry.endswith('.txt') or os.path.exists(entry) else f'token{index}', entry)
+            for index, entry in enumerate(pool_entries, start=2)
+        ]) if pool_entries else None
+        self._wrapper_pool = None
+        self._postprocess = None
+        # Priority admission of _run_async calls (see scheduler.py)
+        limits = {name: settings.get(f'{name}_concurrency') for name in ('bulk', 'background')}
+        self._scheduler = CallScheduler(
+            total=int(settings.get('api_concurrency', 10)),
+            limits={name: limit for name, limit in limits.items() if limit},
+            max_wait=float(settings.get('scheduler_max_wait_ms', 5000)) / 1000,
+            reserve=int(settings.get('interactive_reserve', 2)),
+        )
+        # AIMD limit on concurrent API calls: the scheduler's bulk/background total and the fan-out width
+        self._concurrency = AdaptiveLimit(
+            initial=self._scheduler.total,
+            maximum=int(settings.get('max_api_concurrency', 32)),
+            enabled=bool(settings.get('adaptive_concurrency', True)),
+        )
+        self._concurrency.on_change = self._scheduler.set_total
+        self._scheduler_local = threading.local()
+        # Default _run_async budgets (seconds) per scheduler class, whole downloads and full listings
+        self._timeouts = {kind: float(settings.get(f'{kind}_timeout') or default)
+                          for kind, default in DEFAULT_TIMEOUTS.items()}
+        # Running downloads by track and job, for cancel_download() / cancel_job()
+        self._cancellations = CancelRegistry()
+        # Shared call budget of a download farm worker (farm.RateBudget proxy); None outside a farm
+        self.rate_budget = None
+
+        # Persistent event loops for async operations: interactive calls, and downloads on
+        # their own (bulk) loop unless separate_download_loop is off
+        self._lanes = {INTERACTIVE: Lane(INTERACTIVE, 'AppleMusicLoop'), BULK: Lane(BULK, 'AppleMusicBulkLoop')}
+        self._download_lane = BULK if settings.get('separate_download_loop', True) else INTERACTIVE
         self._start_background_loop()
 
         # Cache for wrapper health to avoid redundant timeouts
         self._wrapper_offline = False
         self._last_gamdl_init_error = None
 
+        # Shared cover art / lyrics caches (created lazily under cache_path)
+        self._artwork_cache = None
+        self._artwork_cache_failed = False
+        self._lyrics_cache = None
+        self._lyrics_cache_failed = False
+        self._lyrics_parser = None
+        # Album/playlist rows waiting for a download before their lyrics are prefetched:
+        # track ID -> (rows, country), oldest listing first
+        self._lyrics_batches = {}
+        self._lyrics_batches_lock = threading.Lock()
+        self._lyrics_prefetcher = None
+        # Download archive (opt-in), consulted before any manifest/license work
+        self._archive = None
+        self._track_rows = TrackRowStore()
+        self._archive_failed = False
+        # Library mirror snapshot (created on first library_delta())
+        self._library_snapshot = None
+        # Per-stage timings of get_track_info / downloads (see get_stats)
+        self._telemetry = Telemetry(
+            jsonl_path=settings.get('stats_jsonl_path') or None,
+            prometheus_path=settings.get('stats_prometheus_path') or None,
+            prometheus_interval=float(settings.get('stats_prometheus_interval', 15)),
+            # Set per farm worker, so the workers' Prometheus files don't collide
+            labels={'worker': settings['stats_worker']} if settings.get('stats_worker') else None,
+            slow_call_seconds=float(settings.get('slow_call_ms', 5000)) / 1000,
+            slow_call_log_path=settings.get('slow_call_log_path') or None,
+        )
+
+        # Optional HTTP record/replay (must be in place before the API clients are created)
+        self._traffic_hook = self._install_traffic_hook()
+        # OrpheusDL's own cover downloads (cover_url) are answered from the artwork cache
+        self._install_artwork_adapter()
+
         if not _lazy_import_gamdl():
             detail = f": {LAST_GAMDL_ERROR}" if LAST_GAMDL_ERROR else ""
             raise self.exception(f"gamdl components not available - please check installation{detail}")
@@ -449,6 +722,20 @@ class ModuleInterface:
                 )
             print(f"[Apple Music Error] Initial initialization failed: {e}")
 
+    @property
+    def apple_music_api(self):
+        """The leased pool account's client inside a pooled _run_async call, else the primary client."""
+        account = current_account()
+        if account is not None and account.api is not None:
+            return account.api
+        return self._apple_music_api
+
+    @apple_music_api.setter
+    def apple_music_api(self, api):
+        self._apple_music_api = api
+        if self.__dict__.get('_accounts'):
+            self._accounts.accounts[0].api = api
+
     def _refresh_debug_mode(self):
         """Sync gamdl logging with current module/global debug settings."""
         self._debug = bool(
@@ -492,76 +779,423 @@ class ModuleInterface:
             if self._debug: print(f"[Apple Music Debug] Could not read config/settings.json: {e}")
             return {}
 
-    def _start_background_loop(self):
-        """Start or restart the background event loop thread."""
+    def _cache_dir(self, name: str) -> Path:
+        """Persistent per-feature cache directory (survives restarts, unlike temp_path)."""
+        root = Path(self.settings.get('cache_path') or './config/applemusic_cache')
+        return root / name
+
+    def _get_artwork_cache(self) -> Optional[ArtworkCache]:
+        """Shared artwork cache, created on first use (None if disabled or unusable)."""
+        if self._artwork_cache is not None or self._artwork_cache_failed or not self.settings.get('artwork_cache', True):
+            return self._artwork_cache
+        try:
+            self._artwork_cache = ArtworkCache(
+                self._cache_dir('artwork'),
+                max_bytes=int(self.settings.get('artwork_cache_mb', 512)) * 1024 * 1024,
+                source_resolution=max(int(self.settings.get('artwork_source_resolution', 3000)), self._cover_resolution()),
+                debug=self._debug,
+            )
+        except Exception as e:
+            print(f"[Apple Music Warning] Artwork cache disabled: {e}")
+            self._artwork_cache_failed = True
+        return self._artwork_cache
+
+    def _install_artwork_adapter(self) -> None:
+        """Mount the artwork cache on OrpheusDL's shared requests session (used for cover_url)."""
+        if not self.settings.get('artwork_cache', True):
+            return
+        try:
+            from utils import utils as orpheus_utils
+            session = getattr(orpheus_utils, 'r_session', None)
+            if session is None:
+                return
+            adapter = artwork_adapter(self._cached_cover_bytes)
+            for prefix in ARTWORK_URL_PREFIXES:
+                session.mount(prefix, adapter)
+        except Exception as e:
+            if self._debug: print(f"[Apple Music Debug] OrpheusDL cover downloads bypass the artwork cache: {e}")
+
+    def _cached_cover_bytes(self, cover_url: str) -> Optional[bytes]:
+        """Cover bytes for an artwork URL from the cache (None to fetch it uncached)."""
+        split = split_artwork_url(cover_url)
+        cache = self._get_artwork_cache()
+        if not split or cache is None:
+            return None
+        return self._run_async(lambda s: cache.get(*split, fetch=_fetch_artwork_bytes),
+                               lane=self._download_lane, priority=BULK, allow_reinit=False)
+
+    def _get_lyrics_cache(self) -> Optional[LyricsCache]:
+        """Shared persistent lyrics cache, created on first use (None if disabled or unusable)."""
+        if self._lyrics_cache is not None or self._lyrics_cache_failed or not self.settings.get('lyrics_cache', True):
+            return self._lyrics_cache
+        try:
+            self._lyrics_cache = LyricsCache(
+                self._cache_dir('lyrics'),
+                ttl_seconds=float(self.settings.get('lyrics_cache_ttl_hours', 168)) * 3600,
+            )
+        except Exception as e:
+            print(f"[Apple Music Warning] Lyrics cache disabled: {e}")
+            self._lyrics_cache_failed = True
+        return self._lyrics_cache
+
+    def _get_archive(self) -> Optional[DownloadArchive]:
+        """Download archive, created on first use (None unless download_archive is enabled)."""
+        if self._archive is not None or self._archive_failed or not self.settings.get('download_archive', False):
+            return self._archive
+        try:
+            path = self.settings.get('download_archive_path') or self._cache_dir('archive') / 'downloads.sqlite3'
+            self._archive = DownloadArchive(path)
+        except Exception as e:
+            print(f"[Apple Music Warning] Download archive disabled: {e}")
+            self._archive_failed = True
+        return self._archive
+
+    def _archive_key(self, quality_tier: QualityEnum = None, song_codec: str = None):
+        """(codec, quality tier) a download is archived under, from the requested tier/codec."""
+        if quality_tier:
+            codec = self._quality_to_codec(quality_tier)
+        elif song_codec:
+            codec = self._get_gamdl_codec(song_codec)
+        else:
+            codec = self._get_gamdl_codec(self.settings.get('codec', 'aac'))
+        return codec.value, getattr(quality_tier, 'name', None) or ''
+
+    def check_archive(self, track_id: str, quality_tier: QualityEnum = None, isrc: str = None,
+                      song_codec: str = None) -> Optional[ArchiveEntry]:
+        """Pre-flight: the archive entry if this track was already downloaded at this codec/quality."""
+        archive = self._get_archive()
+        if archive is None or not track_id:
+            return None
+        codec, quality = self._archive_key(quality_tier, song_codec)
+        return archive.lookup(str(track_id), codec, quality, isrc=isrc)
+
+    def import_library(self, root) -> int:
+        """Bulk-import an existing library folder into the download archive (by file tags)."""
+        archive = self._get_archive()
+        if archive is None:
+            raise self.exception("Enable download_archive to import a library")
+        return archive.import_tree(root)
+
+    def _get_library_snapshot(self) -> LibrarySnapshot:
+        if self._library_snapshot is None:
+            path = self.settings.get('library_snapshot_path') or self._cache_dir('library') / 'snapshot.sqlite3'
+            self._library_snapshot = LibrarySnapshot(path)
+        return self._library_snapshot
+
+    async def _library_page(self, kind: str, offset: int) -> dict:
+        """One page of the account's library (with catalog relationships)."""
+        fetch = {
+            'songs': self.apple_music_api.get_library_songs,
+            'albums': self.apple_music_api.get_library_albums,
+            'playlists': self.apple_music_api.get_library_playlists,
+        }[kind]
+        return await fetch(limit=LIBRARY_PAGE_SIZE, offset=offset) or {}
+
+    def library_delta(self, kinds=('songs',)) -> Dict[str, LibraryDelta]:
+        """Walk the account's library and diff it against the local snapshot (see library.py).
+
+        Raises if any page fails, so that a partial listing never drops items from the snapshot.
+        """
+        self._ensure_credentials()
+        snapshot = self._get_library_snapshot()
+        deltas = {}
+        for kind in kinds:
+            if kind not in LIBRARY_KINDS:
+                raise self.exception(f"Unknown library kind: {kind}")
+            first = self._run_async(lambda s: s._library_page(kind, 0), priority=BULK)
+            pages = [first]
+            total = (first.get('meta') or {}).get('total')
+            if total:
+                # Offsets are known up front: fetch the remaining pages side by side
+                offsets = list(range(LIBRARY_PAGE_SIZE, int(total), LIBRARY_PAGE_SIZE))
+                pages += self._fan_out(
+                    lambda offset: self._run_async(lambda s: s._library_page(kind, offset), priority=BULK), offsets)
+            else:
+                next_uri = first.get('next')
+                while next_uri:
+                    page = self._run_async(lambda s: s._fetch_tracks_page(next_uri), priority=BULK)
+                    pages.append(page)
+                    next_uri = page.get('next')
+            items = {str(item['id']): catalog_id_of(item) for page in pages
+                     for item in page.get('data') or [] if item.get('id')}
+            deltas[kind] = snapshot.diff(kind, items)
+            if self._debug: print(f"[Apple Music Debug] Library {kind}: {len(items)} items, {len(deltas[kind].added)} new")
+        return deltas
+
+    def mark_library_synced(self, kind: str, library_ids) -> None:
+        """Record library items as mirrored, so library_delta() stops listing them as pending."""
+        self._get_library_snapshot().mark_synced(kind, library_ids)
+
+    def cancel_download(self, track_id: str) -> bool:
+        """Cancel the running download of a track; its get_track_download raises DownloadCancelled."""
+        return self._cancellations.cancel_track(track_id) > 0
+
+    def cancel_job(self, job_id: str) -> int:
+        """Cancel a job's downloads ('album:<id>', 'playlist:<id>', 'artist:<id>' or the job_id passed
+        in): the running ones now, queued ones as they start. Returns how many were running."""
+        return self._cancellations.cancel_job(job_id)
+
+    def resume_job(self, job_id: str) -> None:
+        """Allow downloads of a cancelled job again."""
+        self._cancellations.resume_job(job_id)
+
+    def _listing_job(self, kwargs: dict, default: str) -> str:
+        """Job ID for the tracks of a listing: the caller's job_id, else default.
+
+        A listing that starts its own job is a new run of it, so a cancel_job()
+        of an earlier run (the album queued again after a cancel) no longer applies.
+        """
+        if kwargs.get('job_id'):
+            return kwargs['job_id']
+        self._cancellations.resume_job(default)
+        return default
+
+    def get_stats(self) -> dict:
+        """In-process performance stats: per-stage timings (p50/p95), counters, per-call
+        latency of the background loop, recent slow calls and cache usage."""
+        stats = self._telemetry.summary()
+        stats['calls'] = self._telemetry.call_summary()
+        stats['slow_calls'] = self._telemetry.slow_calls()
+        caches = {}
+        for name, cache in (('artwork', self._artwork_cache), ('lyrics', self._lyrics_cache),
+                            ('segments', getattr(self, '_segment_cache', None)), ('archive', self._archive)):
+            if cache is not None:
+                caches[name] = cache.stats()
+        stats['caches'] = caches
+        stats['track_rows'] = self._track_rows.stats()
+        stats['lanes'] = {name: lane.stats() for name, lane in self._lanes.items()}
+        stats['scheduler'] = self._scheduler.stats()
+        stats['concurrency'] = self._concurrency.stats()
+        stats['cancellation'] = self._cancellations.stats()
+        if self._accounts:
+            stats['accounts'] = self._accounts.stats()
+        if self._wrapper_pool:
+            stats['wrappers'] = self._wrapper_pool.stats()
+        if self._postprocess is not None:
+            stats['postprocess'] = self._postprocess.stats()
+        if getattr(self, '_temp_space', None) is not None:
+            stats['temp_space'] = self._temp_space.stats()
+        if self._library_snapshot is not None:
+            stats['library'] = self._library_snapshot.stats()
+        if self._traffic_hook is not None:
+            stats['http_fixtures'] = self._traffic_hook.stats()
+        return stats
+
+    def _install_traffic_hook(self) -> Optional[TrafficHook]:
+        """Record Apple traffic to http_record_path, or replay it from http_replay_path."""
+        replay_path = self.settings.get('http_replay_path')
+        record_path = self.settings.get('http_record_path')
+        if not replay_path and not record_path:
+            return None
+        try:
+            hook = TrafficHook(
+                FixtureStore(replay_path or record_path),
+                'replay' if replay_path else 'record',
+                latency=float(self.settings.get('http_replay_latency_ms', 0)) / 1000,
+                rate_limit_ratio=float(self.settings.get('http_replay_429_ratio', 0)),
+            ).install()
+        except Exception as e:
+            print(f"[Apple Music Warning] HTTP record/replay disabled: {e}")
+            return None
+        print(f"[Apple Music] HTTP {hook.mode} mode: {hook.store.path}")
+        return hook
+
+    def _get_postprocess_pool(self) -> Optional[PostProcessPool]:
+        """Bounded pool for decrypt/remux and tagging (None if postprocess_workers is 0)."""
+        if self._postprocess is None:
+            workers = self.settings.get('postprocess_workers')
+            if workers is not None and int(workers) <= 0:
+                return None
+            self._postprocess = PostProcessPool(
+                workers=int(workers) if workers else None,
+                mode=str(self.settings.get('postprocess_mode', 'thread')).lower(),
+                telemetry=self._telemetry,
+            )
+        return self._postprocess
+
+    def _get_segment_cache(self, temp_root: Path) -> Optional[SegmentCache]:
+        """HLS segment cache under temp_path/gamdl_temp, so failed downloads resume (None if disabled).
+
+        Only the native download mode uses it; the other modes keep gamdl's own downloader.
+        """
+        if not self._native_download_mode() or not self.settings.get('segment_cache', True):
+            return None
+        root = temp_root / "gamdl_temp" / "segment_cache"
+        cache = getattr(self, '_segment_cache', None)
+        if cache is None or cache.root != root:
+            try:
+                cache = self._segment_cache = SegmentCache(root)
+            except OSError as e:
+                print(f"[Apple Music Warning] Segment cache disabled: {e}")
+                return None
+        return cache
+
+    def _output_root(self, temp_root: Path) -> Path:
+        """Parent of gamdl_out: delivery_hint_path (on the library's filesystem, so delivery is a rename) or temp_path."""
+        hint = self.settings.get('delivery_hint_path')
+        return Path(hint) if hint else temp_root
+
+    def _decrypt_temp_path(self) -> Optional[str]:
+        """RAM-backed folder for download intermediates: decrypt_temp_path, or /dev/shm with streaming_decrypt."""
+        path = self.settings.get('decrypt_temp_path')
+        if path or not self.settings.get('streaming_decrypt', False):
+            return path or None
+        if os.path.isdir('/dev/shm'):
+            return '/dev/shm'
+        print("[Apple Music Warning] streaming_decrypt needs a RAM-backed folder; set decrypt_temp_path. "
+              "Downloads keep their intermediates on disk.")
+        return None
+
+    def _get_temp_space(self, temp_root: Path) -> TempSpace:
+        """Temp-space manager for temp_path; orphans of earlier runs are swept in the background."""
+        space = getattr(self, '_temp_space', None)
+        if space is None or space.temp_dir != temp_root / "gamdl_temp":
+            space = self._temp_space = TempSpace(
+                temp_root,
+                out_dir=self._output_root(temp_root) / "gamdl_out",
+                quota_bytes=int(self.settings.get('temp_quota_mb', 0)) * 1024 * 1024,
+                decrypt_root=self._decrypt_temp_path(),
+            )
+            threading.Thread(target=space.sweep, daemon=True, name='AppleMusicTempSweep').start()
+        return space
+
+    def _start_background_loop(self, lane: str = INTERACTIVE):
+        """Start or restart a lane's background event loop thread."""
+        loop_lane = self._lanes[lane]
         with self._lock:
-            if self.loop_thread and self.loop_thread.is_alive() and self.loop and not self.loop.is_closed():
-                if self._debug: print(f"[Apple Music Debug] Background loop already healthy (Loop ID: {id(self.loop)})")
+            if loop_lane.healthy():
+                if self._debug: print(f"[Apple Music Debug] {loop_lane.thread_name} already healthy (Loop ID: {id(loop_lane.loop)})")
                 return
 
-            # Clear gamdl caches + null out interfaces/downloader/API clients to force
-            # re-initialization in the new loop ("different event loop" protection)
-            self._clear_gamdl_caches()
-            self.apple_music_api = None
-            self.itunes_api = None
-            self.wrapper_api = None
+            # Null out the lane's API clients (and gamdl's interfaces/downloader and
+            # caches, on the download lane) to force re-initialization in the new loop
+            # ("different event loop" protection)
+            with in_lane(lane):
+                if lane == self._download_lane:
+                    self._clear_gamdl_caches()
+                self.apple_music_api = None
+                self.itunes_api = None
+                self.wrapper_api = None
+                if self._accounts:
+                    self._accounts.drop_clients()
+                if self._wrapper_pool:
+                    self._wrapper_pool.drop_clients()
 
             self._wrapper_offline = False
 
-            if self._debug: print(f"[Apple Music Debug] Starting background event loop thread...")
+            if loop_lane.starts and getattr(self, '_telemetry', None) is not None:
+                self._telemetry.count('loop_restarts')
+
+            if self._debug: print(f"[Apple Music Debug] Starting {loop_lane.thread_name} thread...")
 
-            self._loop_ready.clear()
-            self.loop_thread = threading.Thread(target=self._run_loop, daemon=True, name="AppleMusicLoop")
-            self.loop_thread.start()
             # Wait up to 5 seconds for the loop to start
-            if not self._loop_ready.wait(5):
-                 print("[Apple Music Error] Background loop failed to start within 5 seconds.")
+            if not loop_lane.start(5):
+                 print(f"[Apple Music Error] {loop_lane.thread_name} failed to start within 5 seconds.")
             elif self._debug:
-                 print(f"[Apple Music Debug] Background loop started successfully (Loop ID: {id(self.loop)})")
-
-    def _run_loop(self):
-        """Internal loop runner for the background thread."""
-        try:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            if self._debug: print(f"[Apple Music Debug] Background loop created and set. Loop id: {id(self.loop)}")
-            self._loop_ready.set()
-            self.loop.run_forever()
-        except Exception as e:
-            print(f"[Apple Music Error] Background loop thread crashed: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            if self._debug: print("[Apple Music Debug] Background loop thread exiting...")
-            self._loop_ready.clear()
+                 print(f"[Apple Music Debug] {loop_lane.thread_name} started successfully (Loop ID: {id(loop_lane.loop)})")
 
     def _run_async(self, func, *args, **kwargs):
-        """Run an async function or lambda in the internal event loop thread and return the result."""
+        """Run an async function or lambda in a lane's event loop thread and return the result.
+
+        lane is INTERACTIVE (default) or BULK; bulk work runs on its own loop so it
+        can't hold up interactive calls. priority is the scheduler class
+        ('interactive', 'bulk' or 'background'; defaults to the lane's name), or
+        'download' for a whole download, which the scheduler doesn't admit.
+        timeout is the call's budget in seconds (defaults to the *_timeout setting
+        of its class), covering admission, every attempt and backoff; past it the
+        coroutine is cancelled and DeadlineExceeded raised.
+        """
         allow_reinit = kwargs.pop('allow_reinit', True)
+        lane = kwargs.pop('lane', INTERACTIVE)
+        priority = kwargs.pop('priority', None) or lane
+        timeout = kwargs.pop('timeout', None)
 
-        # Already inside the background loop thread: future.result() would block the
+        # Already inside a background loop thread: future.result() would block the
         # loop, so run the function directly instead of scheduling it.
-        if threading.current_thread() == self.loop_thread:
-            if asyncio.iscoroutinefunction(func):
-                if self._debug: print("[Apple Music Warning] Nested async _run_async call detected! Attempting to run in current loop...")
-                return asyncio.run_coroutine_threadsafe(func(*args, **kwargs), self.loop).result()
-            return func(self, *args, **kwargs)
+        for current in self._lanes.values():
+            if current.owns_current_thread():
+                if asyncio.iscoroutinefunction(func):
+                    if self._debug: print("[Apple Music Warning] Nested async _run_async call detected! Attempting to run in current loop...")
+                    return asyncio.run_coroutine_threadsafe(func(*args, **kwargs), current.loop).result()
+                return func(self, *args, **kwargs)
 
         target_sf = kwargs.pop('storefront', None)
 
+        # One deadline for the whole call: admission, every attempt and backoff
+        budget = float(timeout if timeout is not None else self._timeouts.get(priority, self._timeouts['interactive']))
+        deadline = time.monotonic() + budget
+
+        # A thread that already holds a slot (a call made while another one is being
+        # set up) runs without taking a second one; whole downloads take none
+        if priority == DOWNLOAD or getattr(self._scheduler_local, 'holding', False):
+            return self._run_async_attempts(func, args, kwargs, lane, allow_reinit, target_sf, deadline, budget)
+        try:
+            waited = self._scheduler.acquire(priority, timeout=deadline - time.monotonic())
+        except TimeoutError:
+            self._telemetry.count('deadline_exceeded')
+            raise DeadlineExceeded(f"Apple Music: {call_name(func)} was not admitted within its {budget:.0f}s deadline") from None
+        try:
+            if waited >= 0.001:
+                self._telemetry.count('scheduler_wait_ms', int(waited * 1000))
+            self._scheduler_local.holding = True
+            return self._run_async_attempts(func, args, kwargs, lane, allow_reinit, target_sf, deadline, budget)
+        finally:
+            self._scheduler_local.holding = False
+            self._scheduler.release(priority)
+
+    def _run_async_attempts(self, func, args, kwargs, lane, allow_reinit, target_sf, deadline, budget):
+        """_run_async's scheduling and retry loop (loop restarts, 429 backoff, cookie conflicts)."""
+        loop_lane = self._lanes[lane]
+        name = call_name(func)
+
+        def expired():
+            self._telemetry.count('deadline_exceeded')
+            return DeadlineExceeded(f"Apple Music: {name} exceeded its {budget:.0f}s deadline")
+
+        def observe(scheduled, timing, ok, attempt):
+            # Queue wait: scheduled until the loop actually started wrapper()
+            finished = time.perf_counter()
+            started = timing.get('started', finished)
+            self._telemetry.observe_call(name, started - scheduled, finished - started, ok=ok, attempt=attempt,
+                                         arguments=lambda: call_arguments(func, args))
+
         for attempt in range(4): # Increased to 4 attempts to allow for 3 retries with backoff
+            if time.monotonic() >= deadline:
+                raise expired()
+
             # 1. Ensure thread is alive and loop is valid
-            if not self.loop_thread or not self.loop_thread.is_alive() or not self.loop or self.loop.is_closed():
+            if not loop_lane.healthy():
                 if self._debug and attempt > 0:
                     print(f"[Apple Music Debug] Retrying _run_async (attempt {attempt+1}) due to loop closure/failure...")
-                self._start_background_loop()
+                self._start_background_loop(lane)
+
+            timing = {}
 
             async def wrapper():
+                timing['started'] = time.perf_counter()
+                # Visible to everything the call runs (http_timeout(), nested calls, to_thread workers)
+                set_deadline(deadline)
                 # If APIs are missing, initialize them first (self-healing)
                 if allow_reinit and not getattr(self, 'apple_music_api', None):
                     if self._debug: print("[Apple Music Debug] Re-establishing API clients for operation...")
                     await self._setup_api_clients()
 
+                # Lease a pooled account for the whole call (apple_music_api resolves to it)
+                account = self._accounts.acquire() if self._accounts else None
+                lease = self._accounts.lease(account) if account else None
+                result = None
+                try:
+                    # Cancel the call (and whatever it awaits) when the deadline passes
+                    result = await asyncio.wait_for(run(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    result = expired()
+                finally:
+                    if account:
+                        self._accounts.release(account, result if isinstance(result, Exception) else None)
+                        self._accounts.reset(lease)
+                return result
+
+            async def run():
                 am_api = getattr(self, 'apple_music_api', None)
                 it_api = getattr(self, 'itunes_api', None)
 
@@ -588,11 +1222,25 @@ class ModuleInterface:
 
             try:
                 # 2. Schedule and wait
-                if self._debug: print(f"[Apple Music Debug] Scheduling coroutine on loop {id(self.loop)} (Thread: {self.loop_thread.name if self.loop_thread else 'None'})")
-
-                future = asyncio.run_coroutine_threadsafe(wrapper(), self.loop)
-                if self._debug: print(f"[Apple Music Debug] Scheduled coroutine. Waiting for result (Timeout: 1200s)...")
-                result = future.result(timeout=1200)
+                if self._debug: print(f"[Apple Music Debug] Scheduling coroutine on loop {id(loop_lane.loop)} (Thread: {loop_lane.thread_name})")
+
+                if self.rate_budget is not None:
+                    self._wait_for_rate_budget()
+                scheduled = time.perf_counter()
+                future = asyncio.run_coroutine_threadsafe(wrapper(), loop_lane.loop)
+                left = max(0.0, deadline - time.monotonic())
+                if self._debug: print(f"[Apple Music Debug] Scheduled coroutine. Waiting for result (Timeout: {left:.0f}s)...")
+                try:
+                    # The loop cancels the call at the deadline; give up here only if the loop doesn't get to it
+                    result = future.result(timeout=left + GRACE_SECONDS)
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    observe(scheduled, timing, False, attempt)
+                    raise expired() from None
+                except BaseException:
+                    observe(scheduled, timing, False, attempt)
+                    raise
+                observe(scheduled, timing, not isinstance(result, Exception), attempt)
                 if self._debug: print(f"[Apple Music Debug] Coroutine finished with result type: {type(result).__name__}")
 
                 # 3. Handle propagated exceptions
@@ -603,10 +1251,21 @@ class ModuleInterface:
                         or 'TooManyRequests' in type(result).__name__
                     )
 
+                    if is_rate_limit:
+                        self._concurrency.on_rate_limited()
                     if is_rate_limit and attempt < 3:
                         backoff_times = [2, 5, 10]
-                        wait_time = backoff_times[attempt]
+                        # The throttled account is quarantined now; retry at once on another
+                        wait_time = 0 if self._accounts and self._accounts.available() else backoff_times[attempt]
+                        if wait_time and time.monotonic() + wait_time >= deadline:
+                            # The retry would start after the deadline: fail now with the 429
+                            raise result
                         if self._debug: print(f"[Apple Music Warning] Rate limit (429) detected. Retrying in {wait_time}s... (Attempt {attempt+1}/4)")
+                        self._telemetry.count('rate_limit_retries')
+                        self._telemetry.count('call_retries')
+                        if self.rate_budget is not None:
+                            self._wait_for_rate_budget(penalize=True)
+                        self._telemetry.count('backoff_seconds', wait_time)
                         time.sleep(wait_time)
                         continue
 
@@ -626,16 +1285,20 @@ class ModuleInterface:
                                 if self._debug: print(f"[Apple Music Debug] Cleared {len(cookies_to_remove)} conflicting '{cookie_name}' cookies.")
                         except Exception as ce:
                             if self._debug: print(f"[Apple Music Error] Failed to clear conflicting cookies: {ce}")
+                        self._telemetry.count('call_retries')
                         continue
 
                     if "closed" in result_str.lower() and isinstance(result, RuntimeError):
                         if self._debug: print(f"[Apple Music Warning] background thread returned closed loop error: {result}")
-                        self.loop = None
-                        self.loop_thread = None
+                        loop_lane.loop = None
+                        loop_lane.thread = None
+                        self._telemetry.count('call_retries')
                         continue
                     raise result
                 return result
 
+            except DeadlineExceeded:
+                raise
             except (RuntimeError, TimeoutError, concurrent.futures.TimeoutError, AttributeError) as e:
                 # If it's an AttributeError involving 'send', it's likely a dead transport on a closed loop
                 is_dead_transport = isinstance(e, AttributeError) and ('send' in str(e) or 'recv' in str(e))
@@ -644,19 +1307,33 @@ class ModuleInterface:
 
                 if isinstance(e, RuntimeError) or is_dead_transport:
                     # Force restart loop and APIs on next attempt
-                    with self._lock:
-                        if self.loop:
-                            try: self.loop.stop()
-                            except: pass
-                        self.loop = None
-                        if hasattr(self, 'apple_music_api'): self.apple_music_api = None
+                    with self._lock, in_lane(lane):
+                        loop_lane.stop()
+                        self.apple_music_api = None
 
                 if attempt == 3: # Last attempt (4 total)
                     raise e
+                self._telemetry.count('call_retries')
                 continue
 
         raise RuntimeError("Apple Music: Failed to execute async operation after 4 attempts (including rate limit retries).")
 
+    def _wait_for_rate_budget(self, penalize: bool = False) -> None:
+        """Take one call from the farm's shared budget, or with penalize report a 429 to it."""
+        try:
+            if penalize:
+                self.rate_budget.penalize()
+                return
+            wait = self.rate_budget.reserve()
+        except Exception as e:
+            # Supervisor gone: keep working without the shared budget
+            print(f"[Apple Music Warning] Shared rate budget unavailable, continuing without it: {e}")
+            self.rate_budget = None
+            return
+        if wait > 0:
+            self._telemetry.count('budget_wait_ms', int(wait * 1000))
+            time.sleep(wait)
+
     def _clear_gamdl_caches(self):
         """Clear alru_cache in gamdl interfaces to prevent loop-mismatch errors"""
         interfaces = [getattr(self, name, None) for name in
@@ -723,8 +1400,94 @@ class ModuleInterface:
         # LOW, MEDIUM, HIGH and MINIMUM all map to standard AAC 256
         return GamdlSongCodec.AAC_WEB
 
+    def _native_download_mode(self) -> bool:
+        """True when download_mode selects the module's own parallel HLS segment downloader."""
+        mode = self.settings.get('download_mode')
+        return str(getattr(mode, 'value', mode) or '').lower() == NATIVE_DOWNLOAD_MODE
+
+    def _gamdl_download_mode(self):
+        """download_mode setting as a gamdl DownloadMode (accepts enum or string values).
+
+        The 'native' mode keeps yt-dlp as gamdl's mode for the non-HLS streams the
+        native downloader doesn't handle.
+        """
+        mode = self.settings.get('download_mode', GamdlDownloadMode.YTDLP)
+        if isinstance(mode, GamdlDownloadMode):
+            return mode
+        try:
+            return GamdlDownloadMode(str(mode).lower())
+        except ValueError:
+            return GamdlDownloadMode.YTDLP
+
     def _get_wrapper_url(self) -> str:
-        return normalize_wrapper_url(self.settings.get('wrapper_decrypt_ip'))
+        """The (first) configured wrapper-v2 base URL."""
+        urls = parse_wrapper_urls(self.settings.get('wrapper_decrypt_ip'))
+        return normalize_wrapper_url(urls[0] if urls else None)
+
+    def _get_wrapper_pool(self) -> Optional[WrapperPool]:
+        """Endpoint pool when wrapper_decrypt_ip lists more than one wrapper, else None."""
+        urls = tuple(dict.fromkeys(normalize_wrapper_url(url) for url in parse_wrapper_urls(self.settings.get('wrapper_decrypt_ip'))))
+        if len(urls) < 2:
+            self._wrapper_pool = None
+            return None
+        if self._wrapper_pool is None or self._wrapper_pool.urls != urls:
+            port = self._get_wrapper_decrypt_port()
+            endpoints = [WrapperEndpoint(url, decrypt_port=port) for url in urls]
+            # An explicit wrapper_decrypt_host only describes the first wrapper
+            endpoints[0].decrypt_host = self._get_wrapper_decrypt_host()
+            self._wrapper_pool = WrapperPool(endpoints)
+        return self._wrapper_pool
+
+    async def _connect_wrapper_endpoint(self, endpoint: WrapperEndpoint):
+        kwargs = self._wrapper_create_kwargs()
+        if 'decrypt_host' in kwargs:
+            kwargs['decrypt_host'] = endpoint.decrypt_host
+        if 'decrypt_port' in kwargs:
+            kwargs['decrypt_port'] = endpoint.decrypt_port
+        return await WrapperApi.create(base_url=endpoint.url, **kwargs)
+
+    async def _download_on_wrapper_pool(self, pool: WrapperPool, download):
+        """Run one track's download on a leased wrapper endpoint, moving it to another one if it drops."""
+        while True:
+            endpoint = await pool.acquire(self._connect_wrapper_endpoint)
+            if endpoint is None:
+                # Every endpoint is down: use the first wrapper with the usual wait/restart handling
+                return await download()
+            token = pool.lease(endpoint)
+            error = None
+            try:
+                return await download()
+            except Exception as e:
+                error = e if self._is_wrapper_connection_error(e) else None
+                if error is not None and pool.available() > 1:
+                    print(f"[Apple Music] Wrapper {endpoint.url} dropped, moving the track to another wrapper...")
+                    self._telemetry.count('wrapper_failovers')
+                    continue
+                raise
+            finally:
+                # The download may have failed over to another endpoint itself
+                active = current_endpoint()
+                pool.reset(token)
+                pool.release(active, error)
+
+    async def _fail_over_wrapper(self, error: Exception) -> bool:
+        """Move the running download to another wrapper endpoint; False if there is none."""
+        pool, endpoint = self._wrapper_pool, current_endpoint()
+        if pool is None or endpoint is None or pool.available() <= 1:
+            return False
+        pool.release(endpoint, error)
+        replacement = await pool.acquire(self._connect_wrapper_endpoint)
+        pool.lease(replacement)
+        if replacement is None:
+            return False
+        print(f"[Apple Music] Wrapper {endpoint.url} dropped, continuing on {replacement.url}...")
+        self._telemetry.count('wrapper_failovers')
+        return True
+
+    @staticmethod
+    def _is_wrapper_connection_error(error: BaseException) -> bool:
+        return isinstance(error, ConnectionRefusedError) or any(
+            marker in str(error).lower() for marker in _WRAPPER_CONN_ERROR_MARKERS)
 
     def _get_wrapper_decrypt_host(self) -> str:
         """TCP host for WV2D batch decryption (wrapper-v2), derived from the wrapper URL.
@@ -887,14 +1650,24 @@ class ModuleInterface:
                 orpheus_temp_path = Path(self.settings.get("temp_path", tempfile.gettempdir()))
                 wrapper_api = self.wrapper_api if requested_wrapper else None
                 if requested_wrapper and wrapper_api is None:
-                    wrapper_api = await WrapperApi.create(base_url=self._get_wrapper_url(), **self._wrapper_create_kwargs())
+                    try:
+                        wrapper_api = await WrapperApi.create(base_url=self._get_wrapper_url(), **self._wrapper_create_kwargs())
+                    except Exception:
+                        # The first wrapper is down: any other configured one will do
+                        pool = self._get_wrapper_pool()
+                        endpoint = await pool.acquire(self._connect_wrapper_endpoint) if pool else None
+                        if endpoint is None:
+                            raise
+                        wrapper_api = endpoint.api
+                        pool.release(endpoint)
                     self.wrapper_api = wrapper_api
 
-                self.gamdl_base_interface = await AppleMusicBaseInterface.create(
+                self.gamdl_base_interface = await OrpheusAppleMusicBaseInterface.create(
                     apple_music_api=self.apple_music_api,
                     itunes_api=self.itunes_api,
                     wrapper_api=wrapper_api,
                 )
+                self.gamdl_base_interface.artwork_cache = self._get_artwork_cache()
 
                 self.gamdl_song_interface = OrpheusAppleMusicSongInterface(
                     base=self.gamdl_base_interface,
@@ -902,6 +1675,9 @@ class ModuleInterface:
                     debug=self._debug,
                     codec_priority=[requested_codec],
                     synced_lyrics_format=SyncedLyricsFormat.LRC,
+                    # The download's song metadata comes from the storefront the API is set to
+                    lyrics_provider=lambda song_metadata: self._get_lyrics_async(
+                        song_metadata, getattr(self.apple_music_api, 'storefront', None)),
                 )
 
                 self.gamdl_interface = AppleMusicInterface(
@@ -916,18 +1692,27 @@ class ModuleInterface:
                 gamdl_exclude_tags = [] if lyrics_settings.get('embed_lyrics', True) else ['lyrics']
                 self._gamdl_lyrics_settings = lyrics_settings
 
-                self.gamdl_base_downloader = AppleMusicBaseDownloader(
+                self.gamdl_base_downloader = OrpheusAppleMusicBaseDownloader(
                     interface=self.gamdl_interface,
-                    output_path=str(orpheus_temp_path / "gamdl_out"),
+                    output_path=str(self._output_root(orpheus_temp_path) / "gamdl_out"),
                     temp_path=str(orpheus_temp_path / "gamdl_temp"),
                     ffmpeg_path=self.binary_paths.get('ffmpeg', 'ffmpeg'),
                     nm3u8dlre_path=self.binary_paths.get('nm3u8dlre', 'N_m3u8DL-RE'),
-                    download_mode=self.settings.get('download_mode', GamdlDownloadMode.YTDLP),
+                    download_mode=self._gamdl_download_mode(),
                     exclude_tags=gamdl_exclude_tags or None,
                     silent=not self._debug,
                 )
-
-                self.gamdl_song_downloader = AppleMusicSongDownloader(base=self.gamdl_base_downloader)
+                self.gamdl_base_downloader.segment_cache = self._get_segment_cache(orpheus_temp_path)
+                self.gamdl_base_downloader.temp_space = self._get_temp_space(orpheus_temp_path)
+                self.gamdl_base_downloader.streaming = bool(self.settings.get('streaming_decrypt', False))
+                self.gamdl_base_downloader.telemetry = self._telemetry
+                self.gamdl_base_downloader.native = self._native_download_mode()
+                self.gamdl_base_downloader.playlists = {}
+                if self.gamdl_base_downloader.native:
+                    self.gamdl_base_downloader.connections = max(1, int(self.settings.get('download_connections', 8)))
+                self.gamdl_base_downloader.postprocess = self._get_postprocess_pool()
+
+                self.gamdl_song_downloader = OrpheusAppleMusicSongDownloader(base=self.gamdl_base_downloader)
                 self.gamdl_downloader = AppleMusicDownloader(
                     song=self.gamdl_song_downloader,
                     music_video=AppleMusicMusicVideoDownloader(base=self.gamdl_base_downloader),
@@ -1126,9 +1911,8 @@ class ModuleInterface:
             if query_type == DownloadTypeEnum.playlist:
                 missing = [t for t in search_results if not t.additional or not t.duration]
                 if missing:
-                    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                        pcounts = {pid: {'tc': tc, 'dur': dur} for pid, tc, dur
-                                   in executor.map(self._fetch_am_playlist_meta, [t.result_id for t in missing])}
+                    pcounts = {pid: {'tc': tc, 'dur': dur} for pid, tc, dur
+                               in self._fan_out(self._fetch_am_playlist_meta, [t.result_id for t in missing])}
                     for t in missing:
                         meta = pcounts.get(t.result_id, {})
                         if not t.additional and meta.get('tc'):
@@ -1138,9 +1922,8 @@ class ModuleInterface:
             elif query_type == DownloadTypeEnum.album:
                 missing = [t for t in search_results if not t.duration]
                 if missing:
-                    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                        acounts = {aid: dur for aid, dur
-                                   in executor.map(self._fetch_am_album_duration, [t.result_id for t in missing]) if dur}
+                    acounts = {aid: dur for aid, dur
+                               in self._fan_out(self._fetch_am_album_duration, [t.result_id for t in missing]) if dur}
                     for t in missing:
                         if t.result_id in acounts:
                             t.duration = acounts[t.result_id]
@@ -1150,6 +1933,13 @@ class ModuleInterface:
         except Exception as e:
             raise self.exception(f"Search failed: {e}")
 
+    def _fan_out(self, func, items: list) -> list:
+        """[func(item) for item in items] on threads, as wide as the adaptive concurrency limit allows."""
+        if not items:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(len(items), self._concurrency.limit))) as executor:
+            return list(executor.map(func, items))
+
     def _extract_year(self, release_date):
         """Extract year from release date string"""
         if not release_date:
@@ -1247,6 +2037,7 @@ class ModuleInterface:
                             self.apple_music_api = await AppleMusicApi.create(language=language)
 
                 if self.apple_music_api:
+                    self._observe_api_latency(self.apple_music_api)
                     self.itunes_api = await ItunesApi.create(
                         storefront=self.apple_music_api.storefront,
                         language=language,
@@ -1254,6 +2045,8 @@ class ModuleInterface:
                     self.account_storefront = self.apple_music_api.storefront
                     self.is_authenticated = self.apple_music_api.active_subscription
 
+                await self._setup_pool_clients(language)
+
                 self._resolve_all_binary_paths()
                 self.song_codec = self._get_gamdl_codec(self.settings.get('codec', 'aac'))
 
@@ -1263,6 +2056,57 @@ class ModuleInterface:
                 traceback.print_exc()
                 raise
 
+    def _observe_api_latency(self, api) -> None:
+        """Feed the adaptive limit the latency of each request of an AppleMusicApi client.
+
+        Per HTTP request rather than per _run_async call: paginated listings,
+        multi-query searches and retried calls would otherwise look like spikes.
+        """
+        client = getattr(api, 'client', None)
+        hooks = getattr(client, 'event_hooks', None)
+        if hooks is None or getattr(client, '_applemusic_latency_hooked', False):
+            return
+
+        async def on_request(request):
+            request.extensions['applemusic_sent'] = time.perf_counter()
+
+        async def on_response(response):
+            sent = response.request.extensions.get('applemusic_sent')
+            # 429s are handled (and cut the limit) where the call fails
+            if sent is not None and response.status_code < 500 and response.status_code != 429:
+                self._concurrency.on_success(time.perf_counter() - sent)
+
+        client.event_hooks = {'request': [*hooks.get('request', []), on_request],
+                              'response': [*hooks.get('response', []), on_response]}
+        client._applemusic_latency_hooked = True
+
+    async def _setup_pool_clients(self, language: str) -> None:
+        """Create API clients for the extra accounts of account_pool that don't have one yet."""
+        if not self._accounts or not self._apple_music_api:
+            return
+        for account in self._accounts.accounts[1:]:
+            if account.api is not None:
+                continue
+            try:
+                if account.is_cookies:
+                    api = await AppleMusicApi.create_from_netscape_cookies(cookies_path=account.source, language=language)
+                else:
+                    api = await AppleMusicApi.create(media_user_token=account.source, language=language)
+            except Exception as e:
+                account.last_error = f"{type(e).__name__}: {e}"[:200]
+                print(f"[Apple Music Warning] Pool account '{account.name}' could not sign in: {e}")
+                continue
+            if not api.active_subscription:
+                account.last_error = "No active subscription"
+                print(f"[Apple Music Warning] Pool account '{account.name}' has no active subscription; not using it")
+                continue
+            # Catalog calls follow the primary account's storefront unless a call asks for another
+            api.storefront = self._apple_music_api.storefront
+            self._observe_api_latency(api)
+            account.api = api
+        if self._debug:
+            print(f"[Apple Music Debug] Account pool: {self._accounts.available()}/{len(self._accounts.accounts)} accounts ready")
+
     def _get_equivalent_track_id(self, isrc: str, target_storefront: str, title: str = None, artist: str = None) -> Optional[str]:
         """
         Search for a track by ISRC (or Title/Artist) in the target storefront and return its ID.
@@ -1270,70 +2114,84 @@ class ModuleInterface:
         """
         if not target_storefront:
             return None
-
-        if self._debug: print(f"[Apple Music Debug] Searching for equivalent track in storefront '{target_storefront}'...")
-
-        current_storefront = self.apple_music_api.storefront
-        # Set storefront BEFORE _run_async so it's captured by the preservation logic
-        self.apple_music_api.storefront = target_storefront
-
         try:
-            # 1. Search by ISRC if available
-            if isrc:
-                if self._debug: print(f"[Apple Music Debug] Trying ISRC search: {isrc}")
-                results = self._run_async(lambda s: s.apple_music_api.get_search_results(term=isrc, types="songs", limit=5), storefront=target_storefront)
-
-                if results and 'results' in results and 'songs' in results['results']:
-                    songs = results['results']['songs'].get('data', [])
-                    for song in songs:
-                        song_isrc = song.get('attributes', {}).get('isrc')
-                        if song_isrc and song_isrc.lower() == isrc.lower():
-                            new_id = song.get('id')
-                            if self._debug: print(f"[Apple Music Debug] Found equivalent track ID {new_id} via ISRC {isrc}")
-                            return new_id
-
-            # 2. Fallback to Search by Title and Artist if ISRC failed or wasn't provided
-            if title and artist:
-                if self._debug: print(f"[Apple Music Debug] Trying semantic search: {title} {artist}")
-                results = self._run_async(lambda s: s.apple_music_api.get_search_results(term=f"{title} {artist}", types="songs", limit=10), storefront=target_storefront)
-
-                if results and 'results' in results and 'songs' in results['results']:
-                    songs = results['results']['songs'].get('data', [])
-
-                    def artist_matches(attrs):
-                        return (artist.lower() in attrs.get('artistName', '').lower()
-                                or any(artist.lower() in a.lower() for a in attrs.get('artistNames', [])))
-
-                    # Pass 1: exact title match
-                    for song in songs:
-                        attrs = song.get('attributes', {})
-                        if title.lower() == attrs.get('name', '').lower() and artist_matches(attrs):
-                            new_id = song.get('id')
-                            if self._debug: print(f"[Apple Music Debug] Found equivalent track ID {new_id} via exact semantic search")
-                            return new_id
-
-                    # Pass 2: fuzzy title match — skip remixes/versions of a clean original title
-                    original_clean = "remix" not in title.lower() and "version" not in title.lower()
-                    for song in songs:
-                        attrs = song.get('attributes', {})
-                        result_name = attrs.get('name', '').lower()
-                        if original_clean and ("remix" in result_name or "version" in result_name):
-                            continue
-                        if title.lower() in result_name and artist_matches(attrs):
-                            new_id = song.get('id')
-                            if self._debug: print(f"[Apple Music Debug] Found equivalent track ID {new_id} via fuzzy semantic search")
-                            return new_id
-
-            if self._debug: print(f"[Apple Music Debug] No equivalent track found in {target_storefront}")
-            return None
-
+            return self._run_async(lambda s: s._get_equivalent_track_id_async(isrc, target_storefront, title, artist),
+                                   storefront=target_storefront, priority=BULK)
         except Exception as e:
             if self._debug: print(f"[Apple Music Debug] Error searching for equivalent track: {e}")
             return None
-        finally:
-            self.apple_music_api.storefront = current_storefront
+
+    async def _get_equivalent_track_id_async(self, isrc: str, target_storefront: str, title: str = None,
+                                             artist: str = None) -> Optional[str]:
+        """_get_equivalent_track_id for code already running on a loop (e.g. inside a download); API errors propagate."""
+        if not target_storefront:
+            return None
+
+        if self._debug: print(f"[Apple Music Debug] Searching for equivalent track in storefront '{target_storefront}'...")
+
+        async def search(term: str, limit: int) -> list:
+            if hasattr(self.apple_music_api, 'get_extended_api_data'):
+                # Storefront in the URI rather than the shared client's, which other calls switch
+                uri = f"/v1/catalog/{target_storefront}/search?" + urllib.parse.urlencode(
+                    {'term': term, 'types': 'songs', 'limit': limit})
+                results = await self.apple_music_api.get_extended_api_data(uri, uri)
+            else:
+                # Older gamdl releases: search the client's storefront
+                if self.apple_music_api.storefront != target_storefront:
+                    self.apple_music_api.storefront = target_storefront
+                results = await self.apple_music_api.get_search_results(term, types='songs', limit=limit)
+            return (((results or {}).get('results') or {}).get('songs') or {}).get('data', [])
+
+        # 1. Search by ISRC if available
+        if isrc:
+            if self._debug: print(f"[Apple Music Debug] Trying ISRC search: {isrc}")
+            for song in await search(isrc, 5):
+                song_isrc = song.get('attributes', {}).get('isrc')
+                if song_isrc and song_isrc.lower() == isrc.lower():
+                    new_id = song.get('id')
+                    if self._debug: print(f"[Apple Music Debug] Found equivalent track ID {new_id} via ISRC {isrc}")
+                    return new_id
+
+        # 2. Fallback to Search by Title and Artist if ISRC failed or wasn't provided
+        if title and artist:
+            if self._debug: print(f"[Apple Music Debug] Trying semantic search: {title} {artist}")
+            songs = await search(f"{title} {artist}", 10)
+
+            def artist_matches(attrs):
+                return (artist.lower() in attrs.get('artistName', '').lower()
+                        or any(artist.lower() in a.lower() for a in attrs.get('artistNames', [])))
+
+            # Pass 1: exact title match
+            for song in songs:
+                attrs = song.get('attributes', {})
+                if title.lower() == attrs.get('name', '').lower() and artist_matches(attrs):
+                    new_id = song.get('id')
+                    if self._debug: print(f"[Apple Music Debug] Found equivalent track ID {new_id} via exact semantic search")
+                    return new_id
+
+            # Pass 2: fuzzy title match — skip remixes/versions of a clean original title
+            original_clean = "remix" not in title.lower() and "version" not in title.lower()
+            for song in songs:
+                attrs = song.get('attributes', {})
+                result_name = attrs.get('name', '').lower()
+                if original_clean and ("remix" in result_name or "version" in result_name):
+                    continue
+                if title.lower() in result_name and artist_matches(attrs):
+                    new_id = song.get('id')
+                    if self._debug: print(f"[Apple Music Debug] Found equivalent track ID {new_id} via fuzzy semantic search")
+                    return new_id
+
+        if self._debug: print(f"[Apple Music Debug] No equivalent track found in {target_storefront}")
+        return None
 
     def get_track_info(self, track_id: str, quality_tier: QualityEnum, codec_options: CodecOptions, data: Optional[Dict[str, Any]] = None, **kwargs) -> Optional[TrackInfo]:
+        with self._telemetry.operation('track_info', track_id.get('id') if isinstance(track_id, dict) else track_id) as record:
+            track_info = self._get_track_info(track_id, quality_tier, codec_options, data, **kwargs)
+            if track_info is not None and track_info.error:
+                record.status = 'error'
+            return track_info
+
+    def _get_track_info(self, track_id, quality_tier: QualityEnum, codec_options: CodecOptions, data: Optional[Dict[str, Any]] = None, **kwargs) -> Optional[TrackInfo]:
         if self._debug:
             print(f"[{module_information.service_name} DEBUG] get_track_info called for track_id: {track_id}, kwargs: {list(kwargs.keys())}")
 
@@ -1376,7 +2234,15 @@ class ModuleInterface:
                 if self._debug: print(f"[Apple Music Debug] Failed to parse stringified track_id: {e}")
                 # Continue with original track_id and let the API handle the error
 
-        self._ensure_credentials()
+        attrs_hint = (data.get('attributes') or {}) if isinstance(data, dict) else {}
+        archived = self.check_archive(track_id, quality_tier, isrc=attrs_hint.get('isrc'), song_codec=kwargs.get('song_codec'))
+        if archived:
+            if self._debug: print(f"[Apple Music Debug] Track {track_id} is in the download archive ({archived.path}), skipping")
+            self._telemetry.count('archive_skips')
+            return TrackInfo(name=attrs_hint.get('name') or f"Track {track_id}", error=f"Already downloaded ({archived.path or 'download archive'})", artists=[attrs_hint.get('artistName') or "Unknown Artist"], album=attrs_hint.get('albumName') or "", album_id=None, artist_id=None, duration=0, codec=CodecEnum.AAC, bitrate=0, sample_rate=0, release_year=None, cover_url=None, explicit=False, tags=Tags())
+
+        with self._telemetry.span('credentials'):
+            self._ensure_credentials()
 
         try:
             # Detection for library IDs (e.g., 65WJUJIOK3UJT5J5H4DXEXBFUY)
@@ -1421,13 +2287,19 @@ class ModuleInterface:
                     if getattr(s, '_debug', False): print(f"[Apple Music Debug] API fetch failed for {sid}: {fe}")
                     return None
 
+            row_api_data = None
             # Check if we have raw_result from search
             if 'raw_result' in kwargs and kwargs['raw_result']:
                 track_api_data = kwargs['raw_result']
                 if self._debug: print(f"[Apple Music Debug] Using raw_result from search for track {track_id}")
             else:
                 # Use data if provided (e.g., from album track list), otherwise fetch
-                track_api_data = data if data and isinstance(data, dict) and data.get('id') == track_id and 'attributes' in data else self._run_async(lambda s: _fetch_with_logging(s, track_id), storefront=country)
+                if data and isinstance(data, dict) and data.get('id') == track_id and 'attributes' in data:
+                    # Compact album/playlist rows reference shared container metadata by ID
+                    track_api_data = row_api_data = self._track_rows.api_data(data) if 'shared' in data else data
+                else:
+                    with self._telemetry.span('metadata'):
+                        track_api_data = self._run_async(lambda s: _fetch_with_logging(s, track_id), storefront=country, priority=BULK)
 
                 # Early ID Reconciliation: if the data already has a catalogId in
                 # playParams, switch track_id to it before unwrapping
@@ -1444,7 +2316,7 @@ class ModuleInterface:
                 # Fallback to account storefront if url-based storefront fails
                 if (not track_api_data or 'attributes' not in track_api_data) and country and self.account_storefront.lower() != country.lower():
                     if self._debug: print(f"[Apple Music Debug] Fetch failed for storefront '{country}'. Retrying with account storefront '{self.account_storefront}'...")
-                    track_api_data = _first(self._run_async(lambda s: _fetch_with_logging(s, track_id), storefront=self.account_storefront))
+                    track_api_data = _first(self._run_async(lambda s: _fetch_with_logging(s, track_id), storefront=self.account_storefront, priority=BULK))
 
                 # If still failed, try a "guest" fetch (without user token) for metadata
                 if not track_api_data or 'attributes' not in track_api_data:
@@ -1465,7 +2337,7 @@ class ModuleInterface:
                             s.apple_music_api.client.headers.update(original_headers)
                             s.apple_music_api.client.cookies.update(original_cookies)
 
-                    track_api_data = _first(self._run_async(lambda s: _fetch_guest(s, track_id, country or self.account_storefront), storefront=country or self.account_storefront))
+                    track_api_data = _first(self._run_async(lambda s: _fetch_guest(s, track_id, country or self.account_storefront), storefront=country or self.account_storefront, priority=BULK))
 
                 # If everything else failed, try iTunes Search API (lookup)
                 if not track_api_data or 'attributes' not in track_api_data:
@@ -1497,7 +2369,7 @@ class ModuleInterface:
                             if getattr(s, '_debug', False): print(f"[Apple Music Debug] iTunes lookup failed: {ie}")
                         return None
 
-                    track_api_data = self._run_async(lambda s: _fetch_itunes(s, track_id), storefront=country)
+                    track_api_data = self._run_async(lambda s: _fetch_itunes(s, track_id), storefront=country, priority=BULK)
 
             if not track_api_data or 'attributes' not in track_api_data:
                 if self._debug: print(f"[Apple Music Error] Could not fetch track data for {track_id} from AppleMusicApi.")
@@ -1522,7 +2394,8 @@ class ModuleInterface:
             artist_id_from_rels = attrs.get('artistName') or (track_api_data.get('relationships', {}).get('artists', {}).get('data', [{}])[0].get('id'))
             if allow_refetch and (not album_id_from_rels or not artist_id_from_rels or 'hasLyrics' not in attrs or 'audioTraits' not in attrs or 'recordLabel' not in attrs or 'copyright' not in attrs or 'upc' not in attrs):
                 if self._debug: print(f"[Apple Music Debug] Incomplete metadata (Album={album_id_from_rels}, Artist={artist_id_from_rels}, hasLyrics={'hasLyrics' in attrs}, audioTraits={'audioTraits' in attrs}) for track {track_id}. Fetching full song data.")
-                full_track_data = _first(self._run_async(lambda s: _fetch_with_logging(s, track_id), storefront=country))
+                with self._telemetry.span('metadata'):
+                    full_track_data = _first(self._run_async(lambda s: _fetch_with_logging(s, track_id), storefront=country, priority=BULK))
                 if isinstance(full_track_data, dict) and 'attributes' in full_track_data:
                     track_api_data = full_track_data
                     attrs = track_api_data['attributes']
@@ -1539,7 +2412,8 @@ class ModuleInterface:
                 name_for_search = attrs.get('name')
                 artist_name_for_search = attrs.get('artistName')
                 if track_isrc or (name_for_search and artist_name_for_search):
-                    equivalent_id = self._get_equivalent_track_id(track_isrc, user_storefront, name_for_search, artist_name_for_search)
+                    with self._telemetry.span('equivalent_lookup'):
+                        equivalent_id = self._get_equivalent_track_id(track_isrc, user_storefront, name_for_search, artist_name_for_search)
 
                     if self._debug: print(f"[Apple Music Debug] ID {track_id} -> Storefronts: User={user_storefront}, API={api_storefront}. Result equivalent_id={equivalent_id}")
 
@@ -1548,7 +2422,8 @@ class ModuleInterface:
                         if self._debug: print(f"[Apple Music Debug] Using equivalent track {actual_download_id} in {user_storefront}. Fetching its metadata...")
 
                         # Re-fetch metadata for the equivalent ID in the user's storefront so the downloader has working info
-                        equiv_metadata = _first(self._run_async(lambda s: s.apple_music_api.get_song(actual_download_id), storefront=user_storefront))
+                        with self._telemetry.span('metadata'):
+                            equiv_metadata = _first(self._run_async(lambda s: s.apple_music_api.get_song(actual_download_id), storefront=user_storefront, priority=BULK))
                         if isinstance(equiv_metadata, dict) and 'attributes' in equiv_metadata:
                             track_api_data = equiv_metadata
                             # Update local attrs for any later logic in this method
@@ -1602,7 +2477,8 @@ class ModuleInterface:
                         print(f"[Apple Music Debug] Display fallback: Downgrading codec to ALAC as ATMOS is unavailable (Traits: {traits})")
 
                     # Try to get precise info from manifest
-                    precise_info = self._get_precise_alac_info(attrs, GamdlSongCodec.ALAC, quality_tier=quality_tier)
+                    with self._telemetry.span('manifest'):
+                        precise_info = self._get_precise_alac_info(attrs, GamdlSongCodec.ALAC, quality_tier=quality_tier)
                     if precise_info:
                         display_bit_depth = precise_info.get('bit_depth', 24)
                         display_sample_rate = precise_info.get('sample_rate', 48000)
@@ -1673,9 +2549,12 @@ class ModuleInterface:
 
             cover_url = self._get_cover_url(attrs.get('artwork', {}).get('url'))
 
+            # Keep a reference to the compact row rather than its expansion when the row
+            # was used as-is, so queued TrackInfos don't each hold a full API item
+            api_response = data if row_api_data is not None and track_api_data is row_api_data else track_api_data
             download_extra_kwargs = {
                 'track_id': actual_download_id,
-                'api_response': track_api_data,
+                'api_response': api_response,
                 'quality_tier': quality_tier,
                 'source_quality_tier': quality_tier.name if hasattr(quality_tier, 'name') else str(quality_tier),
                 'original_id': track_id,
@@ -1683,6 +2562,7 @@ class ModuleInterface:
             }
             if override_song_codec: download_extra_kwargs['song_codec'] = override_song_codec
             if kwargs.get('use_wrapper') is not None: download_extra_kwargs['use_wrapper'] = kwargs.get('use_wrapper')
+            if kwargs.get('job_id'): download_extra_kwargs['job_id'] = kwargs['job_id']
 
             return TrackInfo(
                 name=name, album=album_name, album_id=str(album_id_from_rels) if album_id_from_rels else None,
@@ -1691,7 +2571,7 @@ class ModuleInterface:
                 sample_rate=display_sample_rate // 1000 if display_sample_rate else None, release_year=year,
                 cover_url=cover_url, explicit=explicit, tags=tags_obj, id=actual_download_id,
                 download_extra_kwargs=download_extra_kwargs,
-                lyrics_extra_kwargs={'data': track_api_data}
+                lyrics_extra_kwargs={'data': api_response, 'country': country}
             )
 
         except Exception as e:
@@ -1720,6 +2600,9 @@ class ModuleInterface:
             print(f"[Apple Music Debug] get_track_download called for track_id: {track_id}")
             print(f"[Apple Music Debug] quality_tier: {quality_tier} (Type: {type(quality_tier)})")
 
+        # The rest of this track's album/playlist will want its lyrics too
+        self._start_lyrics_prefetch(track_id)
+
         # Re-evaluate settings from config to ensure we catch changes from the GUI
         self.song_codec = self._get_gamdl_codec(self.settings.get('codec', 'aac'))
         self.use_wrapper = self.settings.get('use_wrapper', False)
@@ -1769,7 +2652,7 @@ class ModuleInterface:
 
         indent_spaces = "        "
 
-        async def _download_async():
+        async def _download_async(cancel):
             # Stabilize storefront based on extra_kwargs to avoid region mismatches
             local_storefront = kwargs.get('effective_storefront')
             if local_storefront:
@@ -1778,6 +2661,8 @@ class ModuleInterface:
             # 1. Get metadata (use provided api_response if available to save a request)
             # We fetch this BEFORE initializing components so we can adjust the codec if needed
             song_api_data = kwargs.get('api_response')
+            if song_api_data and 'shared' in song_api_data:
+                song_api_data = self._track_rows.api_data(song_api_data)
             if song_api_data:
                 # Handle both full 'data' wrapper and direct item dict
                 if 'data' in song_api_data and isinstance(song_api_data['data'], list) and len(song_api_data['data']) > 0:
@@ -1795,7 +2680,8 @@ class ModuleInterface:
                     target_id = track_id or kwargs.get('track_id')
                     if not target_id:
                         raise DownloadError("Apple Music: No track ID provided for download.")
-                    song_metadata = await self.apple_music_api.get_song(target_id)
+                    with self._telemetry.span('metadata'):
+                        song_metadata = await self.apple_music_api.get_song(target_id)
 
                 if not song_metadata or not song_metadata.get('data'):
                     raise DownloadError(f"Apple Music: Failed to get metadata for track {target_id}")
@@ -1818,7 +2704,7 @@ class ModuleInterface:
                     local_effective_codec = GamdlSongCodec.AAC_WEB
 
             # 3. Ensure gamdl components are initialized, passing overrides if present
-            with self._gamdl_quiet():
+            with self._gamdl_quiet(), self._telemetry.span('init_components'):
                 await self._initialize_gamdl_components(song_codec=local_effective_codec, use_wrapper=override_use_wrapper)
 
             # Update quality_tier on our custom interface before each download
@@ -1845,6 +2731,26 @@ class ModuleInterface:
                 is_library=bool(kwargs.get('is_library')),
             )
 
+            async def _reject_preview(download_item, detail: str):
+                """Retry a preview-only stream with the ISRC's ID in the account storefront, else fail."""
+                self._discard_segments(download_item)
+                isrc = download_item.media.media_metadata.get('attributes', {}).get('isrc')
+                if isrc and not kwargs.get('_is_retry'):
+                    if self._debug: print(f"[Apple Music Warning] Likely a preview: {detail}. Attempting to find a better ID for ISRC {isrc} in {self.account_storefront}...")
+                    # Try to find the track again in our account storefront specifically
+                    try:
+                        equiv_id = await self._get_equivalent_track_id_async(isrc, self.account_storefront)
+                    except Exception as e:
+                        if self._debug: print(f"[Apple Music Debug] Error searching for equivalent track: {e}")
+                        equiv_id = None
+                    if equiv_id and equiv_id != track_id:
+                        if self._debug: print(f"[Apple Music Debug] Found different ID {equiv_id} for ISRC {isrc}. Retrying download...")
+                        # get_track_download retries with that ID once this download has ended
+                        raise _EquivalentRetry(equiv_id)
+
+                if self._debug: print(f"[Apple Music Error] Likely a preview: {detail}.")
+                raise DownloadError(f"Apple Music: The {requested_codec_val.upper()} stream is a preview ({detail}).")
+
             def _prepare_download_error(e: Exception) -> DownloadError:
                 """Map a media-preparation failure to the right user-facing DownloadError."""
                 self._maybe_raise_alac_wrapper_error(e, local_effective_codec)
@@ -1854,8 +2760,10 @@ class ModuleInterface:
 
             with self._gamdl_quiet():
                 try:
-                    async for populated_media in self.gamdl_song_interface.get_media(media):
-                        media = populated_media
+                    # Stream info, cover, lyrics, tags and the license/decryption key
+                    with self._telemetry.span('get_media'):
+                        async for populated_media in self.gamdl_song_interface.get_media(media):
+                            media = populated_media
                 except StopIteration as si:
                     if self._debug:
                         print(f"[Apple Music Error] StopIteration during get_media: {si}")
@@ -1886,7 +2794,8 @@ class ModuleInterface:
                     raise media.error
 
                 try:
-                    download_item = await self.gamdl_song_downloader.get_download_item(media)
+                    with self._telemetry.span('download_item'):
+                        download_item = await self.gamdl_song_downloader.get_download_item(media)
                 except Exception as e:
                     if self._debug: print(f"[Apple Music Error] Failed to get download item: {type(e).__name__}: {e}")
                     raise _prepare_download_error(e) from e
@@ -1895,6 +2804,8 @@ class ModuleInterface:
                     if self._debug: print(f"[Apple Music Error] download_item contains error: {download_item.media.error}")
                     raise download_item.media.error
 
+            cancel.on_cancel(lambda: self._remove_temp_files(download_item))
+
             # 4. Check for silent quality fallback (e.g. ALAC/Atmos requested but AAC returned)
             requested_codec_val = local_effective_codec.value if hasattr(local_effective_codec, 'value') else str(local_effective_codec)
 
@@ -1914,6 +2825,16 @@ class ModuleInterface:
             ):
                 raise DownloadError("Apple Music: Could not obtain Dolby Atmos stream for this track.")
 
+            # 4b. Catch preview-only / truncated streams from the manifest, before downloading anything
+            with self._telemetry.span('preview_check'):
+                preview_detail, media_playlist = await self._detect_preview_stream(download_item)
+            if preview_detail:
+                return await _reject_preview(download_item, preview_detail)
+            playlists = getattr(self.gamdl_base_downloader, 'playlists', None)
+            if media_playlist is not None and playlists is not None and self.gamdl_base_downloader.native:
+                # The native downloader starts from the playlist fetched for the check
+                playlists[media_playlist.url] = media_playlist
+
             # 5. Download and process
             codec_name = local_effective_codec.name if hasattr(local_effective_codec, 'name') else str(local_effective_codec)
 
@@ -1931,8 +2852,15 @@ class ModuleInterface:
 
             for attempt in range(max_retries):
                 try:
-                    with self._gamdl_quiet():
-                        await self.gamdl_downloader.download(download_item)
+                    # Segment download, decrypt/remux and tagging are timed inside the downloader subclasses
+                    try:
+                        with self._gamdl_quiet(), self._telemetry.span('gamdl_download'):
+                            await self.gamdl_downloader.download(download_item)
+                    finally:
+                        # The staged file has moved to gamdl_out (or the attempt failed): intermediates can go
+                        self._remove_temp_files(download_item)
+                        if media_playlist is not None and playlists:
+                            playlists.pop(media_playlist.url, None)
 
                     # Sanity check for extremely small files (e.g. 1.5MB for multi-minute ALAC)
                     final_path = Path(download_item.final_path)
@@ -1946,33 +2874,31 @@ class ModuleInterface:
                         except: pass
 
                         if requested_codec_val in ['alac', 'atmos'] and duration_sec > 30 and file_size < 2000000:
-                             isrc = download_item.media.media_metadata.get('attributes', {}).get('isrc')
-                             if isrc and not kwargs.get('_is_retry'):
-                                 if self._debug: print(f"[Apple Music Warning] Downloaded file is too small ({file_size} bytes). Likely a preview. Attempting to find a better ID for ISRC {isrc} in {self.account_storefront}...")
-                                 # Try to find the track again in our account storefront specifically
-                                 equiv_id = self._get_equivalent_track_id(isrc, self.account_storefront)
-                                 if equiv_id and equiv_id != track_id:
-                                     if self._debug: print(f"[Apple Music Debug] Found different ID {equiv_id} for ISRC {isrc}. Retrying download...")
-                                     try: final_path.unlink()
-                                     except: pass
-                                     # Recursive call with retry flag + forced fresh lookup
-                                     new_kwargs = kwargs.copy()
-                                     new_kwargs['_is_retry'] = True
-                                     new_kwargs['api_response'] = None
-                                     return await self.get_track_download(equiv_id, quality_tier, codec_options, **new_kwargs)
-
-                             if self._debug: print(f"[Apple Music Error] Downloaded file is suspiciously small ({file_size} bytes for {duration_sec}s). Likely a preview.")
-                             raise DownloadError(f"Apple Music: The downloaded {requested_codec_val.upper()} file is corrupt or a preview (too small).")
+                            try: final_path.unlink()
+                            except: pass
+                            return await _reject_preview(download_item, f"downloaded file is too small ({file_size} bytes for {duration_sec}s)")
 
+                    # Track is complete: its cached segments are no longer needed
+                    self._discard_segments(download_item)
+                    final_path = await self._deliver(download_item, kwargs)
+                    if final_path.exists():
+                        self._telemetry.count('bytes_delivered', final_path.stat().st_size)
+                    temp_space = getattr(self.gamdl_base_downloader, 'temp_space', None)
+                    if temp_space is not None and temp_space.quota_bytes:
+                        await asyncio.to_thread(temp_space.enforce)
+                    await self._archive_download(download_item, kwargs.get('original_id') or track_id, quality_tier,
+                                                 override_song_codec, local_effective_codec)
                     break # Success!
 
+                except _EquivalentRetry:
+                    raise
                 except Exception as e:
-                    error_str = str(e)
                     # Check for amdecrypt connection error (wrapper agent not running)
-                    if wrapper_requested and (
-                        any(ind in error_str.lower() for ind in _WRAPPER_CONN_ERROR_MARKERS)
-                        or isinstance(e, ConnectionRefusedError)
-                    ):
+                    if wrapper_requested and self._is_wrapper_connection_error(e):
+                        # Several wrappers configured: move on to a healthy one straight away
+                        if await self._fail_over_wrapper(e):
+                            continue
+
                         # Play audible notification if enabled
                         if getattr(self.module_controller.orpheus_options, 'play_sound_on_finish', True):
                             try:
@@ -2001,6 +2927,7 @@ class ModuleInterface:
                                 print(f"{indent_spaces}Wrapper restart command failed: {restart_e}")
 
                         print(f"{indent_spaces}Waiting {retry_wait}s for restoration before retrying download...")
+                        self._telemetry.count('wrapper_retries')
                         await asyncio.sleep(retry_wait)
                         continue
 
@@ -2009,12 +2936,35 @@ class ModuleInterface:
 
             return download_item
 
+        async def _timed_download_async(cancel):
+            cancel.bind()
+            try:
+                with self._telemetry.operation('download', kwargs.get('original_id') or track_id):
+                    pool = self._get_wrapper_pool() if wrapper_requested else None
+                    if pool is not None:
+                        return await self._download_on_wrapper_pool(pool, lambda: _download_async(cancel))
+                    return await _download_async(cancel)
+            except asyncio.CancelledError:
+                if not cancel.cancelled:
+                    raise
+                # Our own cancellation: end the call normally with DownloadCancelled
+                task = asyncio.current_task()
+                if hasattr(task, 'uncancel'):
+                    task.uncancel()
+                cancel.cleanup()
+                self._telemetry.count('downloads_cancelled')
+                if self._debug: print(f"[Apple Music Debug] Download of {track_id} {cancel.reason}")
+                cancel.raise_if_cancelled()
+
         try:
             # Explicitly pass target storefront to ensure background loop worker sets it correctly
             target_st = kwargs.get('effective_storefront') or kwargs.get('country') or self.account_storefront
             if self._debug: print(f"[Apple Music Debug] Starting download async for {track_id} on storefront '{target_st}'")
 
-            download_item = self._run_async(lambda s: _download_async(), storefront=target_st)
+            with self._cancellations.track(kwargs.get('original_id') or track_id, track_id,
+                                           job=kwargs.get('job_id')) as cancel:
+                download_item = self._run_async(lambda s: _timed_download_async(cancel), storefront=target_st,
+                                                lane=self._download_lane, priority=DOWNLOAD)
 
             if self._debug: print(f"[Apple Music Success] Download completed: {download_item.final_path}")
 
@@ -2023,7 +2973,13 @@ class ModuleInterface:
                 temp_file_path=str(download_item.final_path)
             )
 
-        except (AuthenticationError, TrackUnavailableError, DownloadError):
+        except _EquivalentRetry as retry:
+            # Recursive call with retry flag + forced fresh lookup
+            new_kwargs = kwargs.copy()
+            new_kwargs['_is_retry'] = True
+            new_kwargs['api_response'] = None
+            return self.get_track_download(retry.track_id, quality_tier, codec_options, **new_kwargs)
+        except (AuthenticationError, TrackUnavailableError, DownloadError, DownloadCancelled):
             raise
         except Exception as e:
             error_str = str(e)
@@ -2069,31 +3025,120 @@ class ModuleInterface:
 
             raise DownloadError(final_msg) from e
 
+    async def _deliver(self, download_item, kwargs: dict) -> Path:
+        """Move a finished file to the caller's destination_path / destination_root, if any; returns its path."""
+        destination = destination_for(download_item.final_path, self.gamdl_base_downloader.output_path,
+                                      kwargs.get('destination_path'), kwargs.get('destination_root'))
+        if destination is None:
+            return Path(download_item.final_path)
+        link = str(self.settings.get('delivery_mode', 'move')).lower() == 'link'
+        method = await asyncio.to_thread(deliver, download_item.final_path, destination, link)
+        self._telemetry.count(f'delivered_{method}')
+        # gamdl's synced lyrics file goes along with the track
+        lyrics_path = getattr(download_item, 'synced_lyrics_path', None)
+        if lyrics_path and os.path.exists(lyrics_path):
+            await asyncio.to_thread(deliver, lyrics_path, destination.with_suffix(Path(lyrics_path).suffix), link)
+        download_item.final_path = str(destination)
+        return destination
+
+    async def _archive_download(self, download_item, requested_id, quality_tier=None, song_codec=None,
+                                delivered_codec=None) -> None:
+        """Record a finished download in the archive (no-op when the archive is disabled)."""
+        archive = self._get_archive()
+        if archive is None:
+            return
+        final_path = Path(download_item.final_path)
+        try:
+            checksum = await asyncio.to_thread(file_checksum, final_path)
+        except OSError:
+            return
+        codec, quality = self._archive_key(quality_tier, song_codec)
+        # Archived under the codec actually delivered: a track without ALAC/Atmos falls back to AAC
+        delivered = await asyncio.to_thread(probe_codec, final_path)
+        if delivered is None and delivered_codec is not None:
+            delivered = (delivered_codec.value, quality if delivered_codec.value == codec else '')
+        if delivered is not None and delivered[0] != codec:
+            codec, quality = delivered
+        attrs = download_item.media.media_metadata.get('attributes', {})
+        # Archived under the ID that was requested; the ISRC covers storefront equivalents
+        archive.record(
+            requested_id or download_item.media.media_id, codec, quality,
+            isrc=attrs.get('isrc'), path=final_path, checksum=checksum,
+        )
+
+    async def _detect_preview_stream(self, download_item) -> Tuple[Optional[str], Optional[MediaPlaylist]]:
+        """Why the stream looks like a preview (None if it looks complete or can't be checked), and
+        the media playlist fetched for the check (None if it wasn't).
+
+        Compares the summed segment durations of the media playlist with the
+        track's durationInMillis, so preview-only streams are caught before any
+        segment is downloaded, decrypted or remuxed.
+        """
+        try:
+            stream_url = download_item.media.stream_info.audio_track.stream_url
+            duration_ms = download_item.media.media_metadata.get('attributes', {}).get('durationInMillis')
+        except AttributeError:
+            return None, None
+        if not duration_ms or duration_ms <= 30000 or not is_hls_url(stream_url):
+            return None, None
+        try:
+            playlist = await fetch_media_playlist(stream_url)
+        except Exception as e:
+            # Inconclusive: let the download (and the post-download size check) decide
+            if self._debug: print(f"[Apple Music Debug] Preview check skipped, could not read media playlist: {e}")
+            return None, None
+        expected = duration_ms / 1000
+        ratio = float(self.settings.get('preview_duration_ratio', 0.9))
+        if playlist.duration < expected * ratio:
+            return f"stream is {playlist.duration:.0f}s of {expected:.0f}s", playlist
+        return None, playlist
+
+    def _remove_temp_files(self, download_item) -> None:
+        """Remove a download item's gamdl_temp folder (partial stream, decrypted and staged files)."""
+        temp_space = getattr(self.gamdl_base_downloader, 'temp_space', None)
+        if temp_space is not None and getattr(download_item, 'uuid_', None):
+            temp_space.finish(download_item.uuid_)
+            return
+        staged_path = getattr(download_item, 'staged_path', None)
+        if not staged_path:
+            return
+        folder = Path(staged_path).parent
+        if folder.name.startswith('gamdl_temp_'):
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _discard_segments(self, download_item) -> None:
+        """Drop the segment cache of a finished (or rejected) download item."""
+        try:
+            stream_url = download_item.media.stream_info.audio_track.stream_url
+        except AttributeError:
+            return
+        if getattr(self.gamdl_base_downloader, 'discard_segments', None):
+            self.gamdl_base_downloader.discard_segments(stream_url)
+
     def get_track_lyrics(self, track_id: str, **kwargs) -> Optional[LyricsInfo]:
         # Use provided data if available to save an API call
         song_data = kwargs.get('data')
+        # Same storefront as the album/playlist prefetch, so its cache entries are found
+        storefront = self._lyrics_storefront(kwargs.get('country'))
+        self._start_lyrics_prefetch(track_id)
 
         # If not provided, we need to fetch it (fallback)
         if not song_data:
             self._ensure_credentials()
 
             # Use background loop worker to set storefront correctly during fetch
-            country = kwargs.get('country')
-            song_data = _first(self._run_async(lambda s: s.apple_music_api.get_song(track_id), storefront=country))
+            song_data = _first(self._run_async(lambda s: s.apple_music_api.get_song(track_id), storefront=storefront,
+                                               priority=BULK))
 
         if not song_data:
             return None
-
-        # Initialize gamdl components if not done (needed for gamdl_song_interface)
-        # Use standard AAC as it doesn't matter for metadata
-        async def _fetch_lyrics():
-            await self._initialize_gamdl_components(song_codec=GamdlSongCodec.AAC_WEB)
-            if not self.gamdl_song_interface:
-                return None
-            return await self.gamdl_song_interface.get_lyrics(song_data)
+        if 'shared' in song_data:
+            song_data = self._track_rows.api_data(song_data)
 
         try:
-            lyrics = self._run_async(lambda s: _fetch_lyrics())
+            # Bulk lane, like the prefetch: both share its in-flight fetches
+            lyrics = self._run_async(lambda s: s._get_lyrics_async(song_data, storefront), storefront=storefront,
+                                     lane=BULK, priority=BULK)
             if lyrics:
                 return LyricsInfo(
                     embedded=lyrics.unsynced,
@@ -2104,6 +3149,161 @@ class ModuleInterface:
 
         return None
 
+    def prefetch_lyrics(self, tracks, country: str = None) -> Optional[concurrent.futures.Future]:
+        """Fetch lyrics for every hasLyrics track into the cache in the background.
+
+        tracks are AlbumInfo/PlaylistInfo track rows (dicts or bare IDs). Returns
+        immediately with a future for the whole batch, which runs on the bulk
+        loop as one background-priority call, behind interactive and bulk work.
+        """
+        if not self.is_authenticated or self._get_lyrics_cache() is None:
+            return None
+        pending = []
+        for track in tracks:
+            if isinstance(track, dict):
+                if not track.get('id'):
+                    continue
+                attrs = track.get('attributes') or {}
+                if attrs.get('hasLyrics') is False or (attrs.get('playParams') or {}).get('isLibrary'):
+                    continue
+                pending.append(track if attrs else {'id': track['id']})
+            elif track:
+                pending.append({'id': str(track)})
+        if not pending:
+            return None
+        if self._debug: print(f"[Apple Music Debug] Prefetching lyrics for {len(pending)} tracks...")
+        storefront = self._lyrics_storefront(country)
+        if self._lyrics_prefetcher is None:
+            self._lyrics_prefetcher = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='AppleMusicLyrics')
+        return self._lyrics_prefetcher.submit(
+            self._run_async, lambda s: s._prefetch_lyrics_async(pending, storefront),
+            lane=BULK, priority=BACKGROUND, timeout=self._timeouts['listing'])
+
+    async def _prefetch_lyrics_async(self, songs: list, storefront: str) -> int:
+        width = min(int(self.settings.get('lyrics_prefetch_concurrency', 4)), self._concurrency.limit)
+        semaphore = asyncio.Semaphore(max(1, width))
+
+        async def fetch_one(song_data):
+            async with semaphore:
+                try:
+                    return bool(await self._get_lyrics_async(song_data, storefront=storefront))
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        self._concurrency.on_rate_limited()
+                    if self._debug: print(f"[Apple Music Debug] Lyrics prefetch failed for {song_data.get('id')}: {e}")
+                    return False
+
+        results = await asyncio.gather(*(fetch_one(song) for song in songs))
+        if self._debug: print(f"[Apple Music Debug] Lyrics prefetch finished: {sum(results)}/{len(songs)} tracks have lyrics")
+        return sum(results)
+
+    def _maybe_prefetch_lyrics(self, tracks, country: str = None) -> None:
+        """Remember an album/playlist's rows for a lyrics prefetch when lyrics are going to be used.
+
+        Listings are also browsed without downloading, so the prefetch only
+        starts once one of the tracks is downloaded (_start_lyrics_prefetch).
+        """
+        if not self.settings.get('lyrics_prefetch', True) or not tracks:
+            return
+        lyrics_settings = self._get_global_lyrics_settings()
+        if not (lyrics_settings.get('embed_lyrics', True) or lyrics_settings.get('save_synced_lyrics', True)):
+            return
+        batch = (list(tracks), country)
+        with self._lyrics_batches_lock:
+            for track in batch[0]:
+                track_id = track.get('id') if isinstance(track, dict) else track
+                if track_id:
+                    self._lyrics_batches[str(track_id)] = batch
+            # Bounded: listings that are only browsed are forgotten, oldest first
+            while len(self._lyrics_batches) > 20000:
+                del self._lyrics_batches[next(iter(self._lyrics_batches))]
+
+    def _start_lyrics_prefetch(self, track_id) -> None:
+        """A track is being downloaded: prefetch the lyrics of the listing it came from."""
+        with self._lyrics_batches_lock:
+            batch = self._lyrics_batches.pop(str(track_id), None)
+            if batch is None:
+                return
+            for key in [key for key, queued in self._lyrics_batches.items() if queued is batch]:
+                del self._lyrics_batches[key]
+        try:
+            self.prefetch_lyrics(*batch)
+        except Exception as e:
+            if self._debug: print(f"[Apple Music Debug] Could not start lyrics prefetch: {e}")
+
+    def _lyrics_storefront(self, country: str = None) -> str:
+        """Storefront lyrics are fetched from and cached under: the listing's country, else the account's."""
+        return (country or getattr(self, 'account_storefront', None)
+                or getattr(getattr(self, 'apple_music_api', None), 'storefront', None) or 'us').lower()
+
+    async def _get_lyrics_async(self, song_data: dict, storefront: str = None) -> CachedLyrics:
+        """Lyrics for a song via the persistent cache; concurrent callers share one fetch."""
+        song_id = str(song_data.get('id'))
+        storefront = self._lyrics_storefront(storefront)
+        key = (song_id, storefront, self.settings.get('language', 'en-US'))
+        cache = self._get_lyrics_cache()
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, *key)
+            if cached is not None:
+                return cached
+
+        pending = self._lyrics_inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._lyrics_inflight[key] = future
+        try:
+            lyrics = await self._fetch_lyrics_async(song_data, storefront)
+            if cache is not None:
+                await asyncio.to_thread(cache.put, *key, lyrics)
+            future.set_result(lyrics)
+            return lyrics
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._lyrics_inflight.pop(key, None)
+
+    async def _fetch_lyrics_async(self, song_data: dict, storefront: str) -> CachedLyrics:
+        """Fetch and parse TTML lyrics for a song (same rules as gamdl's get_lyrics).
+
+        song_data is expected to come from storefront; a song without its lyrics
+        relationship is fetched again from that storefront.
+        """
+        attrs = song_data.get('attributes') or {}
+        if (attrs.get('playParams') or {}).get('isLibrary') or attrs.get('hasLyrics') is False:
+            return NO_LYRICS
+
+        def lyrics_rel(data):
+            return ((data.get('relationships') or {}).get('lyrics') or {}).get('data') or []
+
+        rel = lyrics_rel(song_data)
+        if not rel:
+            with self._gamdl_quiet():
+                if hasattr(self.apple_music_api, 'get_extended_api_data'):
+                    # Storefront in the URI rather than the shared client's, which other calls switch
+                    uri = f"/v1/catalog/{storefront}/songs/{song_data['id']}?include=lyrics"
+                    full_data = _first(await self.apple_music_api.get_extended_api_data(uri, uri))
+                else:
+                    # Older gamdl releases (get_song includes the lyrics relationship)
+                    full_data = _first(await self.apple_music_api.get_song(song_data['id']))
+            if not isinstance(full_data, dict) or (full_data.get('attributes') or {}).get('hasLyrics') is False:
+                return NO_LYRICS
+            rel = lyrics_rel(full_data)
+
+        ttml = (rel[0].get('attributes') or {}).get('ttml') if rel else None
+        if not ttml:
+            return NO_LYRICS
+
+        # Only gamdl's TTML parser is used here, so the interface needs no base/API clients
+        if self._lyrics_parser is None:
+            self._lyrics_parser = AppleMusicSongInterface(base=None, synced_lyrics_format=SyncedLyricsFormat.LRC)
+        lyrics = self._lyrics_parser._get_lyrics(ttml)
+        return CachedLyrics(lyrics.synced, lyrics.unsynced)
+
     def get_track_credits(self, track_id: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Optional[List[CreditsInfo]]:
         # Use existing get_track_info to avoid duplicating extraction logic
         # We pass allow_refetch=True to ensure we get labels/composers
@@ -2129,6 +3329,10 @@ class ModuleInterface:
         # using the resolution from settings.
         return CoverInfo(url=track_info.cover_url, file_type=ImageFileTypeEnum.jpg)
 
+    async def _fetch_tracks_page(self, next_uri: str, href_uri: str = None) -> dict:
+        """One further page of a tracks relationship ({'data': [...], 'next': ...})."""
+        return await self.apple_music_api.get_extended_api_data(next_uri, href_uri or next_uri) or {}
+
     def _extend_paged_tracks(self, tracks_rel: dict) -> None:
         """Fetch the remaining pagination pages of a tracks relationship and merge them in place."""
         if 'next' not in tracks_rel:
@@ -2136,6 +3340,14 @@ class ModuleInterface:
 
         async def fetch_all(api, rel):
             all_data = rel.get('data', [])
+            if hasattr(api, 'get_extended_api_data'):
+                next_uri = rel.get('next')
+                while next_uri:
+                    page = await self._fetch_tracks_page(next_uri, rel.get('href'))
+                    all_data.extend(page.get('data', []))
+                    next_uri = page.get('next')
+                return all_data
+            # Older gamdl releases
             async for page in api.extend_api_data(rel):
                 all_data.extend(page.get('data', []))
             return all_data
@@ -2144,7 +3356,8 @@ class ModuleInterface:
         # extend_api_data uses the API's current storefront; restore it afterwards
         current_sf = self.apple_music_api.storefront
         try:
-            paged_tracks = self._run_async(lambda s: fetch_all(s.apple_music_api, tracks_rel))
+            paged_tracks = self._run_async(lambda s: fetch_all(s.apple_music_api, tracks_rel),
+                                           timeout=self._timeouts['listing'])
             if paged_tracks:
                 if self._debug: print(f"[Apple Music Debug] Total tracks after pagination: {len(paged_tracks)}")
                 tracks_rel['data'] = paged_tracks
@@ -2153,12 +3366,32 @@ class ModuleInterface:
         finally:
             self.apple_music_api.storefront = current_sf
 
+    def _lazy_track_rows(self, tracks_rel: dict, first_rows: list, make_rows, attrs: dict,
+                         country: str = None) -> LazyTrackRows:
+        """Playlist track list holding the first page; later pages load on demand, one ahead."""
+        href = tracks_rel.get('href')
+
+        def fetch_page(next_uri):
+            page = self._run_async(lambda s: s._fetch_tracks_page(next_uri, href), storefront=country,
+                                   priority=BACKGROUND)
+            return page.get('data') or [], page.get('next')
+
+        total = (tracks_rel.get('meta') or {}).get('total') or attrs.get('trackCount')
+        if self._debug: print(f"[Apple Music Debug] Lazy playlist: {len(first_rows)} tracks now, {total or 'unknown'} in total")
+        return LazyTrackRows(
+            first_rows, tracks_rel['next'], fetch_page, make_rows,
+            total=int(total) if total else None,
+            on_page=lambda rows: self._maybe_prefetch_lyrics(rows, country=country),
+        )
+
     def _track_row(self, track: dict, idx: int, default_artist: str, release_year,
-                   fallback_cover: str, inherit_attrs: dict = None):
-        """Build one track dict for AlbumInfo/PlaylistInfo track lists.
+                   fallback_cover: str, inherit_attrs: dict = None, shared_id: int = None):
+        """Build one compact track row for AlbumInfo/PlaylistInfo track lists.
 
         Returns the bare track ID (string) when the item carries no attributes,
         matching the format get_track_info expects for ID-only entries.
+        Container-level metadata (inherit_attrs) is stored once in the row store
+        and referenced by shared_id; pass the same ID for every row of a container.
         """
         t_attrs = track.get('attributes') or {}
         if not t_attrs:
@@ -2167,31 +3400,25 @@ class ModuleInterface:
         if 'url' in t_attrs:
             t_attrs['url'] = self._localize_url(t_attrs['url'])
 
+        if shared_id is None:
+            shared_id = self._track_rows.shared(inherit_attrs, default_artist, release_year, fallback_cover)
         dur_ms = t_attrs.get('durationInMillis')
         # Library tracks sometimes lack artistName — inherit the container's artist
-        artist_attrs = dict(t_attrs)
+        artist_attrs = t_attrs
         if not artist_attrs.get('artistName'):
-            artist_attrs['artistName'] = default_artist
-        # Pass container-level metadata (label/copyright/upc) through to each track
-        for key, value in (inherit_attrs or {}).items():
-            if value and key not in t_attrs:
-                t_attrs[key] = value
+            artist_attrs = {**t_attrs, 'artistName': default_artist}
         previews = t_attrs.get('previews') or []
 
-        return {
-            'id': track.get('id', ''),
-            'name': t_attrs.get('name') or f'Track {idx}',
-            'duration': (dur_ms // 1000) if isinstance(dur_ms, (int, float)) else None,
-            'artists': artists_from_apple_attrs(artist_attrs),
-            'release_year': release_year,
-            'cover_url': self._get_cover_url(t_attrs.get('artwork', {}).get('url')) or fallback_cover,
-            'preview_url': previews[0].get('url') if previews else None,
-            # Pass full API data so get_track_info doesn't need to refetch
-            'attributes': t_attrs,
-            'relationships': track.get('relationships') or {},
-            'type': track.get('type'),
-            'additional': self._format_audio_traits(t_attrs, item_type='songs'),
-        }
+        return self._track_rows.row(
+            track, shared_id, t_attrs,
+            name=t_attrs.get('name') or f'Track {idx}',
+            duration=(dur_ms // 1000) if isinstance(dur_ms, (int, float)) else None,
+            artists=artists_from_apple_attrs(artist_attrs),
+            release_year=release_year,
+            cover_url=self._get_cover_url(t_attrs.get('artwork', {}).get('url')) or fallback_cover,
+            preview_url=previews[0].get('url') if previews else None,
+            additional=self._format_audio_traits(t_attrs, item_type='songs'),
+        )
 
     def get_album_info(self, album_id: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Optional[AlbumInfo]:
         """Get album information (catalog works without cookies; download requires credentials)."""
@@ -2247,14 +3474,17 @@ class ModuleInterface:
                 record_label = _label_from_copyright(copyright_info)
 
             # Use full track data from the album response to avoid N get_track_info calls in the GUI
+            shared_id = self._track_rows.shared(
+                {'recordLabel': record_label, 'copyright': copyright_info, 'upc': upc},
+                album_artist, release_year, cover_url,
+            )
             tracks_out = [
-                self._track_row(
-                    track, idx, album_artist, release_year, cover_url,
-                    inherit_attrs={'recordLabel': record_label, 'copyright': copyright_info, 'upc': upc},
-                )
+                self._track_row(track, idx, album_artist, release_year, cover_url, shared_id=shared_id)
                 for idx, track in enumerate((tracks_rel or {}).get('data', []), start=1)
             ]
 
+            self._maybe_prefetch_lyrics(tracks_out, country=country)
+
             # Extract artist ID from relationships
             artist_rels = (album_data.get('relationships') or {}).get('artists', {}).get('data', [])
             artist_id = artist_rels[0].get('id', '') if artist_rels else ''
@@ -2275,6 +3505,7 @@ class ModuleInterface:
                 track_extra_kwargs={
                     **kwargs,
                     'country': country,
+                    'job_id': self._listing_job(kwargs, f'album:{album_id}'),
                     'album_release_date': album_release_date,
                     'album_artist': album_artist,
                 },
@@ -2309,9 +3540,6 @@ class ModuleInterface:
             playlist_data = _first(playlist_data)
 
             tracks_rel = (playlist_data.get('relationships') or {}).get('tracks')
-            if tracks_rel:
-                self._extend_paged_tracks(tracks_rel)
-
             attrs = playlist_data['attributes']
             if 'url' in attrs:
                 attrs['url'] = self._localize_url(attrs['url'])
@@ -2321,10 +3549,23 @@ class ModuleInterface:
             creator = attrs.get('curatorName', 'Unknown Creator')
 
             # Use full track data from the playlist response to avoid N get_track_info calls in the GUI
-            tracks_out = [
-                self._track_row(track, idx, creator, release_year, cover_url)
-                for idx, track in enumerate((tracks_rel or {}).get('data', []), start=1)
-            ]
+            shared_id = self._track_rows.shared(None, creator, release_year, cover_url)
+
+            def make_rows(raw_tracks, start):
+                return [self._track_row(track, idx, creator, release_year, cover_url, shared_id=shared_id)
+                        for idx, track in enumerate(raw_tracks, start=start)]
+
+            lazy = kwargs.get('lazy', self.settings.get('lazy_playlists', False))
+            if lazy and tracks_rel and tracks_rel.get('next') and hasattr(self.apple_music_api, 'get_extended_api_data'):
+                # Return after the first page; the rest is fetched while the caller reads
+                first_rows = make_rows(tracks_rel.get('data') or [], 1)
+                tracks_out = self._lazy_track_rows(tracks_rel, first_rows, make_rows, attrs, country)
+                self._maybe_prefetch_lyrics(first_rows, country=country)
+            else:
+                if tracks_rel:
+                    self._extend_paged_tracks(tracks_rel)
+                tracks_out = make_rows((tracks_rel or {}).get('data', []), 1)
+                self._maybe_prefetch_lyrics(tracks_out, country=country)
 
             return PlaylistInfo(
                 name=attrs.get('name', 'Unknown Playlist'),
@@ -2332,7 +3573,8 @@ class ModuleInterface:
                 release_year=release_year,
                 tracks=tracks_out,
                 cover_url=cover_url,
-                track_extra_kwargs={**kwargs, 'country': country}
+                track_extra_kwargs={**kwargs, 'country': country,
+                                    'job_id': self._listing_job(kwargs, f'playlist:{playlist_id}')}
             )
 
         except Exception as e:
@@ -2434,27 +3676,28 @@ class ModuleInterface:
         # Batch fetch missing durations for albums
         albums_to_fetch = [idx for idx, t in enumerate(albums_out) if isinstance(t, dict) and not t.get('duration')]
         if albums_to_fetch:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                fetch_ids = [albums_out[idx]['id'] for idx in albums_to_fetch]
-                for aid, dur in executor.map(self._fetch_am_album_duration, fetch_ids):
-                    if dur:
-                        for idx in albums_to_fetch:
-                            if albums_out[idx]['id'] == aid:
-                                albums_out[idx]['duration'] = dur
-
+            fetch_ids = [albums_out[idx]['id'] for idx in albums_to_fetch]
+            for aid, dur in self._fan_out(self._fetch_am_album_duration, fetch_ids):
+                if dur:
+                    for idx in albums_to_fetch:
+                        if albums_out[idx]['id'] == aid:
+                            albums_out[idx]['duration'] = dur
+
+        # Downloads of the artist's albums and tracks are cancelled together (cancel_job)
+        artist_job = self._listing_job(kwargs, f'artist:{artist_id}')
         return ArtistInfo(
             name=artist_name,
             artist_id=artist_id,
             albums=albums_out,
-            album_extra_kwargs={**kwargs, 'country': country},
+            album_extra_kwargs={**kwargs, 'country': country, 'job_id': artist_job},
             tracks=tracks_out,
-            track_extra_kwargs={**kwargs, 'country': country}
+            track_extra_kwargs={**kwargs, 'country': country, 'job_id': artist_job}
         )
 
     def _fetch_am_playlist_meta(self, pid):
         """(track_count, total_duration_seconds) for a playlist — search backfill."""
         try:
-            item = _first(self._run_async(lambda s: s.apple_music_api.get_playlist(pid)))
+            item = _first(self._run_async(lambda s: s.apple_music_api.get_playlist(pid), priority=BACKGROUND))
             if isinstance(item, dict):
                 attrs = item.get('attributes', {})
                 tc = attrs.get('trackCount')
@@ -2476,7 +3719,8 @@ class ModuleInterface:
     def _fetch_am_album_duration(self, aid, storefront=None):
         """Total duration in seconds of an album's tracks — search/artist backfill."""
         try:
-            item = _first(self._run_async(lambda s: s.apple_music_api.get_album(aid), storefront=storefront))
+            item = _first(self._run_async(lambda s: s.apple_music_api.get_album(aid), storefront=storefront,
+                                          priority=BACKGROUND))
             if isinstance(item, dict):
                 rel_tracks = (item.get('relationships') or {}).get('tracks', {}).get('data', [])
                 if rel_tracks:
@@ -2494,20 +3738,19 @@ class ModuleInterface:
         # Matches any 2-letter country code following music.apple.com/
         return re.sub(r'music\.apple\.com/[a-z]{2}/', f'music.apple.com/{self.account_storefront}/', url)
 
-    def _get_cover_url(self, artwork_template):
-        """Build a full cover URL from a template"""
-        if not artwork_template:
-            return None
-
+    def _cover_resolution(self) -> int:
+        """Cover resolution from global settings, default 1400."""
         try:
-            # Get resolution from global settings, default to 1400
-            res = self.module_controller.orpheus_options.default_cover_options.resolution
+            return int(self.module_controller.orpheus_options.default_cover_options.resolution)
         except Exception as e:
             if getattr(self, '_debug', False): print(f"[Apple Music Error] Failed to get resolution from settings: {e}. Falling back to 1400.")
-            res = 1400
+            return 1400
 
-        # Replace template markers with resolution
-        return artwork_template.replace('{w}', str(res)).replace('{h}', str(res))
+    def _get_cover_url(self, artwork_template):
+        """Build a full cover URL from a template"""
+        if not artwork_template:
+            return None
+        return format_artwork_url(artwork_template, self._cover_resolution())
 
     def _album_quality_label_from_attrs(self, attrs) -> Optional[str]:
         """Short quality label for album folder names (discography disambiguation)."""
@@ -2642,7 +3885,7 @@ class ModuleInterface:
             return None
 
         # Run in our background event loop
-        result = self._run_async(lambda s: _fetch_manifest())
+        result = self._run_async(lambda s: _fetch_manifest(), priority=BACKGROUND)
         if result and len(cache) < 200:
             cache[cache_key] = result
         return result
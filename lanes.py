@@ -0,0 +1,125 @@
+"""Event loop lanes: interactive calls and bulk downloads on separate loops.
+
+Everything used to run on the one AppleMusicLoop thread, so a download whose
+blocking steps (gamdl's staged-to-final move, wrapper restarts, large file
+checks) held the loop made search and album browsing in the GUI stall with
+it. Calls now run on one of two lanes, each its own loop thread:
+
+  * interactive ('AppleMusicLoop'): search, album/playlist/artist info,
+    track info, lyrics;
+  * bulk ('AppleMusicBulkLoop'): get_track_download, started on first use.
+
+Async HTTP clients and async-lru caches belong to the loop they were first
+used on, so every lane has its own API clients (and pool account / wrapper
+endpoint clients); LaneLocal attributes hold one value per lane. The lane of
+the running code is the lane of the current thread; code outside the loop
+threads sees the interactive lane unless it is inside in_lane(). Everything
+that isn't loop-bound (caches, archive, telemetry, settings) stays shared.
+"""
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+# Thread ident -> lane name, for the loop threads and in_lane() blocks
+_thread_lanes = {}
+
+
+def current_lane() -> str:
+    """Name of the lane the calling thread belongs to (interactive outside the loop threads)."""
+    return _thread_lanes.get(threading.get_ident(), INTERACTIVE)
+
+
+@contextmanager
+def in_lane(name: str):
+    """Resolve LaneLocal attributes of the given lane in this thread for the duration of the block."""
+    ident = threading.get_ident()
+    previous = _thread_lanes.get(ident)
+    _thread_lanes[ident] = name
+    try:
+        yield
+    finally:
+        if previous is None:
+            _thread_lanes.pop(ident, None)
+        else:
+            _thread_lanes[ident] = previous
+
+
+class LaneLocal:
+    """Instance attribute with one value per lane (for loop-bound clients); unset values read as default."""
+
+    def __init__(self, default_factory: Callable = None):
+        self.default_factory = default_factory
+
+    def __set_name__(self, owner, name):
+        self.key = f'_lanes_{name}'
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        values = obj.__dict__.setdefault(self.key, {})
+        lane = current_lane()
+        if lane not in values:
+            if self.default_factory is None:
+                return None
+            values[lane] = self.default_factory()
+        return values[lane]
+
+    def __set__(self, obj, value):
+        obj.__dict__.setdefault(self.key, {})[current_lane()] = value
+
+
+class Lane:
+    """One lane's event loop and the daemon thread running it."""
+
+    def __init__(self, name: str, thread_name: str):
+        self.name = name
+        self.thread_name = thread_name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.starts = 0
+
+    def healthy(self) -> bool:
+        return bool(self.thread and self.thread.is_alive() and self.loop and not self.loop.is_closed())
+
+    def owns_current_thread(self) -> bool:
+        return self.thread is not None and threading.current_thread() is self.thread
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """Start the loop thread; False if it didn't come up within timeout."""
+        self.starts += 1
+        self.ready.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name=self.thread_name)
+        self.thread.start()
+        return self.ready.wait(timeout)
+
+    def _run(self) -> None:
+        _thread_lanes[threading.get_ident()] = self.name
+        try:
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.ready.set()
+            self.loop.run_forever()
+        except Exception as e:
+            print(f"[Apple Music Error] {self.thread_name} thread crashed: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.ready.clear()
+            _thread_lanes.pop(threading.get_ident(), None)
+
+    def stop(self) -> None:
+        """Stop the loop (the thread exits) and forget it, so the next start() makes a new one."""
+        if self.loop:
+            try:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+            except RuntimeError:
+                pass
+        self.loop = None
+
+    def stats(self) -> dict:
+        return {'running': self.healthy(), 'starts': self.starts}
@@ -0,0 +1,176 @@
+"""Incremental library mirror: download only what was added to the library since the last run.
+
+The module already resolves library IDs (l. albums, p. playlists, long
+non-numeric song IDs) to their catalog counterparts, but there was no way to
+keep a whole library in sync short of re-walking it. The mirror keeps a
+snapshot of the account's library in SQLite, with one row per library item
+holding its catalog ID and whether it was synced. Each run:
+
+  1. pages through the library (songs by default; also albums and playlists),
+     100 items per request with the catalog relationship included. After the
+     first page, the remaining pages are fetched in parallel;
+  2. diffs the listing against the snapshot. New items are added as pending,
+     and items no longer in the library are dropped from it (their files
+     stay);
+  3. hands every pending item to the download farm, and marks an item synced
+     once it was downloaded or found in the download archive. An album or
+     playlist is marked synced once it was expanded in a run without
+     failures. Failed items stay pending for the next run.
+
+A nightly run on an unchanged library is one listing walk and no downloads:
+
+    python -m modules.applemusic.library mirror --output ./Library --workers 2
+"""
+import argparse
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+KINDS = ('songs', 'albums', 'playlists')
+# Largest page the library endpoints serve
+PAGE_SIZE = 100
+# Farm task kind per library kind
+_TARGET_KINDS = {'songs': 'track', 'albums': 'album', 'playlists': 'playlist'}
+
+
+class LibraryDelta(NamedTuple):
+    kind: str
+    total: int
+    added: List[Tuple[str, Optional[str]]]
+    removed: List[str]
+    # (library_id, catalog_id) still to download: the new ones and earlier failures
+    pending: List[Tuple[str, Optional[str]]]
+
+
+def catalog_id_of(item: dict) -> Optional[str]:
+    """Catalog ID of a library item (from its included catalog relationship), if it has one."""
+    related = ((item.get('relationships') or {}).get('catalog') or {}).get('data') or []
+    if related and related[0].get('id'):
+        return str(related[0]['id'])
+    # Library playlists that follow a catalog playlist carry its global ID
+    global_id = (item.get('attributes') or {}).get('playParams', {}).get('globalId')
+    return str(global_id) if global_id else None
+
+
+def target_for(kind: str, library_id: str, catalog_id: Optional[str]) -> str:
+    """Farm target for a library item: the catalog ID when there is one, else the library ID."""
+    return f"{_TARGET_KINDS[kind]}:{catalog_id or library_id}"
+
+
+class LibrarySnapshot:
+    """SQLite snapshot of a library: library ID -> catalog ID and sync state (thread-safe)."""
+
+    def __init__(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS items (kind TEXT NOT NULL, library_id TEXT NOT NULL, catalog_id TEXT, '
+                'added_at REAL NOT NULL, synced_at REAL, PRIMARY KEY (kind, library_id))'
+            )
+
+    def diff(self, kind: str, items: Dict[str, Optional[str]]) -> LibraryDelta:
+        """Store the current listing of a kind and return what changed since the last one."""
+        now = time.time()
+        with self._lock, self._db:
+            known = {row[0]: row[1] for row in self._db.execute(
+                'SELECT library_id, catalog_id FROM items WHERE kind = ?', (kind,))}
+            added = [(library_id, catalog_id) for library_id, catalog_id in items.items() if library_id not in known]
+            removed = [library_id for library_id in known if library_id not in items]
+            self._db.executemany(
+                'INSERT INTO items (kind, library_id, catalog_id, added_at, synced_at) VALUES (?, ?, ?, ?, NULL)',
+                [(kind, library_id, catalog_id, now) for library_id, catalog_id in added],
+            )
+            # A catalog mapping can appear later (e.g. once a purchase is matched)
+            self._db.executemany(
+                'UPDATE items SET catalog_id = ? WHERE kind = ? AND library_id = ?',
+                [(catalog_id, kind, library_id) for library_id, catalog_id in items.items()
+                 if library_id in known and catalog_id and known[library_id] != catalog_id],
+            )
+            self._db.executemany('DELETE FROM items WHERE kind = ? AND library_id = ?',
+                                 [(kind, library_id) for library_id in removed])
+            pending = self._db.execute(
+                'SELECT library_id, catalog_id FROM items WHERE kind = ? AND synced_at IS NULL ORDER BY added_at',
+                (kind,),
+            ).fetchall()
+        return LibraryDelta(kind, len(items), added, removed, [tuple(row) for row in pending])
+
+    def mark_synced(self, kind: str, library_ids) -> None:
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany('UPDATE items SET synced_at = ? WHERE kind = ? AND library_id = ?',
+                                 [(now, kind, library_id) for library_id in library_ids])
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT kind, COUNT(*), COUNT(synced_at) FROM items GROUP BY kind').fetchall()
+        return {kind: {'items': count, 'synced': synced} for kind, count, synced in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def mirror(args) -> int:
+    from .farm import Supervisor, create_module, load_module_settings, worker_options
+
+    kinds = [kind.strip() for kind in args.kinds.split(',') if kind.strip()]
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        print(f"[Apple Music Error] Unknown library kinds: {', '.join(unknown)} (use {', '.join(KINDS)})")
+        return 2
+    settings = load_module_settings(args.settings)
+    module = create_module(settings)
+    deltas = module.library_delta(kinds)
+
+    # Farm target -> the library items it syncs (a song can be in the library twice)
+    owners = {}
+    for kind, delta in deltas.items():
+        print(f"[Apple Music] Library {kind}: {delta.total} items, {len(delta.added)} new, "
+              f"{len(delta.removed)} removed, {len(delta.pending)} to download")
+        for library_id, catalog_id in delta.pending:
+            owners.setdefault(target_for(kind, library_id, catalog_id), []).append((kind, library_id))
+    if args.dry_run or not owners:
+        return 0
+
+    supervisor = Supervisor(settings, args.workers, worker_options(args), args.rate, args.burst)
+    try:
+        code = supervisor.run(list(owners))
+    finally:
+        supervisor.close()
+
+    finished = {key for key, _ in supervisor.done} | set(supervisor.skipped)
+    if not supervisor.failed and not supervisor.outstanding:
+        finished |= set(supervisor.expanded)
+    synced = {}
+    for key, owned in owners.items():
+        if key in finished:
+            for kind, library_id in owned:
+                synced.setdefault(kind, []).append(library_id)
+    for kind, library_ids in synced.items():
+        module.mark_library_synced(kind, library_ids)
+    return code
+
+
+def main(argv=None) -> int:
+    from .farm import add_options
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    mirror_parser = commands.add_parser('mirror', help="Download what was added to the library since the last run")
+    mirror_parser.add_argument('--kinds', default='songs', help=f"Comma-separated: {', '.join(KINDS)}")
+    mirror_parser.add_argument('--dry-run', action='store_true', help="Only update the snapshot and show the delta")
+    add_options(mirror_parser)
+    args = parser.parse_args(argv)
+    return mirror(args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Persistent lyrics cache keyed by (song id, storefront, language).
+
+Both the synced (LRC) and unsynced variants are stored together. Songs without
+lyrics are cached too (as an entry with both variants empty) so they aren't
+re-requested on every run. Entries expire after a configurable TTL.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class CachedLyrics(NamedTuple):
+    synced: Optional[str]
+    unsynced: Optional[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.synced or self.unsynced)
+
+
+NO_LYRICS = CachedLyrics(None, None)
+
+
+class LyricsCache:
+    """SQLite-backed lyrics cache (thread-safe, shareable between processes)."""
+
+    def __init__(self, root, ttl_seconds: float = 7 * 24 * 3600):
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = float(ttl_seconds)
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(root / 'lyrics.sqlite3'), check_same_thread=False, timeout=30)
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS lyrics (song_id TEXT NOT NULL, storefront TEXT NOT NULL, '
+                'language TEXT NOT NULL, synced TEXT, unsynced TEXT, fetched_at REAL NOT NULL, '
+                'PRIMARY KEY (song_id, storefront, language))'
+            )
+            self._db.execute('DELETE FROM lyrics WHERE fetched_at < ?', (time.time() - self.ttl_seconds,))
+
+    def get(self, song_id: str, storefront: str, language: str) -> Optional[CachedLyrics]:
+        """Cached lyrics (possibly NO_LYRICS), or None on a miss/expired entry."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT synced, unsynced, fetched_at FROM lyrics WHERE song_id = ? AND storefront = ? AND language = ?',
+                (str(song_id), (storefront or '').lower(), language or ''),
+            ).fetchone()
+        if not row or time.time() - row[2] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedLyrics(row[0], row[1])
+
+    def put(self, song_id: str, storefront: str, language: str, lyrics: CachedLyrics) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO lyrics (song_id, storefront, language, synced, unsynced, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (str(song_id), (storefront or '').lower(), language or '', lyrics.synced, lyrics.unsynced, time.time()),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM lyrics').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,126 @@
+"""Bounded executor for post-processing jobs (decrypt/remux and tagging).
+
+gamdl runs its Rust decrypt+remux engine and mutagen tagging through
+asyncio.to_thread, i.e. the event loop's default executor, which is shared
+with DNS lookups and every other to_thread call and is sized for I/O rather
+than for CPU work. Album and playlist downloads can then pile up a dozen
+remux/tag jobs at once and starve metadata work on AppleMusicLoop.
+
+PostProcessPool runs these jobs on their own small pool with a fixed number
+of workers (postprocess_workers), so at most that many run at once and the
+rest wait in its queue. In 'process' mode, jobs whose function can be
+pickled (the Rust engine entry points) run in worker processes instead;
+jobs bound to gamdl objects (tagging) always run on the threads. Queue wait
+and job time of every job are recorded as 'postprocess.<kind>' calls in the
+telemetry (see get_stats()['calls']).
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+_MODES = ('thread', 'process')
+
+
+def default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+class PostProcessPool:
+    """Fixed-size pool for CPU-bound post-processing, with queue depth and job timings."""
+
+    def __init__(self, workers: int = None, mode: str = 'thread', telemetry=None):
+        self.workers = max(1, int(workers or default_workers()))
+        self.mode = mode if mode in _MODES else 'thread'
+        self.telemetry = telemetry
+        self._lock = threading.Lock()
+        self._threads = None
+        self._processes = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='AppleMusicPost')
+            return self._threads
+
+    def _process_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._processes is None and self.mode == 'process':
+                try:
+                    self._processes = ProcessPoolExecutor(max_workers=self.workers)
+                except (OSError, NotImplementedError) as e:
+                    print(f"[Apple Music Warning] Post-processing worker processes unavailable, using threads: {e}")
+                    self.mode = 'thread'
+            return self._processes
+
+    async def run(self, kind: str, func: Callable, *args, picklable: bool = False):
+        """Run func(*args) on the pool and await its result.
+
+        kind names the job in stats ('remux', 'tagging'); picklable jobs go to
+        a worker process in 'process' mode.
+        """
+        processes = self._process_executor() if picklable else None
+        submitted = time.perf_counter()
+        timing = {}
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        def job():
+            with self._lock:
+                if timing.get('abandoned'):
+                    return None
+                timing['started'] = time.perf_counter()
+                self.queued -= 1
+                self.running += 1
+            # The pool thread holds its slot while the worker process runs the job,
+            # so the worker count bounds both modes alike
+            if processes is not None:
+                return processes.submit(func, *args).result()
+            return func(*args)
+
+        ok = False
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor(), job)
+            ok = True
+            return result
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                started = timing.get('started')
+                if started is None:
+                    # Cancelled before a worker picked it up
+                    timing['abandoned'] = True
+                    self.queued -= 1
+                else:
+                    self.running -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            if self.telemetry is not None:
+                queue_wait = (started or finished) - submitted
+                self.telemetry.observe_call(f"postprocess.{kind}", queue_wait,
+                                            finished - started if started else 0.0, ok=ok)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+        for executor in (threads, processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers, 'mode': self.mode, 'queued': self.queued, 'running': self.running,
+                'max_queued': self.max_queued, 'completed': self.completed, 'failed': self.failed,
+            }
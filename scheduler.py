@@ -0,0 +1,158 @@
+"""Priority admission for _run_async calls.
+
+Interactive calls (search, album/playlist browsing), bulk calls (track info,
+lyrics and downloads for the tracks being downloaded) and background calls
+(duration backfills, manifest probes, lazy playlist pages) used to get the
+loop, the connections and the rate budget first-come, first-served, so a
+2,000-track backlog made every search wait behind it.
+
+Every _run_async API call now takes a slot from a CallScheduler first.
+Each priority class has its own concurrency limit, and all of them share one
+total. On top of the total, `reserve` slots are kept for interactive calls
+alone, so bulk and background work can never fill the pool: whatever they
+hold, and however far the total shrinks, an interactive call finds a slot.
+Whole downloads (get_track_download) hold the bulk loop for minutes and
+aren't admitted here at all; their own API calls run inside them. The total,
+and with it the bulk and background limits, follows the adaptive concurrency
+limit (concurrency.py); the interactive limit and reserve stay fixed, so a
+run of 429s throttles bulk work without starving interactive calls. When
+slots are contended, waiting calls are admitted in priority order, except that a call
+that has waited longer than max_wait goes first whatever its class
+(starvation protection). Admission happens in the calling thread, before the
+call is handed to a loop; a call whose deadline (deadlines.py) passes while it
+waits gives up instead of being admitted late.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+BACKGROUND = 'background'
+# Highest priority first
+PRIORITIES = (INTERACTIVE, BULK, BACKGROUND)
+# Not admitted by the scheduler: whole downloads
+DOWNLOAD = 'download'
+
+
+class _Waiter:
+    __slots__ = ('priority', 'since')
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.since = time.monotonic()
+
+
+class CallScheduler:
+    """Per-class concurrency limits under a shared total, priority order with aging (thread-safe)."""
+
+    def __init__(self, total: int = 10, limits: Optional[Dict[str, int]] = None, max_wait: float = 5.0,
+                 reserve: int = 2):
+        # Explicit class limits; the others follow the total
+        self._fixed = {k: max(1, int(v)) for k, v in (limits or {}).items() if k in PRIORITIES}
+        self.max_wait = float(max_wait)
+        # Slots beyond the total that only interactive calls may use
+        self.reserve = max(1, int(reserve))
+        # Fixed share: the adaptive limit doesn't move it
+        self.interactive_limit = self._fixed.get(INTERACTIVE, max(1, int(total)) + self.reserve)
+        self._cond = threading.Condition()
+        self._apply_total(total)
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._admitted = dict.fromkeys(PRIORITIES, 0)
+        self._waited = dict.fromkeys(PRIORITIES, 0.0)
+        self._max_waited = dict.fromkeys(PRIORITIES, 0.0)
+        # Calls admitted only after waiting past max_wait
+        self.overdue = 0
+        # Calls that gave up waiting (their deadline passed)
+        self.timed_out = 0
+
+    def _apply_total(self, total: int) -> None:
+        self.total = max(1, int(total))
+        self.limits = {
+            INTERACTIVE: self.interactive_limit,
+            BULK: max(1, self.total * 6 // 10),
+            BACKGROUND: max(1, self.total // 5),
+            **self._fixed,
+        }
+
+    def set_total(self, total: int) -> None:
+        """Resize the shared total (the adaptive limit moved); the bulk and background limits follow it."""
+        with self._cond:
+            self._apply_total(total)
+            self._cond.notify_all()
+
+    def _has_room(self, priority: str) -> bool:
+        if self._running[priority] >= self.limits[priority]:
+            return False
+        interactive = self._running[INTERACTIVE]
+        if priority == INTERACTIVE and interactive < self.reserve:
+            return True
+        # Interactive calls count against the total only beyond their reserve
+        shared = sum(self._running.values()) - min(interactive, self.reserve)
+        return shared < self.total
+
+    def _next(self) -> Optional[_Waiter]:
+        """The waiter to admit next: an overdue one (oldest first), else the highest-priority one."""
+        now = time.monotonic()
+        heads = [self._queues[p][0] for p in PRIORITIES if self._queues[p] and self._has_room(p)]
+        if not heads:
+            return None
+        overdue = [w for w in heads if now - w.since >= self.max_wait]
+        if overdue:
+            return min(overdue, key=lambda w: w.since)
+        return heads[0]
+
+    def acquire(self, priority: str, timeout: Optional[float] = None) -> float:
+        """Block until the call may run; returns the seconds it waited.
+
+        Raises TimeoutError if no slot came free within timeout seconds.
+        """
+        if priority not in self._queues:
+            priority = INTERACTIVE
+        waiter = _Waiter(priority)
+        give_up = None if timeout is None else waiter.since + max(0.0, timeout)
+        with self._cond:
+            self._queues[priority].append(waiter)
+            while self._next() is not waiter:
+                # Wake up in time to notice when a waiter becomes overdue
+                wait = self.max_wait
+                if give_up is not None:
+                    wait = give_up - time.monotonic()
+                    if wait <= 0:
+                        self._queues[priority].remove(waiter)
+                        self.timed_out += 1
+                        self._cond.notify_all()
+                        raise TimeoutError(f"no {priority} slot came free within {timeout:.1f}s")
+                    wait = min(wait, self.max_wait)
+                self._cond.wait(wait)
+            self._queues[priority].popleft()
+            waited = time.monotonic() - waiter.since
+            if waited >= self.max_wait:
+                self.overdue += 1
+            self._running[priority] += 1
+            self._admitted[priority] += 1
+            self._waited[priority] += waited
+            self._max_waited[priority] = max(self._max_waited[priority], waited)
+            # The next head may fit as well
+            self._cond.notify_all()
+        return waited
+
+    def release(self, priority: str) -> None:
+        if priority not in self._running:
+            priority = INTERACTIVE
+        with self._cond:
+            self._running[priority] = max(0, self._running[priority] - 1)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'total': self.total, 'reserve': self.reserve, 'overdue': self.overdue, 'timed_out': self.timed_out,
+                'classes': {p: {
+                    'limit': self.limits[p], 'running': self._running[p], 'waiting': len(self._queues[p]),
+                    'admitted': self._admitted[p], 'wait_seconds': round(self._waited[p], 3),
+                    'max_wait_seconds': round(self._max_waited[p], 3),
+                } for p in PRIORITIES},
+            }
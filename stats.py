@@ -0,0 +1,346 @@
+"""Per-stage timing telemetry for track info and download operations.
+
+Each operation (one get_track_info or one download) is a record holding the
+time spent in each named stage plus counters such as bytes and retries. Stage
+durations are also kept as rolling samples for p50/p95 summaries. Finished
+records can be appended to a JSON-lines file, and the aggregate can be written
+as a Prometheus text-format file (for node_exporter's textfile collector). That
+file is rewritten at most every prometheus_interval seconds, plus once at exit.
+
+The current record lives in a context variable, so spans opened in nested
+coroutines (and tasks they spawn) attach to the operation that started them.
+
+Calls dispatched to the background event loop (_run_async) are tracked
+separately per callable: latency histograms for the time spent queued and
+running, error counts, and a bounded log of calls slower than a threshold.
+"""
+import atexit
+import contextvars
+import json
+import math
+import os
+import reprlib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+_current_record = contextvars.ContextVar('applemusic_stats_record', default=None)
+
+_METRIC_PREFIX = 'applemusic'
+_QUANTILES = (0.5, 0.95)
+# Histogram upper bounds in seconds (Prometheus 'le' buckets; +Inf is implicit)
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 1200.0)
+
+_arg_repr = reprlib.Repr()
+_arg_repr.maxstring = 120
+_arg_repr.maxother = 120
+
+
+def percentile(sorted_samples, q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence (None if empty)."""
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(q * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def call_name(func) -> str:
+    """Readable label for a callable, e.g. 'get_album_info.<lambda>' for a lambda defined there."""
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None) or type(func).__name__
+    name = name.replace('.<locals>', '')
+    return name.split('.', 1)[1] if name.startswith('ModuleInterface.') else name
+
+
+def call_arguments(func, args=()) -> dict:
+    """Short reprs of a call's positional args and of the values a lambda closes over.
+
+    _run_async callers pass lambdas (`lambda s: s.apple_music_api.get_song(track_id)`),
+    so the interesting arguments are the closure's free variables.
+    """
+    arguments = {f"arg{i}": _arg_repr.repr(value) for i, value in enumerate(args)}
+    code = getattr(func, '__code__', None)
+    for name, cell in zip(code.co_freevars if code else (), getattr(func, '__closure__', None) or ()):
+        try:
+            value = cell.cell_contents
+        except ValueError:  # not bound yet
+            continue
+        if name in ('self', 's') or callable(value):
+            continue
+        arguments[name] = _arg_repr.repr(value)
+    return arguments
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cheap to update, mergeable, exportable)."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = 0
+        while index < len(_BUCKETS) and seconds > _BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate from the buckets, interpolating linearly inside the matching one."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = _BUCKETS[index - 1] if index else 0.0
+                upper = _BUCKETS[index] if index < len(_BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {'count': self.count, 'total': self.total, 'p50': self.quantile(0.5), 'p95': self.quantile(0.95),
+                'max': self.max}
+
+
+class OperationRecord:
+    """Timings and counters of one operation (one track's info fetch or download)."""
+
+    __slots__ = ('kind', 'track_id', 'started', 'duration', 'status', 'stages', 'counters')
+
+    def __init__(self, kind: str, track_id: Optional[str]):
+        self.kind = kind
+        self.track_id = track_id
+        self.started = time.time()
+        self.duration = None
+        self.status = 'ok'
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            'kind': self.kind, 'track_id': self.track_id, 'started': round(self.started, 3),
+            'duration': round(self.duration, 6) if self.duration is not None else None, 'status': self.status,
+            'stages': {k: round(v, 6) for k, v in self.stages.items()}, 'counters': dict(self.counters),
+        }
+
+
+class Telemetry:
+    """Thread-safe collector of stage timings and counters."""
+
+    def __init__(self, jsonl_path=None, prometheus_path=None, max_samples: int = 10000,
+                 slow_call_seconds: float = 5.0, slow_call_log_path=None, max_slow_calls: int = 200,
+                 prometheus_interval: float = 15.0, labels: Optional[Dict[str, str]] = None):
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.prometheus_interval = max(0.0, float(prometheus_interval))
+        # Constant labels on every Prometheus sample (e.g. worker="farm-1")
+        self.labels = dict(labels or {})
+        # monotonic time of the last Prometheus write; dirty while finished operations aren't in it
+        self._prometheus_written = 0.0
+        self._prometheus_dirty = False
+        self.max_samples = max(1, int(max_samples))
+        self.slow_call_seconds = float(slow_call_seconds)
+        self.slow_call_log_path = Path(slow_call_log_path) if slow_call_log_path else None
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._totals: Dict[str, list] = {}
+        self._counters: Dict[str, int] = {}
+        # call name -> {'run': Histogram, 'queue': Histogram, 'errors': int}
+        self._calls: Dict[str, dict] = {}
+        self._slow_calls = deque(maxlen=max(1, int(max_slow_calls)))
+        if self.slow_call_log_path:
+            self.slow_call_log_path.parent.mkdir(parents=True, exist_ok=True)
+        for path in (self.jsonl_path, self.prometheus_path):
+            if path:
+                path.parent.mkdir(parents=True, exist_ok=True)
+        if self.prometheus_path:
+            # Whatever finished since the last throttled write still lands in the file
+            atexit.register(self.flush)
+
+    def _observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+                self._totals[stage] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    @contextmanager
+    def operation(self, kind: str, track_id=None):
+        """Time one operation; spans and counters inside it are attached to its record."""
+        record = OperationRecord(kind, str(track_id) if track_id is not None else None)
+        token = _current_record.set(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.status = 'error'
+            raise
+        finally:
+            _current_record.reset(token)
+            record.duration = time.perf_counter() - start
+            self._observe(kind, record.duration)
+            self._bump(f"{kind}_{record.status}", 1)
+            self._export(record)
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time one stage; repeated stages within an operation accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._observe(stage, elapsed)
+            record = _current_record.get()
+            if record is not None:
+                record.stages[stage] = record.stages.get(stage, 0.0) + elapsed
+
+    def _bump(self, name: str, value: int) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to a counter globally and on the current operation's record."""
+        self._bump(name, value)
+        record = _current_record.get()
+        if record is not None:
+            record.counters[name] = record.counters.get(name, 0) + value
+
+    def observe_call(self, name: str, queue_wait: float, run_time: float, ok: bool = True, attempt: int = 0,
+                     arguments=None) -> None:
+        """Record one background-loop call; calls slower than slow_call_seconds are logged.
+
+        arguments may be a dict or a zero-argument callable returning one; it is
+        only evaluated for slow calls.
+        """
+        with self._lock:
+            entry = self._calls.get(name)
+            if entry is None:
+                entry = self._calls[name] = {'run': Histogram(), 'queue': Histogram(), 'errors': 0}
+            entry['run'].observe(run_time)
+            entry['queue'].observe(queue_wait)
+            if not ok:
+                entry['errors'] += 1
+        total = queue_wait + run_time
+        if total < self.slow_call_seconds:
+            return
+        slow = {'call': name, 'at': round(time.time(), 3), 'queue_wait': round(queue_wait, 6),
+                'run_time': round(run_time, 6), 'ok': ok, 'attempt': attempt}
+        if arguments is not None:
+            slow['arguments'] = arguments() if callable(arguments) else arguments
+        record = _current_record.get()
+        if record is not None:
+            slow['operation'], slow['track_id'] = record.kind, record.track_id
+        with self._lock:
+            self._slow_calls.append(slow)
+        if self.slow_call_log_path:
+            try:
+                with self._lock, open(self.slow_call_log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(slow, separators=(',', ':')) + "\n")
+            except OSError as e:
+                print(f"[Apple Music Warning] Could not write slow-call log: {e}")
+
+    def call_summary(self) -> dict:
+        """Per-callable run/queue-wait latency (p50/p95 estimated from histograms) and errors."""
+        with self._lock:
+            return {name: {'run': entry['run'].as_dict(), 'queue_wait': entry['queue'].as_dict(),
+                           'errors': entry['errors']}
+                    for name, entry in self._calls.items()}
+
+    def slow_calls(self) -> list:
+        with self._lock:
+            return list(self._slow_calls)
+
+    def summary(self) -> dict:
+        """Per-stage count/total/p50/p95/max (in seconds) and global counters."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+            counters = dict(self._counters)
+        stages = {}
+        for stage, values in samples.items():
+            count, total = totals[stage]
+            stages[stage] = {
+                'count': count, 'total': total,
+                'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95), 'max': values[-1] if values else None,
+            }
+        return {'stages': stages, 'counters': counters}
+
+    def prometheus_text(self) -> str:
+        summary = self.summary()
+        # Constant labels, followed by a comma so each sample's own labels can follow
+        const = ''.join(f'{key}="{value}",' for key, value in self.labels.items())
+        lines = [
+            f"# HELP {_METRIC_PREFIX}_stage_seconds Duration of each timed span, per stage (operations are stages too).",
+            f"# TYPE {_METRIC_PREFIX}_stage_seconds summary",
+        ]
+        for stage, values in sorted(summary['stages'].items()):
+            for q in _QUANTILES:
+                key = 'p50' if q == 0.5 else 'p95'
+                lines.append(f'{_METRIC_PREFIX}_stage_seconds{{{const}stage="{stage}",quantile="{q}"}} {values[key]:.6f}')
+            lines.append(f'{_METRIC_PREFIX}_stage_seconds_sum{{{const}stage="{stage}"}} {values["total"]:.6f}')
+            lines.append(f'{_METRIC_PREFIX}_stage_seconds_count{{{const}stage="{stage}"}} {values["count"]}')
+        with self._lock:
+            calls = {name: (entry['run'], entry['queue']) for name, entry in self._calls.items()}
+        for metric, index in (('call_seconds', 0), ('call_queue_seconds', 1)):
+            if not calls:
+                break
+            lines.append(f"# TYPE {_METRIC_PREFIX}_{metric} histogram")
+            for name, histograms in sorted(calls.items()):
+                histogram = histograms[index]
+                cumulative = 0
+                for bound, bucket_count in zip(_BUCKETS + (float('inf'),), histogram.counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                    lines.append(f'{_METRIC_PREFIX}_{metric}_bucket{{{const}call="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{_METRIC_PREFIX}_{metric}_sum{{{const}call="{name}"}} {histogram.total:.6f}')
+                lines.append(f'{_METRIC_PREFIX}_{metric}_count{{{const}call="{name}"}} {histogram.count}')
+        for name, value in sorted(summary['counters'].items()):
+            metric = f"{_METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{{{const.rstrip(',')}}} {value}" if const else f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _export(self, record: OperationRecord) -> None:
+        try:
+            if self.jsonl_path:
+                line = json.dumps(record.as_dict(), separators=(',', ':'))
+                with self._lock, open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            print(f"[Apple Music Warning] Could not export timing stats: {e}")
+        if self.prometheus_path:
+            with self._lock:
+                self._prometheus_dirty = True
+                due = time.monotonic() - self._prometheus_written >= self.prometheus_interval
+            if due:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the Prometheus file now if anything finished since the last write."""
+        with self._lock:
+            if not self.prometheus_path or not self._prometheus_dirty:
+                return
+            self._prometheus_dirty = False
+            self._prometheus_written = time.monotonic()
+        try:
+            # Written atomically so a scraper never reads a half-written file
+            tmp = self.prometheus_path.with_name(self.prometheus_path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(self.prometheus_text(), encoding='utf-8')
+            tmp.replace(self.prometheus_path)
+        except OSError as e:
+            print(f"[Apple Music Warning] Could not export timing stats: {e}")
@@ -0,0 +1,272 @@
+"""Temp-space manager for gamdl_temp / gamdl_out.
+
+gamdl runs with skip_cleanup=True, so nothing under temp_path was ever
+removed: every download left its gamdl_temp_<uuid> folder (the encrypted
+stream and the decrypted copy) behind, and every delivered file stayed in
+gamdl_out after OrpheusDL had copied it. On a long-running worker both grew
+until the disk filled. TempSpace now:
+
+  * removes a download's gamdl_temp_<uuid> folder as soon as the download
+    ends, whether it worked or not (cached HLS segments stay for resuming);
+  * keeps gamdl_temp + gamdl_out under a byte quota by evicting the least
+    recently used finished artefacts: delivered files first, then the
+    segment caches of abandoned downloads. Nothing a running download uses
+    is touched, and neither is anything written in the last `protect`
+    seconds (OrpheusDL may not have picked the file up yet);
+  * sweeps orphans once at startup: gamdl_temp_<uuid> folders and .part files
+    a crashed run left behind (untouched for orphan_age seconds);
+  * can place the decrypt stage (the gamdl_temp_<uuid> folder) on a
+    RAM-backed filesystem such as /dev/shm, whenever it has at least
+    decrypt_reserve bytes free, so the two full-size intermediate files
+    never hit the disk.
+
+With streaming_decrypt, a download whose folder is in RAM also skips the
+on-disk segment cache, so the stream goes from HTTP into RAM, through the
+decrypt/remux engine (which only works on file paths) into RAM again, and
+the final file in gamdl_out is the only thing written to disk.
+
+Farm workers each have their own temp_path, so the quota applies per worker.
+"""
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Same folder name as gamdl's TEMP_PATH_TEMPLATE
+FOLDER_PREFIX = 'gamdl_temp_'
+
+
+def _tree_size(path: Path) -> int:
+    """Total size of the files under path (0 if it doesn't exist)."""
+    total = 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                total += _tree_size(Path(entry.path))
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return total
+
+
+def _last_used(stat) -> float:
+    return max(stat.st_atime, stat.st_mtime)
+
+
+class TempSpace:
+    """Quota, eviction and orphan sweeping for one temp_path (thread-safe)."""
+
+    def __init__(self, root, quota_bytes: int = 0, decrypt_root=None, decrypt_reserve: int = 1024 * 1024 * 1024,
+                 protect: float = 600.0, orphan_age: float = 3600.0, out_dir=None):
+        self.temp_dir = Path(root) / 'gamdl_temp'
+        # gamdl_out may live elsewhere (delivery_hint_path)
+        self.out_dir = Path(out_dir) if out_dir else Path(root) / 'gamdl_out'
+        self.segment_dir = self.temp_dir / 'segment_cache'
+        self.decrypt_root = Path(decrypt_root) if decrypt_root else None
+        self.quota_bytes = max(0, int(quota_bytes))
+        self.decrypt_reserve = int(decrypt_reserve)
+        self.protect = float(protect)
+        self.orphan_age = float(orphan_age)
+        self._lock = threading.Lock()
+        # folder tag (download item uuid) -> its gamdl_temp_<uuid> folder
+        self._active: Dict[str, Path] = {}
+        # segment-cache folder of a running download -> number of downloads using it
+        self._segments: Dict[Path, int] = {}
+        self.decrypt_in_ram = 0
+        self.decrypt_on_disk = 0
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self.swept_files = 0
+        self.swept_bytes = 0
+        self.over_quota = 0
+
+    def folder(self, folder_tag: str) -> Path:
+        """The temp folder of one download, on the RAM-backed root when it has room."""
+        with self._lock:
+            folder = self._active.get(folder_tag)
+            if folder is not None:
+                return folder
+            root = self.temp_dir
+            if self.decrypt_root is not None:
+                try:
+                    if shutil.disk_usage(self.decrypt_root).free >= self.decrypt_reserve:
+                        root = self.decrypt_root
+                except OSError:
+                    pass
+            if root == self.decrypt_root:
+                self.decrypt_in_ram += 1
+            else:
+                self.decrypt_on_disk += 1
+            folder = self._active[folder_tag] = root / f'{FOLDER_PREFIX}{folder_tag}'
+        return folder
+
+    def finish(self, folder_tag: str) -> None:
+        """The download is over: remove its temp folder."""
+        with self._lock:
+            folder = self._active.pop(folder_tag, None)
+        for candidate in ([folder] if folder else
+                          [root / f'{FOLDER_PREFIX}{folder_tag}' for root in self._roots()]):
+            shutil.rmtree(candidate, ignore_errors=True)
+
+    def hold_segments(self, folder) -> None:
+        """A download is filling this segment-cache folder: keep it out of eviction."""
+        folder = Path(folder)
+        with self._lock:
+            self._segments[folder] = self._segments.get(folder, 0) + 1
+
+    def release_segments(self, folder) -> None:
+        folder = Path(folder)
+        with self._lock:
+            count = self._segments.pop(folder, 0) - 1
+            if count > 0:
+                self._segments[folder] = count
+
+    def in_ram(self, path) -> bool:
+        """Whether path is in a temp folder on the RAM-backed root."""
+        return self.decrypt_root is not None and self.decrypt_root in Path(path).parents
+
+    def _roots(self) -> List[Path]:
+        return [self.temp_dir] + ([self.decrypt_root] if self.decrypt_root else [])
+
+    def _in_use(self) -> set:
+        with self._lock:
+            return set(self._active.values()) | set(self._segments)
+
+    def usage(self) -> dict:
+        """Bytes used by gamdl_temp (segment cache included), gamdl_out and the RAM-backed decrypt folders."""
+        usage = {'temp_bytes': _tree_size(self.temp_dir), 'out_bytes': _tree_size(self.out_dir)}
+        if self.decrypt_root is not None:
+            usage['decrypt_bytes'] = sum(_tree_size(Path(entry.path)) for entry in self._scan(self.decrypt_root)
+                                         if entry.name.startswith(FOLDER_PREFIX))
+        return usage
+
+    @staticmethod
+    def _scan(path: Path) -> list:
+        try:
+            return list(os.scandir(path))
+        except OSError:
+            return []
+
+    def _candidates(self) -> List[Tuple[float, Path, int]]:
+        """Evictable (last_used, path, bytes): delivered files, then abandoned segment caches and temp folders."""
+        now = time.time()
+        in_use = self._in_use()
+        files, folders = [], []
+        for dirpath, _, filenames in os.walk(self.out_dir):
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime >= self.protect:
+                    files.append((_last_used(stat), path, stat.st_size))
+        for parent in (self.segment_dir, self.temp_dir):
+            for entry in self._scan(parent):
+                path = Path(entry.path)
+                if not entry.is_dir(follow_symlinks=False) or path in in_use or path == self.segment_dir:
+                    continue
+                if parent is self.temp_dir and not entry.name.startswith(FOLDER_PREFIX):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if now - mtime >= self.protect:
+                    folders.append((mtime, path, _tree_size(path)))
+        return sorted(files) + sorted(folders)
+
+    def enforce(self) -> int:
+        """Evict least recently used artefacts until usage fits the quota; returns the bytes freed."""
+        if not self.quota_bytes:
+            return 0
+        used = _tree_size(self.temp_dir) + _tree_size(self.out_dir)
+        if used <= self.quota_bytes:
+            return 0
+        freed = 0
+        for _, path, size in self._candidates():
+            if used - freed <= self.quota_bytes:
+                break
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+                    self._prune_empty(path.parent)
+            except OSError:
+                continue
+            freed += size
+            with self._lock:
+                self.evicted_files += 1
+                self.evicted_bytes += size
+        if used - freed > self.quota_bytes:
+            with self._lock:
+                self.over_quota += 1
+            print(f"[Apple Music Warning] Temp space over quota ({(used - freed) // (1024 * 1024)} MB of "
+                  f"{self.quota_bytes // (1024 * 1024)} MB) with nothing left to evict")
+        return freed
+
+    def _prune_empty(self, folder: Path) -> None:
+        """Remove empty artist/album folders left in gamdl_out by an eviction."""
+        while folder != self.out_dir and self.out_dir in folder.parents:
+            try:
+                folder.rmdir()
+            except OSError:
+                return
+            folder = folder.parent
+
+    def sweep(self) -> int:
+        """Remove temp folders and .part files orphaned by an earlier run; returns the bytes freed."""
+        cutoff = time.time() - self.orphan_age
+        in_use = self._in_use()
+        freed = files = 0
+        for root in self._roots():
+            for entry in self._scan(root):
+                path = Path(entry.path)
+                if not entry.name.startswith(FOLDER_PREFIX) or path in in_use:
+                    continue
+                try:
+                    if entry.stat().st_mtime > cutoff:
+                        continue
+                except OSError:
+                    continue
+                size = _tree_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+                freed += size
+                files += 1
+        for top in (self.temp_dir, self.out_dir):
+            for dirpath, _, filenames in os.walk(top):
+                for name in filenames:
+                    if not name.endswith('.part'):
+                        continue
+                    path = Path(dirpath) / name
+                    try:
+                        stat = path.stat()
+                        if stat.st_mtime > cutoff:
+                            continue
+                        path.unlink()
+                    except OSError:
+                        continue
+                    freed += stat.st_size
+                    files += 1
+        with self._lock:
+            self.swept_files += files
+            self.swept_bytes += freed
+        return freed
+
+    def stats(self) -> dict:
+        usage = self.usage()
+        with self._lock:
+            return {
+                **usage, 'quota_bytes': self.quota_bytes, 'active': len(self._active),
+                'decrypt_in_ram': self.decrypt_in_ram, 'decrypt_on_disk': self.decrypt_on_disk,
+                'evicted_files': self.evicted_files, 'evicted_bytes': self.evicted_bytes,
+                'swept_files': self.swept_files, 'swept_bytes': self.swept_bytes, 'over_quota': self.over_quota,
+            }
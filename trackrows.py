@@ -0,0 +1,303 @@
+"""Compact track rows for AlbumInfo/PlaylistInfo track lists.
+
+A catalog song from the API carries far more than the module reads (editorial
+notes, every asset URL, full relationship payloads). For a 5k-track playlist
+that adds up, and the container-level metadata (label, copyright, UPC, the
+fallback cover) used to be copied into every row.
+
+A row's 'attributes' is a CompactAttributes: a slotted, read-only mapping of
+only the attributes in _ATTR_KEYS, stored as a tuple of values against a
+shared key layout. Repeated values (artwork, genre and trait lists, strings)
+are interned so tracks of the same album share them, and relationships are
+cut down to the related IDs. Container metadata lives once in the store as a
+SharedMetadata entry that rows reference by ID (the row's 'shared' key).
+api_data() expands a row back into the {'id', 'type', 'attributes',
+'relationships'} shape get_track_info and gamdl expect.
+
+Rows themselves stay dicts (TrackRow is a slot-less dict subclass) because
+OrpheusDL and the GUI treat track list entries as plain dicts, and sometimes
+pass them around stringified.
+
+LazyTrackRows is a track list for very large playlists: it holds the first
+page and fetches further pages as the reader gets to them, one page ahead.
+"""
+import sys
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+# Song attributes read by this module or by gamdl from api_response
+_ATTR_KEYS = (
+    'name', 'albumName', 'artistName', 'albumArtistName', 'composerName', 'genreNames', 'releaseDate',
+    'trackNumber', 'discNumber', 'discCount', 'trackCount', 'isrc', 'contentRating', 'durationInMillis',
+    'audioTraits', 'hasLyrics', 'hasTimeSyncedLyrics', 'playParams', 'url', 'artwork', 'extendedAssetUrls',
+    'recordLabel', 'copyright', 'upc', 'isAppleDigitalMaster',
+)
+_RELATIONSHIP_KEYS = ('albums', 'artists', 'catalog')
+# Interned list/dict values are dropped wholesale beyond this many
+_MAX_INTERNED = 50000
+
+
+class TrackRow(dict):
+    """A compact track row (see module docstring); a dict so existing consumers keep working."""
+
+    __slots__ = ()
+
+
+class CompactAttributes(Mapping):
+    """Read-only attributes mapping backed by a shared key layout and a value tuple."""
+
+    __slots__ = ('_keys', '_values', '_related')
+
+    def __init__(self, keys: tuple, values: tuple, related: tuple = ()):
+        self._keys = keys
+        self._values = values
+        # ((relationship, id, type), ...) for api_data()
+        self._related = related
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        # A dict literal, so stringified rows still round-trip through literal_eval
+        return repr(dict(self))
+
+
+class SharedMetadata:
+    """Container-level metadata shared by all rows of one album or playlist."""
+
+    __slots__ = ('attributes', 'default_artist', 'release_year', 'fallback_cover')
+
+    def __init__(self, attributes: dict, default_artist: str, release_year, fallback_cover: Optional[str]):
+        self.attributes = attributes
+        self.default_artist = default_artist
+        self.release_year = release_year
+        self.fallback_cover = fallback_cover
+
+
+class TrackRowStore:
+    """Interning store for compact rows and their shared container metadata (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._layouts = {}
+        self._shared = {}
+        self._shared_ids = {}
+        self._interned = {}
+        self.rows = 0
+
+    def _intern(self, value):
+        if isinstance(value, str):
+            return sys.intern(value)
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            key = ('list',) + tuple(value)
+        elif isinstance(value, dict) and all(isinstance(v, (str, int, float, bool, type(None))) for v in value.values()):
+            key = ('dict',) + tuple(sorted(value.items()))
+        else:
+            return value
+        with self._lock:
+            interned = self._interned.get(key)
+            if interned is None:
+                if len(self._interned) >= _MAX_INTERNED:
+                    self._interned.clear()
+                interned = self._interned[key] = (
+                    [sys.intern(v) for v in value] if isinstance(value, list)
+                    else {sys.intern(k): sys.intern(v) if isinstance(v, str) else v for k, v in value.items()}
+                )
+        return interned
+
+    def shared(self, inherit_attrs: Optional[dict], default_artist: str, release_year,
+               fallback_cover: Optional[str]) -> int:
+        """ID of the SharedMetadata entry for these container values (equal values share an ID)."""
+        attributes = {k: self._intern(v) for k, v in (inherit_attrs or {}).items() if v}
+        key = (tuple(sorted(attributes.items())), default_artist, release_year, fallback_cover)
+        with self._lock:
+            shared_id = self._shared_ids.get(key)
+            if shared_id is None:
+                shared_id = self._shared_ids[key] = len(self._shared) + 1
+                self._shared[shared_id] = SharedMetadata(attributes, default_artist, release_year, fallback_cover)
+        return shared_id
+
+    def get_shared(self, shared_id) -> Optional[SharedMetadata]:
+        with self._lock:
+            return self._shared.get(shared_id)
+
+    def compact_attributes(self, attrs: dict, shared: Optional[SharedMetadata] = None,
+                           relationships: Optional[dict] = None) -> CompactAttributes:
+        """Only the attributes in _ATTR_KEYS, interned; values equal to the shared ones are left out."""
+        keys, values = [], []
+        inherited = shared.attributes if shared else {}
+        for key in _ATTR_KEYS:
+            if key not in attrs:
+                continue
+            value = attrs[key]
+            if key in inherited and inherited[key] == value:
+                continue
+            if key == 'extendedAssetUrls' and isinstance(value, dict):
+                value = {k: v for k, v in value.items() if k == 'enhancedHls'}
+            keys.append(key)
+            values.append(self._intern(value))
+        related = []
+        for kind in _RELATIONSHIP_KEYS:
+            for item in ((relationships or {}).get(kind) or {}).get('data') or ():
+                if isinstance(item, dict) and item.get('id'):
+                    related.append((kind, self._intern(str(item['id'])), self._intern(item.get('type') or '')))
+        keys = tuple(keys)
+        with self._lock:
+            keys = self._layouts.setdefault(keys, keys)
+        return CompactAttributes(keys, tuple(values), tuple(related))
+
+    def row(self, track: dict, shared_id: int, attrs: dict, **fields) -> TrackRow:
+        """Compact row for track (whose attributes were already normalised into attrs)."""
+        shared = self.get_shared(shared_id)
+        row = TrackRow(
+            id=self._intern(track.get('id') or ''),
+            type=self._intern(track.get('type') or 'songs'),
+            shared=shared_id,
+            attributes=self.compact_attributes(attrs, shared, track.get('relationships')),
+        )
+        for key, value in fields.items():
+            row[key] = self._intern(value) if isinstance(value, (str, list)) else value
+        self.rows += 1
+        return row
+
+    def api_data(self, row) -> dict:
+        """Expand a row into the API item shape, with the shared container attributes merged in."""
+        shared = self.get_shared(row.get('shared'))
+        compact = row.get('attributes') or {}
+        attributes = dict(shared.attributes) if shared else {}
+        # Copies, so callers can adjust the expansion without touching interned values
+        for key, value in compact.items():
+            attributes[key] = list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+        relationships = {}
+        for kind, item_id, item_type in getattr(compact, '_related', ()):
+            relationships.setdefault(kind, {'data': []})['data'].append({'id': item_id, 'type': item_type})
+        return {
+            'id': row.get('id', ''),
+            'type': row.get('type') or 'songs',
+            'attributes': attributes,
+            'relationships': relationships or dict(row.get('relationships') or {}),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'rows': self.rows, 'shared': len(self._shared), 'interned': len(self._interned),
+                    'layouts': len(self._layouts)}
+
+
+class LazyTrackRows:
+    """Track list that fetches further pages on demand, prefetching one page ahead of the reader.
+
+    fetch_page(page_ref) blocks and returns (raw_tracks, next_page_ref);
+    make_rows(raw_tracks, start_index) turns a page into rows; on_page(rows) is
+    called for every fetched page. len() is the expected total when known
+    (otherwise it loads everything). A failed page fetch ends the list there.
+    """
+
+    def __init__(self, rows: list, next_page, fetch_page: Callable[..., Tuple[list, object]],
+                 make_rows: Callable[[list, int], list], total: Optional[int] = None,
+                 on_page: Callable[[list], None] = None):
+        self.total = total
+        self.error = None
+        self.pages_fetched = 0
+        self._rows: List = list(rows)
+        self._next = next_page
+        self._fetch_page = fetch_page
+        self._make_rows = make_rows
+        self._on_page = on_page
+        self._lock = threading.Lock()
+        self._pending = None
+        self._executor = None
+
+    @property
+    def complete(self) -> bool:
+        return self._next is None and self._pending is None
+
+    def _prefetch(self) -> None:
+        # Caller holds the lock
+        if self._pending is None and self._next is not None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='AppleMusicPages')
+            self._pending = self._executor.submit(self._fetch_page, self._next)
+
+    def _load_next(self) -> bool:
+        """Wait for the next page (starting the one after it); False when there are no more."""
+        with self._lock:
+            self._prefetch()
+            pending = self._pending
+        if pending is None:
+            return False
+        try:
+            raw_tracks, next_page = pending.result()
+        except Exception as e:
+            print(f"[Apple Music Warning] Could not fetch the next playlist page, the track list ends here: {e}")
+            with self._lock:
+                if self._pending is not pending:
+                    return True
+                self.error, self._pending, self._next = e, None, None
+            self._shutdown()
+            return False
+        with self._lock:
+            if self._pending is not pending:
+                # Another reader already took this page
+                return True
+            rows = self._make_rows(raw_tracks, len(self._rows) + 1)
+            self._rows.extend(rows)
+            self.pages_fetched += 1
+            self._pending, self._next = None, next_page
+            self._prefetch()
+        if next_page is None:
+            self._shutdown()
+        if self._on_page and rows:
+            self._on_page(rows)
+        return True
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _load_until(self, count: Optional[int]) -> None:
+        while (count is None or len(self._rows) < count) and self._load_next():
+            pass
+
+    def __iter__(self):
+        with self._lock:
+            self._prefetch()
+        index = 0
+        while True:
+            while index < len(self._rows):
+                yield self._rows[index]
+                index += 1
+            if not self._load_next():
+                return
+
+    def __len__(self) -> int:
+        if self.complete:
+            return len(self._rows)
+        if self.total is not None:
+            return max(self.total, len(self._rows))
+        self._load_until(None)
+        return len(self._rows)
+
+    def __bool__(self) -> bool:
+        return bool(self._rows) or not self.complete
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) or index < 0:
+            self._load_until(None)
+        else:
+            self._load_until(index + 1)
+        return self._rows[index]
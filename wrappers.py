@@ -0,0 +1,156 @@
+"""Routing of wrapper-v2 work across several wrapper instances.
+
+wrapper_decrypt_ip may list several wrapper-v2 base URLs. Each download that
+uses the wrapper leases the healthy endpoint with the fewest downloads in
+flight (least outstanding requests) and keeps it for the whole track, so the
+playback request and the decryption go to the same container. The lease is
+carried in a context variable that the gamdl base interface consults for its
+wrapper_api.
+
+An endpoint that refuses connections is marked down for a while and the
+track moves to another endpoint; once the down time has passed, the endpoint
+is tried again with a fresh client (which re-checks it via /me). Clients
+belong to an event loop, so an endpoint keeps one per lane (see lanes.py).
+"""
+import contextvars
+import threading
+import time
+import urllib.parse
+from typing import Awaitable, Callable, List, Optional
+
+from .lanes import current_lane
+
+_current_endpoint = contextvars.ContextVar('applemusic_wrapper_endpoint', default=None)
+
+_DOWN_SECONDS = 30.0
+
+
+def current_endpoint() -> Optional['WrapperEndpoint']:
+    """Wrapper endpoint leased by the running download, if any."""
+    return _current_endpoint.get()
+
+
+def parse_wrapper_urls(value) -> List[str]:
+    """wrapper_decrypt_ip as a list of URLs (list, or comma/newline separated string)."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace('\n', ',').split(',')
+    return [str(url).strip() for url in value if str(url).strip()]
+
+
+class WrapperEndpoint:
+    """One wrapper-v2 instance and its routing/health bookkeeping."""
+
+    __slots__ = ('url', 'decrypt_host', 'decrypt_port', 'apis', 'in_flight', 'completed', 'failures',
+                 'down_until', 'last_error')
+
+    def __init__(self, url: str, decrypt_host: str = None, decrypt_port: int = 10020):
+        self.url = url
+        self.decrypt_host = decrypt_host or urllib.parse.urlparse(url).hostname or '127.0.0.1'
+        self.decrypt_port = decrypt_port
+        # Lane name -> WrapperApi
+        self.apis = {}
+        self.in_flight = 0
+        self.completed = 0
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error = None
+
+    @property
+    def api(self):
+        """This endpoint's client for the current lane's event loop."""
+        return self.apis.get(current_lane())
+
+    @api.setter
+    def api(self, api) -> None:
+        if api is None:
+            self.apis.pop(current_lane(), None)
+        else:
+            self.apis[current_lane()] = api
+
+    def is_down(self, now: float = None) -> bool:
+        return self.down_until > (now if now is not None else time.monotonic())
+
+    def as_dict(self, now: float) -> dict:
+        return {
+            'in_flight': self.in_flight, 'completed': self.completed, 'failures': self.failures,
+            'connected': self.api is not None, 'down_for': round(max(0.0, self.down_until - now), 1),
+            'last_error': self.last_error,
+        }
+
+
+class WrapperPool:
+    """Least-outstanding-requests routing over wrapper endpoints, with failover."""
+
+    def __init__(self, endpoints: List[WrapperEndpoint], down_seconds: float = _DOWN_SECONDS):
+        self.endpoints = endpoints
+        self.down_seconds = down_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def urls(self) -> tuple:
+        return tuple(endpoint.url for endpoint in self.endpoints)
+
+    def available(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for endpoint in self.endpoints if not endpoint.is_down(now))
+
+    async def acquire(self, connect: Callable[[WrapperEndpoint], Awaitable]) -> Optional[WrapperEndpoint]:
+        """Lease the least-busy healthy endpoint, connecting it first if needed (None if all are down).
+
+        Must run on the event loop the clients belong to.
+        """
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                healthy = [e for e in self.endpoints if not e.is_down(now)]
+                if not healthy:
+                    return None
+                endpoint = min(healthy, key=lambda e: (e.in_flight, e.completed))
+                endpoint.in_flight += 1
+            if endpoint.api is None:
+                try:
+                    endpoint.api = await connect(endpoint)
+                except Exception as e:
+                    self.release(endpoint, error=e)
+                    continue
+            return endpoint
+
+    def release(self, endpoint: Optional[WrapperEndpoint], error: BaseException = None) -> None:
+        """Return a lease; an error marks the endpoint down and drops its client."""
+        if endpoint is None:
+            return
+        with self._lock:
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+            if error is None:
+                endpoint.completed += 1
+                return
+            endpoint.failures += 1
+            endpoint.down_until = time.monotonic() + self.down_seconds
+            endpoint.last_error = f"{type(error).__name__}: {error}"[:200]
+            # Down for every lane
+            endpoint.apis.clear()
+        print(f"[Apple Music Warning] Wrapper {endpoint.url} is unreachable, not using it for "
+              f"{self.down_seconds:.0f}s: {endpoint.last_error}")
+
+    @staticmethod
+    def lease(endpoint: Optional[WrapperEndpoint]):
+        """Make endpoint the current one for this context; returns the token for reset()."""
+        return _current_endpoint.set(endpoint)
+
+    @staticmethod
+    def reset(token) -> None:
+        _current_endpoint.reset(token)
+
+    def drop_clients(self) -> None:
+        """Forget the current lane's clients (they belong to an event loop that is going away)."""
+        with self._lock:
+            for endpoint in self.endpoints:
+                endpoint.api = None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {endpoint.url: endpoint.as_dict(now) for endpoint in self.endpoints}